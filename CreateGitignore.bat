@@ -5,3 +5,4 @@ echo new versions/ >> .gitignore
 echo Ollama/ >> .gitignore
 echo VSCode/ >> .gitignore
 echo Tools/ >> .gitignore
+echo cache/ >> .gitignore
@@ -2,25 +2,15 @@
 Basic LLM Example with Ollama
 Run: python main.py
 """
-import requests
+import os
+import sys
+from pathlib import Path
 
-def query_ollama(prompt, model="llama2"):
-    """Query Ollama API"""
-    url = "http://127.0.0.1:11434/api/generate"
-    data = {
-        "model": model,
-        "prompt": prompt,
-        "stream": False
-    }
-    
-    try:
-        response = requests.post(url, json=data, timeout=30)
-        if response.status_code == 200:
-            return response.json()["response"]
-        else:
-            return f"Error: {response.status_code}"
-    except Exception as e:
-        return f"Error: {str(e)}"
+# Shared Ollama client lives in the AI Environment src/ folder
+ai_env_path = Path(os.environ.get('AI_ENV_PATH', Path(__file__).resolve().parents[2]))
+sys.path.insert(0, str(ai_env_path / "src"))
+
+from ai_ollama_client import stream_ollama, format_stream_stats
 
 if __name__ == "__main__":
     print("Basic LLM Example")
@@ -31,7 +21,13 @@ if __name__ == "__main__":
     print(f"Question: {prompt}")
     print("Thinking...")
     
-    response = query_ollama(prompt, model="phi:2.7b")
-    #response = query_ollama(prompt, model="gpt-oss:20b")
+    # Tokens are printed as they are generated instead of after the full answer
+    stats = {}
+    print("AI Response: ", end="", flush=True)
+    for token in stream_ollama(prompt, model="phi:2.7b", timeout=30, stats=stats):
+    #for token in stream_ollama(prompt, model="gpt-oss:20b", timeout=300, stats=stats):
+        print(token, end="", flush=True)
+    print()
     
-    print(f"AI Response: {response}")
+    if stats:
+        print(f"[{format_stream_stats(stats)}]")
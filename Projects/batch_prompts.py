@@ -0,0 +1,193 @@
+"""
+AI Environment Batch Prompt Runner
+Runs a JSONL file of prompts against Ollama concurrently and streams results to JSONL
+
+Input (one JSON object per line; only "prompt" is required):
+    {"id": "q1", "prompt": "Explain AI", "model": "phi:2.7b", "options": {"temperature": 0}}
+
+Output (appended as each prompt completes):
+    {"id": "q1", "model": "phi:2.7b", "response": "...", "error": null, ...}
+
+The output file doubles as the checkpoint: every result is flushed to disk as
+soon as it completes, and re-running the same command skips ids already in the
+output, so an interrupted or crashed run resumes where it left off.
+
+Run: python batch_prompts.py prompts.jsonl -o results.jsonl -m phi:2.7b -c 4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add AI Environment src to path for module imports
+ai_env_path = Path(os.environ.get('AI_ENV_PATH', Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(ai_env_path / "src"))
+
+from ai_ollama_async import AsyncOllamaClient, DEFAULT_CONCURRENCY
+from ai_ollama_client import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_MODEL
+
+
+def load_prompts(input_path):
+    """Read prompt records from JSONL, assigning line-number ids where missing"""
+    records = []
+    with open(input_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if "prompt" not in record:
+                raise ValueError(f"{input_path}:{line_number}: missing 'prompt'")
+            record.setdefault("id", str(line_number))
+            record["id"] = str(record["id"])
+            records.append(record)
+    return records
+
+
+def load_completed(output_path, retry_failed=False):
+    """Return ids already present in the output file
+
+    A partially written last line (crash mid-write) is cut off so new results
+    start on a clean line. The file keeps one record per id (the last one
+    written); with retry_failed, failed records are dropped from it so their
+    retries don't leave a second record behind.
+    """
+    completed = set()
+    if not output_path.exists():
+        return completed
+
+    with open(output_path, 'rb+') as f:
+        data = f.read()
+        valid_length = data.rfind(b"\n") + 1
+        if valid_length != len(data):
+            f.truncate(valid_length)
+
+    lines = data[:valid_length].decode('utf-8').splitlines()
+    latest = {}
+    for line in lines:
+        try:
+            result = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        key = str(result.get("id"))
+        latest.pop(key, None)   # Re-inserted so the file keeps completion order
+        latest[key] = line
+    if retry_failed:
+        latest = {key: line for key, line in latest.items() if not json.loads(line).get("error")}
+
+    if len(latest) != len(lines):
+        # Rewrite atomically; a crash leaves either the old or the new file
+        tmp_path = output_path.with_name(output_path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(line + "\n" for line in latest.values())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, output_path)
+
+    completed.update(latest)
+    return completed
+
+
+class ResultWriter:
+    """Appends one JSON line per result and forces it to disk"""
+
+    def __init__(self, output_path):
+        self.file = open(output_path, 'a', encoding='utf-8')
+
+    def write(self, result):
+        self.file.write(json.dumps(result, ensure_ascii=False) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+
+async def run_one(client, record, default_model, timeout):
+    """Run a single prompt record and return its output record"""
+    model = record.get("model", default_model)
+    started = time.perf_counter()
+    result = {"id": record["id"], "model": model, "prompt": record["prompt"]}
+    extra = {key: record[key] for key in ("system", "format", "template") if key in record}
+    try:
+        response = await client.generate(record["prompt"], model=model, options=record.get("options"),
+                                         timeout=timeout, **extra)
+        result.update({
+            "response": response.get("response", ""),
+            "error": None,
+            "eval_count": response.get("eval_count"),
+            "total_duration_s": round(response.get("total_duration", 0) / 1e9, 3),
+        })
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        result.update({"response": None, "error": f"{type(e).__name__}: {e}"})
+    result["elapsed_s"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+async def run_batch(records, writer, model, concurrency, timeout, host, port):
+    """Dispatch records concurrently and write each result as soon as it completes"""
+    done = failed = 0
+    started = time.perf_counter()
+    async with AsyncOllamaClient(host=host, port=port, max_concurrency=concurrency, timeout=timeout) as client:
+        tasks = [client.submit(run_one(client, record, model, timeout)) for record in records]
+        for finished in asyncio.as_completed(tasks):
+            result = await finished
+            writer.write(result)
+            done += 1
+            if result["error"]:
+                failed += 1
+            rate = done / max(time.perf_counter() - started, 1e-9)
+            print(f"\r[{done}/{len(records)}] {failed} failed | {rate:.2f} prompts/s", end="", flush=True)
+    print()
+    return done, failed
+
+
+def main():
+    """Main function for batch prompt runner"""
+    parser = argparse.ArgumentParser(description="Run a JSONL file of prompts through Ollama")
+    parser.add_argument("input", help="Input JSONL file with one {\"prompt\": ...} object per line")
+    parser.add_argument("-o", "--output", help="Output JSONL file (default: <input>.results.jsonl)")
+    parser.add_argument("-m", "--model", default=DEFAULT_MODEL, help="Model for records without a 'model' field")
+    parser.add_argument("-c", "--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Prompts in flight at once")
+    parser.add_argument("--timeout", type=float, default=300, help="Per-prompt timeout in seconds")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--retry-failed", action="store_true", help="Re-run prompts whose previous result was an error")
+    args = parser.parse_args()
+
+    input_path = Path(args.input)
+    output_path = Path(args.output) if args.output else input_path.with_suffix(".results.jsonl")
+
+    records = load_prompts(input_path)
+    completed = load_completed(output_path, retry_failed=args.retry_failed)
+    pending = [record for record in records if record["id"] not in completed]
+
+    print(f"🚀 Batch: {len(records)} prompts, {len(records) - len(pending)} already done, {len(pending)} to run")
+    print(f"   Output: {output_path}")
+    if not pending:
+        return 0
+
+    writer = ResultWriter(output_path)
+    try:
+        done, failed = asyncio.run(run_batch(pending, writer, args.model, args.concurrency,
+                                             args.timeout, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n⚠️ Interrupted - completed results are saved, re-run the same command to resume")
+        return 130
+    finally:
+        writer.close()
+
+    print(f"✅ Finished: {done - failed} succeeded, {failed} failed")
+    if failed:
+        print("   Re-run with --retry-failed to retry the failed prompts")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,14 @@
+import sys
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 
+# Shared Ollama client lives in the AI Environment src/ folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+from ai_ollama_client import stream_ollama, format_stream_stats
+
 st.title("AI Environment Demo")
 st.write("Welcome to your portable AI development environment!")
 
@@ -16,3 +23,18 @@ st.line_chart(data)
 
 st.subheader("Sample Data")
 st.dataframe(data.head())
+
+st.subheader("Ask a Local Model")
+model = st.text_input("Model", value="phi:2.7b")
+prompt = st.text_area("Prompt", value="Explain artificial intelligence in simple terms")
+if st.button("Generate"):
+    # Render tokens progressively as Ollama streams them
+    placeholder = st.empty()
+    stats = {}
+    text = ""
+    for token in stream_ollama(prompt, model=model, timeout=300, stats=stats):
+        text += token
+        placeholder.markdown(text + "▌")
+    placeholder.markdown(text)
+    if stats:
+        st.caption(format_stream_stats(stats))
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+AI Environment Startup Benchmark v3.0.28
+Measures cold and warm start of the menu against a throwaway AI_Environment
+
+Builds a temporary AI_Environment (a copy of src/ and config/ plus stub
+Miniconda/Ollama executables), then launches src/activate_ai_env.py with
+AI_ENV_TRACE enabled and answers the menu with 0 (exit). Cold runs start
+without bytecode, location caches or toolchain cache; warm runs reuse them.
+Reports wall time, time from launch to the modules_imported and
+menu_ready marks, and the startup spans. Runs on Linux as well as
+Windows, so startup regressions show up in CI.
+
+Usage:
+    python benchmark_startup.py                  # 3 cold + 5 warm runs
+    python benchmark_startup.py --max-warm-ms 800   # exit 1 if slower
+
+Author: AI Environment Team
+Date: 2026-10-17
+Version: 3.0.28
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from ai_timing import load_trace
+
+STUB_SCRIPT = "#!/bin/sh\nexit 0\n"
+
+
+def write_stub(path):
+    """Create an executable that does nothing (also valid as a Windows .exe placeholder)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(STUB_SCRIPT, encoding='utf-8')
+    path.chmod(0o755)
+
+
+def build_environment(root):
+    """Create a stub AI_Environment under root and return its path"""
+    ai_env = root / "AI_Environment"
+    shutil.copytree(REPO_ROOT / "src", ai_env / "src", ignore=shutil.ignore_patterns("__pycache__"))
+    shutil.copytree(REPO_ROOT / "config", ai_env / "config")
+    for name in ("version_config.json",):
+        if (REPO_ROOT / name).exists():
+            shutil.copy2(REPO_ROOT / name, ai_env / name)
+    (ai_env / "Projects").mkdir()
+
+    # Both layouts so the toolchain resolver finds them on Windows and POSIX
+    miniconda = ai_env / "Miniconda"
+    for stub in ("Scripts/conda.exe", "bin/conda", "envs/AI2025/python.exe", "envs/AI2025/bin/python"):
+        write_stub(miniconda / stub)
+    write_stub(ai_env / "Ollama" / "ollama.exe")
+    write_stub(ai_env / "Ollama" / "ollama")
+    return ai_env
+
+
+def clear_caches(ai_env, local_appdata):
+    """Remove everything a warm start benefits from"""
+    for path in [ai_env / "cache", local_appdata, *ai_env.rglob("__pycache__")]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def run_once(ai_env, local_appdata, trace_path):
+    """Start the menu, exit it, and return the run's measurements"""
+    env = dict(os.environ)
+    env.update({
+        "AI_ENV_PATH": str(ai_env),
+        "AI_ENV_TRACE": str(trace_path),
+        "CONDA_DEFAULT_ENV": "AI2025",       # Skip the launch-method warning
+        "LOCALAPPDATA": str(local_appdata),  # Isolate the AI_Environment location cache
+        "PYTHONIOENCODING": "utf-8",
+    })
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+    known_runs = {record["run"] for record in load_trace(trace_path)}
+    launched_at = time.time()
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, str(ai_env / "src" / "activate_ai_env.py")],
+                            input="0\n", capture_output=True, text=True, encoding="utf-8",
+                            env=env, cwd=str(ai_env), timeout=120)
+    wall_ms = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"launcher exited with {result.returncode}:\n{result.stdout}\n{result.stderr}")
+
+    records = [record for record in load_trace(trace_path) if record["run"] not in known_runs]
+    # Mark timestamps relative to our own launch (psutil's create_time is only
+    # accurate to about a second on Linux)
+    marks = {record["name"]: round((record["start"] - launched_at) * 1000, 1)
+             for record in records if record["type"] == "mark"}
+    spans = {record["name"]: record["duration_ms"] for record in records if record["type"] == "span"}
+    return {"wall_ms": round(wall_ms, 1), "menu_ready_ms": marks.get("menu_ready"),
+            "modules_imported_ms": marks.get("modules_imported"), "spans": spans}
+
+
+def summarize(runs):
+    """Median/min of each measurement across runs"""
+    def stats(values):
+        values = [value for value in values if value is not None]
+        if not values:
+            return None
+        return {"median": round(statistics.median(values), 1), "min": round(min(values), 1)}
+
+    span_names = sorted({name for run in runs for name in run["spans"]})
+    return {
+        "runs": len(runs),
+        "wall_ms": stats([run["wall_ms"] for run in runs]),
+        "menu_ready_ms": stats([run["menu_ready_ms"] for run in runs]),
+        "modules_imported_ms": stats([run["modules_imported_ms"] for run in runs]),
+        "spans": {name: stats([run["spans"].get(name) for run in runs]) for name in span_names},
+    }
+
+
+def print_summary(label, summary):
+    print(f"\n{label} ({summary['runs']} runs)               median        min")
+    for key, title in (("wall_ms", "Process wall time"), ("modules_imported_ms", "Modules imported"),
+                       ("menu_ready_ms", "Menu ready")):
+        value = summary[key]
+        if value:
+            print(f"  {title:<28} {value['median']:>8.1f} ms {value['min']:>8.1f} ms")
+    for name, value in sorted(summary["spans"].items(), key=lambda item: -(item[1] or {"median": 0})["median"]):
+        if value:
+            print(f"    {name:<26} {value['median']:>8.1f} ms {value['min']:>8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold and warm start of the AI Environment menu")
+    parser.add_argument("--cold", type=int, default=3, help="Cold runs (caches cleared before each)")
+    parser.add_argument("--warm", type=int, default=5, help="Warm runs")
+    parser.add_argument("--max-warm-ms", type=float, help="Fail if the warm median menu_ready exceeds this")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary AI_Environment")
+    args = parser.parse_args()
+
+    try:
+        import psutil  # noqa: F401 - the launcher refuses to start without it
+    except ImportError:
+        print("psutil is required (the launcher checks for it before showing the menu)")
+        return 1
+
+    root = Path(tempfile.mkdtemp(prefix="ai_env_bench_"))
+    try:
+        ai_env = build_environment(root)
+        local_appdata = root / "LocalAppData"
+        trace_path = root / "trace.jsonl"
+        print(f"Benchmark environment: {ai_env}")
+        print(f"Python: {sys.version.split()[0]} ({sys.executable})")
+
+        cold_runs = []
+        for _ in range(args.cold):
+            clear_caches(ai_env, local_appdata)
+            cold_runs.append(run_once(ai_env, local_appdata, trace_path))
+        if not cold_runs:
+            run_once(ai_env, local_appdata, trace_path)    # Prime caches for the warm runs
+        warm_runs = [run_once(ai_env, local_appdata, trace_path) for _ in range(args.warm)]
+
+        results = {"python": sys.version.split()[0], "platform": sys.platform}
+        if cold_runs:
+            results["cold"] = summarize(cold_runs)
+            print_summary("Cold start", results["cold"])
+        if warm_runs:
+            results["warm"] = summarize(warm_runs)
+            print_summary("Warm start", results["warm"])
+
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+
+        if args.max_warm_ms and warm_runs:
+            warm_ready = (results["warm"]["menu_ready_ms"] or results["warm"]["wall_ms"])["median"]
+            if warm_ready > args.max_warm_ms:
+                print(f"\nFAIL: warm start {warm_ready:.1f} ms exceeds {args.max_warm_ms:.1f} ms")
+                return 1
+            print(f"\nOK: warm start {warm_ready:.1f} ms within {args.max_warm_ms:.1f} ms")
+        return 0
+    finally:
+        if args.keep:
+            print(f"\nKept: {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -12,6 +12,14 @@ import json
 from datetime import datetime
 from pathlib import Path
 
+# Import-time profile: --profile-imports or AI_ENV_PROFILE_IMPORTS=1 (report printed before the menu)
+IMPORT_PROFILER = None
+if "--profile-imports" in sys.argv or os.environ.get("AI_ENV_PROFILE_IMPORTS") == "1":
+    if "--profile-imports" in sys.argv:
+        sys.argv.remove("--profile-imports")
+    from ai_lazy_import import ImportProfiler
+    IMPORT_PROFILER = ImportProfiler().start()
+
 def get_highest_version():
     """Get the highest version from version_config.json"""
     try:
@@ -128,198 +136,90 @@ except ImportError:
 
 from ai_menu_system import MenuSystem
 from ai_action_handlers import ActionHandlers
+from ai_timing import mark, span, traced
+
+mark("modules_imported")
 
 class AIEnvironmentActivator:
     """Main AI Environment activation and management system"""
 
+    @traced("detect_miniconda")
     def _detect_miniconda_path(self):
         """
         Detect Miniconda installation location.
-        Priority order:
+        Priority order (see ai_toolchain.ToolchainResolver):
         1. Portable: {ai_env_path}/Miniconda (preferred for portability)
         2. Installer portable: {ai_env_path}/AI_Environment/Miniconda (when installer output is moved here)
-        3. PATH variable: Extract from 'where conda.exe'
+        3. PATH variable
         4. User profile: %USERPROFILE%/Miniconda3 or miniconda3
         5. System-wide: C:/ProgramData/Miniconda3 or miniconda3
         """
-        import subprocess
-        import os
-
-        # 1. Check portable installation first (PRIORITY)
-        portable_path = self.ai_env_path / "Miniconda"
-        if (portable_path / "Scripts" / "conda.exe").exists():
-            if self.verbose:
-                print(f"{Fore.GREEN}[VERBOSE] Found portable Miniconda at: {portable_path}{Style.RESET_ALL}")
-            return portable_path
+        from ai_toolchain import get_toolchain
 
-        # 2. Check AI_Environment subfolder (installer output moved here)
-        installer_portable_path = self.ai_env_path / "AI_Environment" / "Miniconda"
-        if (installer_portable_path / "Scripts" / "conda.exe").exists():
+        toolchain = get_toolchain(self.ai_env_path)
+        conda_path = toolchain.conda_root()
+        if conda_path:
             if self.verbose:
-                print(f"{Fore.GREEN}[VERBOSE] Found Miniconda in AI_Environment at: {installer_portable_path}{Style.RESET_ALL}")
-            return installer_portable_path
-
-        # 3. Try to detect from PATH environment variable
-        try:
-            result = subprocess.run(['where', 'conda.exe'],
-                                  capture_output=True,
-                                  text=True,
-                                  timeout=5)
-            if result.returncode == 0:
-                conda_exe_path = result.stdout.strip().split('\n')[0].strip()
-                # Extract Miniconda root (remove \Scripts\conda.exe)
-                conda_path = Path(conda_exe_path).parent.parent
-                if self.verbose:
-                    print(f"{Fore.YELLOW}[VERBOSE] Found Miniconda in PATH at: {conda_path}{Style.RESET_ALL}")
-                return conda_path
-        except Exception as e:
-            if self.verbose:
-                print(f"{Fore.YELLOW}[VERBOSE] Could not detect from PATH: {e}{Style.RESET_ALL}")
-
-        # 3. Check common user profile locations
-        user_profile = Path(os.environ.get('USERPROFILE', ''))
-        for conda_dir in ['Miniconda3', 'miniconda3']:
-            conda_path = user_profile / conda_dir
-            if (conda_path / "Scripts" / "conda.exe").exists():
-                if self.verbose:
-                    print(f"{Fore.YELLOW}[VERBOSE] Found Miniconda at: {conda_path}{Style.RESET_ALL}")
-                return conda_path
-
-        # 4. Check common system-wide locations
-        for conda_dir in ['Miniconda3', 'miniconda3']:
-            conda_path = Path(f"C:/ProgramData/{conda_dir}")
-            if (conda_path / "Scripts" / "conda.exe").exists():
-                if self.verbose:
-                    print(f"{Fore.YELLOW}[VERBOSE] Found Miniconda at: {conda_path}{Style.RESET_ALL}")
-                return conda_path
+                color = Fore.GREEN if toolchain.source("conda") == "portable" else Fore.YELLOW
+                print(f"{color}[VERBOSE] Found Miniconda ({toolchain.source('conda')}) at: {conda_path}{Style.RESET_ALL}")
+            return conda_path
 
         # Default to portable location even if it doesn't exist (will be created during install)
+        portable_path = self.ai_env_path / "Miniconda"
         if self.verbose:
             print(f"{Fore.RED}[VERBOSE] Miniconda not found, defaulting to: {portable_path}{Style.RESET_ALL}")
         return portable_path
 
+    @traced("detect_ollama")
     def _detect_ollama_path(self):
         """
         Detect Ollama installation location.
-        Priority order:
+        Priority order (see ai_toolchain.ToolchainResolver):
         1. Portable: {ai_env_path}/Ollama (preferred for portability)
         2. Installer portable: {ai_env_path}/AI_Environment/Ollama (when installer output is moved here)
-        3. PATH variable: Extract from 'where ollama.exe'
+        3. PATH variable
         4. User profile: %USERPROFILE%/Ollama or %LOCALAPPDATA%/Programs/Ollama
         5. System-wide: C:/Program Files/Ollama
         """
-        import subprocess
-        import os
+        from ai_toolchain import get_toolchain
 
-        # 1. Check portable installation first (PRIORITY)
-        portable_path = self.ai_env_path / "Ollama" / "ollama.exe"
-        if portable_path.exists():
+        toolchain = get_toolchain(self.ai_env_path)
+        ollama_path = toolchain.get("ollama")
+        if ollama_path:
             if self.verbose:
-                print(f"{Fore.GREEN}[VERBOSE] Found portable Ollama at: {portable_path}{Style.RESET_ALL}")
-            return portable_path
+                color = Fore.GREEN if toolchain.source("ollama") == "portable" else Fore.YELLOW
+                print(f"{color}[VERBOSE] Found Ollama ({toolchain.source('ollama')}) at: {ollama_path}{Style.RESET_ALL}")
+            return ollama_path
 
-        # 2. Check AI_Environment subfolder (installer output moved here)
-        installer_portable_path = self.ai_env_path / "AI_Environment" / "Ollama" / "ollama.exe"
-        if installer_portable_path.exists():
-            if self.verbose:
-                print(f"{Fore.GREEN}[VERBOSE] Found Ollama in AI_Environment at: {installer_portable_path}{Style.RESET_ALL}")
-            return installer_portable_path
-
-        # 3. Try to detect from PATH environment variable
-        try:
-            result = subprocess.run(['where', 'ollama.exe'],
-                                  capture_output=True,
-                                  text=True,
-                                  timeout=5)
-            if result.returncode == 0:
-                ollama_exe_path = Path(result.stdout.strip().split('\n')[0].strip())
-                if self.verbose:
-                    print(f"{Fore.YELLOW}[VERBOSE] Found Ollama in PATH at: {ollama_exe_path}{Style.RESET_ALL}")
-                return ollama_exe_path
-        except Exception as e:
-            if self.verbose:
-                print(f"{Fore.YELLOW}[VERBOSE] Could not detect Ollama from PATH: {e}{Style.RESET_ALL}")
-
-        # 3. Check common user profile locations
-        user_profile = Path(os.environ.get('USERPROFILE', ''))
-        local_appdata = Path(os.environ.get('LOCALAPPDATA', ''))
-
-        user_locations = [
-            user_profile / "Ollama" / "ollama.exe",
-            local_appdata / "Programs" / "Ollama" / "ollama.exe",
-        ]
-
-        for ollama_path in user_locations:
-            if ollama_path.exists():
-                if self.verbose:
-                    print(f"{Fore.YELLOW}[VERBOSE] Found Ollama at: {ollama_path}{Style.RESET_ALL}")
-                return ollama_path
-
-        # 4. Check common system-wide locations
-        system_locations = [
-            Path("C:/Program Files/Ollama/ollama.exe"),
-            Path("C:/Program Files (x86)/Ollama/ollama.exe"),
-        ]
-
-        for ollama_path in system_locations:
-            if ollama_path.exists():
-                if self.verbose:
-                    print(f"{Fore.YELLOW}[VERBOSE] Found Ollama at: {ollama_path}{Style.RESET_ALL}")
-                return ollama_path
-
-        # Return None if not found (Ollama is optional)
+        # Ollama is optional; use the portable location
+        portable_path = self.ai_env_path / "Ollama" / "ollama.exe"
         if self.verbose:
             print(f"{Fore.RED}[VERBOSE] Ollama not found, will use portable location: {portable_path}{Style.RESET_ALL}")
         return portable_path
 
+    @traced("find_ai_environment")
     def _find_ai_environment(self):
         """
         Find AI_Environment installation across all drives.
-        Searches for AI_Environment in both external (AI_Lab) and internal locations.
+        Delegates to ai_path_finder (AI_ENV_PATH override, cached location,
+        concurrent drive scan).
 
         Returns:
             Path to AI_Environment or current directory if not found
         """
-        import string
-
-        # First, check if we're already inside AI_Environment
-        script_dir = Path(__file__).resolve().parent
-        current_path = script_dir.parent
-
-        # Check if current directory is AI_Environment
-        if (current_path / "Ollama").exists() or (current_path / "Miniconda").exists():
-            if self.verbose:
-                print(f"{Fore.GREEN}[VERBOSE] Found AI_Environment at current location: {current_path}{Style.RESET_ALL}")
-            return current_path
-
-        # Search all drives for AI_Environment
-        for letter in string.ascii_uppercase:
-            drive_path = Path(f"{letter}:\\")
-
-            if not drive_path.exists():
-                continue
+        from ai_path_finder import find_ai_environment
 
-            # Check AI_Lab\AI_Environment (external drives)
-            ai_lab_path = drive_path / "AI_Lab" / "AI_Environment"
-            if ai_lab_path.exists() and ai_lab_path.is_dir():
-                if (ai_lab_path / "Ollama").exists() or (ai_lab_path / "Miniconda").exists():
-                    if self.verbose:
-                        print(f"{Fore.GREEN}[VERBOSE] Found AI_Environment at: {ai_lab_path}{Style.RESET_ALL}")
-                    return ai_lab_path
-
-            # Check Drive:\AI_Environment (internal drives)
-            ai_env_path = drive_path / "AI_Environment"
-            if ai_env_path.exists() and ai_env_path.is_dir():
-                if (ai_env_path / "Ollama").exists() or (ai_env_path / "Miniconda").exists():
-                    if self.verbose:
-                        print(f"{Fore.GREEN}[VERBOSE] Found AI_Environment at: {ai_env_path}{Style.RESET_ALL}")
-                    return ai_env_path
+        found = find_ai_environment(verbose=self.verbose)
+        if found:
+            return found
 
         # Fallback to current directory
+        current_path = Path(__file__).resolve().parent.parent
         if self.verbose:
             print(f"{Fore.YELLOW}[VERBOSE] AI_Environment not found on any drive, using current: {current_path}{Style.RESET_ALL}")
         return current_path
 
+    @traced("activator.init")
     def __init__(self, verbose=False):
         self.verbose = verbose
 
@@ -333,8 +233,9 @@ class AIEnvironmentActivator:
         self.ollama_path = self._detect_ollama_path()
 
         # Initialize subsystems
-        self.menu_system = MenuSystem(SCRIPT_VERSION, SCRIPT_DATE)
-        self.action_handlers = ActionHandlers(self.ai_env_path, self.conda_path, self.ollama_path)
+        with span("init_subsystems"):
+            self.menu_system = MenuSystem(SCRIPT_VERSION, SCRIPT_DATE)
+            self.action_handlers = ActionHandlers(self.ai_env_path, self.conda_path, self.ollama_path)
 
         if self.verbose:
             print(f"{Fore.CYAN}[VERBOSE] {__file__} v{SCRIPT_VERSION} ({SCRIPT_DATE}) starting{Style.RESET_ALL}")
@@ -346,8 +247,34 @@ class AIEnvironmentActivator:
         """Print info message"""
         print(f"{Fore.YELLOW}[INFO] {message}{Style.RESET_ALL}")
         
+    def report_import_profile(self):
+        """Print the import-time profile once (if enabled)"""
+        global IMPORT_PROFILER
+        if IMPORT_PROFILER is None:
+            return
+        IMPORT_PROFILER.stop()
+        print(f"\n{Fore.CYAN}[PROFILE] Ready after {IMPORT_PROFILER.elapsed_ms():.0f} ms{Style.RESET_ALL}")
+        print(IMPORT_PROFILER.report())
+        IMPORT_PROFILER = None
+
+    def start_resource_policies(self):
+        """Keep launched services within their priority/memory policies while the menu runs"""
+        try:
+            from ai_process_manager import BackgroundProcessManager
+            from ai_resource_policy import ResourcePolicyEnforcer
+            ResourcePolicyEnforcer(BackgroundProcessManager(self.ai_env_path)).start()
+        except Exception as e:
+            # Runs next to the menu prompt; report to the service log instead
+            from ai_process_supervisor import get_service_logger
+            get_service_logger().warning("Resource policies not enforced: %s", e)
+
     def run_interactive_menu(self):
         """Run interactive menu system"""
+        # Loaded in the background so psutil/sqlite imports do not delay the first menu
+        import threading
+        threading.Thread(target=self.start_resource_policies, name="ResourcePolicyStart", daemon=True).start()
+
+        mark("menu_ready")
         while True:
             self.menu_system.print_header()
             self.menu_system.print_interactive_menu()
@@ -403,28 +330,9 @@ class AIEnvironmentActivator:
                     if tracked_processes:
                         self.print_info(f"Found {len(tracked_processes)} background processes to stop...")
                         
-                        # Stop all processes
-                        for process_id, process_info in tracked_processes.items():
-                            try:
-                                pid = process_info.get('pid')
-                                name = process_info.get('name', 'Unknown')
-                                
-                                if pid:
-                                    # Try to terminate the process
-                                    import subprocess
-                                    try:
-                                        subprocess.run(['taskkill', '/F', '/PID', str(pid)], 
-                                                     check=True, capture_output=True)
-                                        self.print_info(f"Stopped {name} (PID: {pid})")
-                                    except subprocess.CalledProcessError:
-                                        self.print_info(f"Process {name} (PID: {pid}) already stopped")
-                            except Exception as e:
-                                self.print_info(f"Could not stop process {process_id}: {e}")
-                        
-                        # Clear the background processes file
-                        process_manager.tracked_processes = {}
-                        process_manager.save_tracked_processes()
-                        self.print_info("All background processes stopped and cleared")
+                        # Stop every process tree at once under a single deadline
+                        if process_manager.stop_all_processes():
+                            self.print_info("All background processes stopped and cleared")
                     else:
                         self.print_info("No background processes found")
                         
@@ -455,6 +363,7 @@ def main():
     
     # Create activator instance
     activator = AIEnvironmentActivator(verbose=verbose_mode)
+    activator.report_import_profile()
     
     # Check for specific actions
     if len(sys.argv) > 1:
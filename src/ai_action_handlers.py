@@ -12,6 +12,7 @@ AI Environment - Action Handlers Module
 Handles all menu actions and operations
 """
 
+import os
 from pathlib import Path
 import time
 
@@ -25,12 +26,15 @@ except ImportError:
 
 from ai_path_manager import PathManager
 from ai_conda_manager import CondaManager
-from ai_component_setup import ComponentSetup
 from ai_status_display import StatusDisplay
-from ai_component_tester import ComponentTester
-from ai_ollama_manager import OllamaManager
-from ai_app_launcher import ApplicationLauncher
-from ai_process_manager import BackgroundProcessManager
+from ai_lazy_import import lazy_attr
+from ai_timing import span
+
+# Heavy modules (requests, psutil, sqlite, VS Code config) load on first use
+ComponentTester = lazy_attr("ai_component_tester", "ComponentTester")
+OllamaManager = lazy_attr("ai_ollama_manager", "OllamaManager")
+ApplicationLauncher = lazy_attr("ai_app_launcher", "ApplicationLauncher")
+BackgroundProcessManager = lazy_attr("ai_process_manager", "BackgroundProcessManager")
 
 class ActionHandlers:
     """Handles all menu actions for AI Environment"""
@@ -42,13 +46,28 @@ class ActionHandlers:
         if ollama_path is None:
             ollama_path = Path(ai_env_path) / "Ollama" / "ollama.exe"
         self.ollama_path = Path(ollama_path)
-        self.ollama_manager = OllamaManager(ai_env_path, ollama_path)
+        self._ollama_manager = None
+        self._step_span = None
+
+    @property
+    def ollama_manager(self):
+        """OllamaManager, created on first use (imports the HTTP client)"""
+        if self._ollama_manager is None:
+            self._ollama_manager = OllamaManager(self.ai_env_path, self.ollama_path)
+        return self._ollama_manager
         
     def print_step(self, step_num, description):
-        """Print step header"""
+        """Print step header (and time the step until the next one starts)"""
+        self._end_step()
+        self._step_span = span(f"step {step_num}: {description}")
         print(f"{Fore.CYAN}[*] Step {step_num}: {description}...{Style.RESET_ALL}")
         print(f"{Fore.CYAN}{'-'*50}{Style.RESET_ALL}")
         
+    def _end_step(self):
+        if self._step_span is not None:
+            self._step_span.end()
+            self._step_span = None
+
     def print_success(self, message):
         """Print success message"""
         print(f"{Fore.GREEN}[OK] {message}{Style.RESET_ALL}")
@@ -70,7 +89,16 @@ class ActionHandlers:
         return True
         
     def action_full_activation(self):
-        """Full activation process"""
+        """Full activation process, timed as a 'full_activation' span with one span per step"""
+        with span("full_activation") as activation:
+            try:
+                success = self._full_activation()
+            finally:
+                self._end_step()
+            activation.set(success=success)
+        return success
+
+    def _full_activation(self):
         print(f"\n{Fore.GREEN}🚀 Starting Full Activation...{Style.RESET_ALL}")
         
         try:
@@ -98,56 +126,48 @@ class ActionHandlers:
             else:
                 self.print_info("No duplicate paths found")
             
-            # Step 3: Setup components
-            self.print_step(3, "Setting up components")
-            component_setup = ComponentSetup(self.ai_env_path, self.ollama_path)
-            if not component_setup.setup_all_components():
-                self.print_error("Component setup failed")
-                return False
-            self.print_success("Components setup completed")
-            
-            # Step 4: AI Model Selection and Loading
-            self.print_step(4, "AI Model Selection")
+            # Step 3: AI Model Selection - asked before any service starts, so
+            # worker threads never print into the prompt
+            self.print_step(3, "AI Model Selection")
             from ai_model_loader import ModelLoader
 
+            model_loader = None
+            selected_model = None
             try:
                 model_loader = ModelLoader(
                     self.ollama_path,
                     self.ai_env_path / "help"
                 )
-                
                 selected_model = model_loader.select_model_for_activation("phi:2.7b")
                 if selected_model:
-                    self.print_info(f"Loading model: {selected_model}")
-                    if model_loader.load_model(selected_model):
-                        self.print_success(f"Model {selected_model} loaded successfully")
-                        
-                        # Track the loaded model process
-                        try:
-                            from ai_process_manager import BackgroundProcessManager
-                            process_manager = BackgroundProcessManager(self.ai_env_path)
-                            
-                            # Get Ollama status to find PID
-                            status = self.ollama_manager.get_ollama_status()
-                            if status and status.get('processes'):
-                                pid = status['processes'][0]['pid']
-                                process_manager.track_process(
-                                    process_id="ollama_server_activation",
-                                    name=f"Ollama Server ({selected_model})",
-                                    pid=pid,
-                                    command=f"ollama serve (model: {selected_model})",
-                                    url="http://127.0.0.1:11434"
-                                )
-                                self.print_info(f"Tracking Ollama server with {selected_model} model")
-                        except Exception as e:
-                            self.print_warning(f"Could not track Ollama process: {e}")
-                    else:
-                        self.print_warning(f"Failed to load model {selected_model}, but continuing...")
+                    self.print_info(f"Will load {selected_model} as soon as Ollama is ready")
                 else:
                     self.print_info("No model selected, continuing without model loading")
             except Exception as e:
                 self.print_warning(f"Model selection failed: {e}, continuing without model loading")
             
+            # Step 4: Start services concurrently; each waits only for its dependencies
+            # (the model load waits for Ollama, everything else starts at once)
+            self.print_step(4, "Starting services")
+            from ai_service_stack import ServiceStack, build_activation_services, format_timeline
+            stack = ServiceStack(build_activation_services(self.ai_env_path, self.ollama_path,
+                                                           model=selected_model, model_loader=model_loader))
+            timeline = stack.run()
+            print(f"\n{Fore.CYAN}⏱  Startup timeline:{Style.RESET_ALL}")
+            print(format_timeline(timeline))
+            
+            if "model" in stack.results:
+                if stack.results["model"]["status"] == "ready":
+                    self.print_success(f"Model {selected_model} loaded successfully")
+                    self.print_info(f"Keeping hot models resident: {', '.join(model_loader.warmup.hot_models)}")
+                else:
+                    self.print_warning(f"Failed to load model {selected_model}, but continuing...")
+            
+            if not stack.ok():
+                self.print_error("Component setup failed")
+                return False
+            self.print_success("Components setup completed")
+            
             # Step 5: Show status and background processes
             self.print_step(5, "Environment ready")
             status_display = StatusDisplay()
@@ -215,9 +235,19 @@ class ActionHandlers:
     def action_run_validation(self):
         """Run environment validation"""
         print(f"\n{Fore.GREEN}✅ Running Environment Validation...{Style.RESET_ALL}")
-        # Implementation for validation
-        self.print_info("Validation not yet implemented")
-        return True
+        from ai_environment_validator import EnvironmentValidator
+        from ai_toolchain import get_toolchain
+
+        # Check the AI2025 interpreter's packages, not the menu's own
+        toolchain = get_toolchain(self.ai_env_path)
+        python_exe = toolchain.get("python")
+        # A PATH python only counts while the AI2025 environment is active
+        in_env = toolchain.source("python") == "env" or os.environ.get('CONDA_DEFAULT_ENV') == toolchain.env_name
+        if not python_exe or not in_env:
+            self.print_error("AI2025 Python not found - check the Miniconda installation (AI2025 environment)")
+            return False
+        validator = EnvironmentValidator(self.ai_env_path, python_exe=python_exe)
+        return validator.run_validation()
         
     def action_show_status(self):
         """Show current status"""
@@ -276,7 +306,7 @@ class ActionHandlers:
             menu = MenuSystem("2.1.7", "2025-08-11")
             menu.print_background_menu()
             
-            choice = menu.get_user_choice(4)
+            choice = menu.get_user_choice(5)
             
             if choice == 0:  # Back to main menu
                 break
@@ -293,6 +323,12 @@ class ActionHandlers:
             elif choice == 4:  # Refresh process list
                 process_manager.cleanup_dead_processes()
                 self.print_info("Process list refreshed")
+            elif choice == 5:  # Live dashboard
+                from ai_process_dashboard import ProcessDashboard
+                export_path = input(f"{Fore.CYAN}Export samples to .jsonl/.csv file (Enter to skip): {Style.RESET_ALL}").strip()
+                ProcessDashboard(process_manager, export_path=export_path or None).run()
+                if export_path:
+                    self.print_info(f"Samples saved to {export_path}")
                 
             input(f"\n{Fore.YELLOW}Press Enter to continue...{Style.RESET_ALL}")
             
@@ -12,7 +12,6 @@ Handles launching various applications in background mode with enhanced VS Code
 
 import subprocess
 import time
-import os
 from pathlib import Path
 
 try:
@@ -26,6 +25,7 @@ except ImportError:
 from ai_process_manager import BackgroundProcessManager
 from ai_vscode_config import VSCodeConfigManager
 from ai_app_launchers import AppLaunchers
+from ai_toolchain import get_toolchain
 from ai_launcher_menu import LauncherMenu
 
 # Universal path detection - works regardless of installation location
@@ -126,25 +126,15 @@ class ApplicationLauncher:
                 self.print_error("Invalid input")
                 return False
 
-        # Check for VS Code executable (try multiple locations)
-        vscode_paths = [
-            self.ai_env_path / "VSCode" / "Code.exe",  # Portable in AI Environment
-            "C:/Users/{}/AppData/Local/Programs/Microsoft VS Code/Code.exe".format(os.environ.get('USERNAME', '')),
-            "C:/Program Files/Microsoft VS Code/Code.exe",
-            "C:/Program Files (x86)/Microsoft VS Code/Code.exe"
-        ]
-        
-        vscode_exe = None
-        for path in vscode_paths:
-            if Path(path).exists():
-                vscode_exe = Path(path)
-                break
-        
+        # Find VS Code (portable, user and system installs, then PATH)
+        toolchain = get_toolchain(self.ai_env_path)
+        vscode_exe = toolchain.get("code")
+
         if not vscode_exe:
             self.print_error("VS Code not found! Please install VS Code or update the path")
             self.print_info("Checked locations:")
-            for path in vscode_paths:
-                self.print_info(f"  - {path}")
+            for source, path in toolchain.candidates("code"):
+                self.print_info(f"  - {path}" if source != "PATH" else "  - PATH")
             return False
 
         # Setup enhanced workspace configuration
@@ -9,9 +9,11 @@ Handles launching of specific applications (Jupyter, Streamlit, etc.)
 """
 
 import webbrowser
-import time
 from pathlib import Path
 
+from ai_process_supervisor import wait_for_port
+from ai_toolchain import get_toolchain
+
 try:
     from colorama import Fore, Style
 except ImportError:
@@ -56,7 +58,7 @@ class AppLaunchers:
             try:
                 open_browser = input(f"\n{Fore.CYAN}Open Jupyter Lab in browser? (y/n): {Style.RESET_ALL}").lower()
                 if open_browser in ['y', 'yes']:
-                    time.sleep(3)  # Wait for server to start
+                    wait_for_port(8888, timeout=15)  # Returns as soon as the server listens
                     webbrowser.open('http://localhost:8888')
                     self.print_success("Jupyter Lab opened in browser")
             except:
@@ -78,22 +80,8 @@ class AppLaunchers:
                 open_browser = input(f"\n{Fore.CYAN}Open Streamlit demo in browser? (y/n): {Style.RESET_ALL}").lower().strip()
                 if open_browser in ['y', 'yes']:
                     self.print_info("Waiting for Streamlit server to initialize...")
-                    # Wait longer for Streamlit to start (it's slower than Jupyter)
-                    max_wait = 15
-                    port_found = False
-                    for i in range(max_wait):
-                        time.sleep(1)
-                        if self._is_port_in_use(8501):
-                            port_found = True
-                            # Give it 2 more seconds after port opens for app to fully initialize
-                            self.print_info("Server responding, finalizing startup...")
-                            time.sleep(2)
-                            break
-                        if i % 2 == 0:
-                            print(f"{Fore.YELLOW}.{Style.RESET_ALL}", end="", flush=True)
-                    print()  # New line after dots
-
-                    if not port_found:
+                    # Streamlit is slower to start than Jupyter
+                    if not wait_for_port(8501, timeout=15):
                         self.print_warning("Server took longer than expected to start")
                         self.print_info("Opening browser anyway - you may need to refresh")
 
@@ -106,12 +94,6 @@ class AppLaunchers:
 
         return success
 
-    def _is_port_in_use(self, port):
-        """Check if a port is in use"""
-        import socket
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            return s.connect_ex(('localhost', port)) == 0
-        
     def launch_python_repl(self):
         """Launch Python REPL in new terminal"""
         print(f"\n{Fore.BLUE}🐍 Launching Python REPL...{Style.RESET_ALL}")
@@ -140,26 +122,15 @@ class AppLaunchers:
         print(f"\n{Fore.BLUE}🔧 Launching Conda Prompt...{Style.RESET_ALL}")
 
         try:
-            # Find conda executable - check multiple locations
-            conda_locations = [
-                Path("C:/ProgramData/miniconda3/Scripts/conda.exe"),
-                Path("C:/ProgramData/Miniconda3/Scripts/conda.exe"),
-                self.ai_env_path / "Miniconda" / "Scripts" / "conda.exe",
-                Path.home() / "miniconda3" / "Scripts" / "conda.exe",
-                Path.home() / "anaconda3" / "Scripts" / "conda.exe",
-            ]
-
-            conda_exe = None
-            for location in conda_locations:
-                if location.exists():
-                    conda_exe = location
-                    break
+            # Find conda executable (portable first, then PATH, user and system installs)
+            toolchain = get_toolchain(self.ai_env_path)
+            conda_exe = toolchain.get("conda")
 
             if not conda_exe:
                 self.print_error("Conda executable not found!")
                 self.print_info("Checked locations:")
-                for loc in conda_locations:
-                    self.print_info(f"  - {loc}")
+                for source, loc in toolchain.candidates("conda"):
+                    self.print_info(f"  - {loc}" if source != "PATH" else "  - PATH")
                 return False
 
             # Activate conda environment and open prompt
@@ -211,16 +182,9 @@ class AppLaunchers:
             log_dir.mkdir(parents=True, exist_ok=True)
             
         try:
-            cmd = f'tensorboard --logdir="{log_dir}" --port=6006'
-            
-            success = self.process_manager.launch_custom_command(
-                cmd,
-                "TensorBoard",
-                self.ai_env_path
-            )
+            success = self.process_manager.launch_tensorboard(log_dir)
             
             if success:
-                self.print_success("TensorBoard launched successfully")
                 self.print_info("Access TensorBoard at: http://localhost:6006")
                 self.print_info("Use 'Background Processes' menu to manage it")
                 
@@ -228,7 +192,7 @@ class AppLaunchers:
                 try:
                     open_browser = input(f"\n{Fore.CYAN}Open TensorBoard in browser? (y/n): {Style.RESET_ALL}").lower()
                     if open_browser in ['y', 'yes']:
-                        time.sleep(3)  # Wait for server to start
+                        wait_for_port(6006, timeout=15)  # Returns as soon as the server listens
                         webbrowser.open('http://localhost:6006')
                         self.print_success("TensorBoard opened in browser")
                 except:
@@ -245,20 +209,10 @@ class AppLaunchers:
         print(f"\n{Fore.BLUE}🔬 Launching MLflow UI...{Style.RESET_ALL}")
         
         try:
-            # Set MLflow tracking directory
-            mlflow_dir = self.ai_env_path / "Projects" / "mlruns"
-            mlflow_dir.mkdir(parents=True, exist_ok=True)
-            
-            cmd = f'mlflow ui --backend-store-uri "file:///{mlflow_dir}" --port=5000'
-            
-            success = self.process_manager.launch_custom_command(
-                cmd,
-                "MLflow UI",
-                self.ai_env_path
-            )
+            # MLflow tracking directory: Projects/mlruns
+            success = self.process_manager.launch_mlflow_ui()
             
             if success:
-                self.print_success("MLflow UI launched successfully")
                 self.print_info("Access MLflow UI at: http://localhost:5000")
                 self.print_info("Use 'Background Processes' menu to manage it")
                 
@@ -266,7 +220,7 @@ class AppLaunchers:
                 try:
                     open_browser = input(f"\n{Fore.CYAN}Open MLflow UI in browser? (y/n): {Style.RESET_ALL}").lower()
                     if open_browser in ['y', 'yes']:
-                        time.sleep(3)  # Wait for server to start
+                        wait_for_port(5000, timeout=15)  # Returns as soon as the server listens
                         webbrowser.open('http://localhost:5000')
                         self.print_success("MLflow UI opened in browser")
                 except:
@@ -14,6 +14,8 @@ Handles Flask, Ollama, and other component setup
 import subprocess
 from pathlib import Path
 
+from ai_models_store import find_models_directory
+
 try:
     from colorama import Fore, Style
 except ImportError:
@@ -38,29 +40,8 @@ class ComponentSetup:
         Returns:
             Path: Path to models directory, or None if not found
         """
-        # Check multiple possible locations in priority order
-        possible_paths = [
-            self.ai_env_path / "AI_Environment" / "Models",        # Inside AI_Environment subfolder (check first)
-            self.ai_env_path / "Models",                           # Direct in AI_Lab
-            self.ai_env_path.parent / "AI_Environment" / "Models", # Sibling directory
-        ]
-
-        for path in possible_paths:
-            if path.exists() and path.is_dir():
-                # Verify this directory actually contains models by checking for blobs
-                blobs_dir = path / "blobs"
-                if blobs_dir.exists() and any(blobs_dir.iterdir()):
-                    return path
-
-        # If no existing directory with models found, check for any existing empty directories
-        for path in possible_paths:
-            if path.exists() and path.is_dir():
-                return path
-
-        # If no existing directory found, create in AI_Environment subfolder
-        default_path = self.ai_env_path / "AI_Environment" / "Models"
-        default_path.mkdir(parents=True, exist_ok=True)
-        return default_path
+        # Shared lookup; the resolved path is indexed and revalidated by mtime
+        return find_models_directory(self.ai_env_path)
         
     def print_info(self, message):
         """Print info message"""
@@ -106,69 +87,14 @@ class ComponentSetup:
             return False
             
     def setup_ollama(self):
-        """Setup Ollama server"""
-        try:
-            if not self.ollama_exe.exists():
-                self.print_error(f"Ollama not found at {self.ollama_exe}")
-                return False
-
-            # Check if Ollama is already running
-            result = subprocess.run(['tasklist', '/FI', 'IMAGENAME eq ollama.exe'],
-                                  capture_output=True,
-                                  text=True,
-                                  timeout=10)
+        """Setup Ollama server
 
-            if 'ollama.exe' in result.stdout:
-                self.print_success("Ollama server is already running")
-                return True
-            else:
-                self.print_info("Starting Ollama server...")
-
-                # Find and set models directory
-                models_path = self.find_models_directory()
-                self.print_info(f"Using models directory: {models_path}")
-
-                # Prepare environment with OLLAMA_MODELS variable
-                import os
-                env = os.environ.copy()
-                env['OLLAMA_MODELS'] = str(models_path)
-
-                process = subprocess.Popen(
-                    [str(self.ollama_exe), 'serve'],
-                    env=env,
-                    creationflags=subprocess.CREATE_NEW_CONSOLE
-                )
-                
-                # Track the process
-                try:
-                    from ai_process_manager import BackgroundProcessManager
-                    process_manager = BackgroundProcessManager(self.ai_env_path)
-                    process_manager.track_process(
-                        process_id="ollama_server_component_setup",
-                        name="Ollama Server (Component Setup)",
-                        pid=process.pid,
-                        command=f"{self.ollama_exe} serve",
-                        url="http://127.0.0.1:11434"
-                    )
-                except Exception as e:
-                    self.print_warning(f"Could not track Ollama process: {e}")
-                
-                # Wait and verify
-                import time
-                time.sleep(3)
-                
-                result = subprocess.run(['tasklist', '/FI', 'IMAGENAME eq ollama.exe'], 
-                                      capture_output=True, 
-                                      text=True, 
-                                      timeout=10)
-                
-                if 'ollama.exe' in result.stdout:
-                    self.print_success("Ollama server started successfully")
-                    return True
-                else:
-                    self.print_error("Failed to start Ollama server")
-                    return False
-                    
+        Started through OllamaManager, so the server is supervised (restarted
+        on failure) and tracked under the same 'ollama_server' id as the menu's.
+        """
+        try:
+            from ai_ollama_manager import OllamaManager
+            return OllamaManager(self.ai_env_path, self.ollama_exe).start_ollama_server()
         except Exception as e:
             self.print_error(f"Ollama setup error: {e}")
             return False
@@ -14,6 +14,7 @@ Comprehensive testing of all AI Environment components including model managemen
 
 import os
 import re
+import shutil
 import subprocess
 import sys
 from pathlib import Path
@@ -27,6 +28,7 @@ except ImportError:
 
 from ai_path_manager import PathManager
 from ai_conda_manager import CondaManager
+from ai_package_validator import validate_packages
 
 class ComponentTester:
     """Comprehensive testing of AI Environment components"""
@@ -171,47 +173,35 @@ class ComponentTester:
             return False
             
     def test_python_packages(self):
-        """Test required Python packages"""
+        """Test required Python packages (imported in one AI2025 interpreter)"""
         required_packages = ["psutil", "colorama", "requests", "numpy", "pandas"]
         
         try:
             # Activate environment and test packages
             conda_manager = CondaManager(self.conda_path)
             conda_manager.setup_conda_paths("AI2025")
+            python_exe = shutil.which("python") or sys.executable
             
-            package_results = []
-            for package in required_packages:
-                try:
-                    # Special handling for packages that can be slow to import
-                    if package == "pandas":
-                        timeout_duration = 15
-                        self.print_info(f"  Testing {package} (may take a moment)...")
-                    elif package == "numpy":
-                        timeout_duration = 10
-                        self.print_info(f"  Testing {package} (may take a moment)...")
-                    else:
-                        timeout_duration = 5
-                    
-                    result = subprocess.run(["python", "-c", f"import {package}; print('{package} OK')"], 
-                                          capture_output=True, text=True, timeout=timeout_duration)
-                    if result.returncode == 0:
-                        self.print_success(f"  ✓ {package} package available")
-                        package_results.append(True)
-                    else:
-                        self.print_error(f"  ✗ {package} package missing or broken")
-                        package_results.append(False)
-                except subprocess.TimeoutExpired:
-                    self.print_error(f"  ✗ {package} test error: Command 'python -c import {package}' timed out after {timeout_duration} seconds")
-                    package_results.append(False)
-                except Exception as e:
-                    self.print_error(f"  ✗ {package} test error: {e}")
-                    package_results.append(False)
+            self.print_info(f"  Importing {len(required_packages)} packages in one interpreter...")
+            report = validate_packages(required_packages, python=python_exe, full_import=True,
+                                       import_timeout=15)
+            if report["error"]:
+                self.print_error(f"  ✗ Package test error: {report['error']}")
+            
+            for package in report["packages"]:
+                name = package["name"]
+                if package["status"] == "ok":
+                    self.print_success(f"  ✓ {name} package available ({package['version'] or 'unknown version'})")
+                elif package["status"] == "import_timeout":
+                    self.print_error(f"  ✗ {name} test error: import timed out after 15 seconds")
+                else:
+                    self.print_error(f"  ✗ {name} package missing or broken")
             
-            if all(package_results):
+            if report["ok"]:
                 self.print_success("Python packages test PASSED")
                 return True
             else:
-                missing_count = len([r for r in package_results if not r])
+                missing_count = len([p for p in report["packages"] if p["status"] != "ok"])
                 self.print_error(f"Python packages test FAILED - {missing_count}/{len(required_packages)} packages missing")
                 return False
                 
@@ -15,6 +15,8 @@ import json
 import subprocess
 from pathlib import Path
 
+from ai_package_validator import validate_packages
+
 try:
     from colorama import Fore, Style, init
     init(autoreset=True)
@@ -29,12 +31,16 @@ except ImportError:
 class EnvironmentValidator:
     """Validates AI Environment against configuration requirements"""
     
-    def __init__(self, ai_env_path):
+    def __init__(self, ai_env_path, python_exe=None, full_import=False):
         self.ai_env_path = Path(ai_env_path)
         self.config_path = self.ai_env_path / "config" / "install_config.json"
         self.config = None
         self.missing_packages = []
         self.installed_packages = []
+        # Interpreter whose packages are checked, and whether to fully import each one
+        self.python_exe = python_exe or sys.executable
+        self.full_import = full_import
+        self.report = None
         
     def load_config(self):
         """Load install configuration"""
@@ -51,40 +57,40 @@ class EnvironmentValidator:
             return False
     
     def check_python_packages(self):
-        """Check installed Python packages against requirements"""
+        """Check installed Python packages against requirements (one child interpreter)"""
         if not self.config:
             return False
             
         required_packages = self.config.get('python_packages', [])
-        print(f"{Fore.CYAN}[INFO] Checking {len(required_packages)} required packages...")
+        mode = "importing" if self.full_import else "checking"
+        print(f"{Fore.CYAN}[INFO] {mode.capitalize()} {len(required_packages)} required packages...")
         
         self.missing_packages = []
         self.installed_packages = []
         
-        for package in required_packages:
-            # Extract package name (remove version constraints)
-            package_name = package.split('>=')[0].split('==')[0].split('<')[0].split('>')[0]
-            
-            try:
-                # Try to import the package
-                result = subprocess.run([
-                    sys.executable, '-c', f'import {package_name}; print("OK")'
-                ], capture_output=True, text=True, timeout=10)
-                
-                if result.returncode == 0:
-                    self.installed_packages.append(package)
-                    print(f"{Fore.GREEN}[OK]   ✓ {package_name}")
-                else:
-                    self.missing_packages.append(package)
-                    print(f"{Fore.RED}[MISSING] ✗ {package_name}")
-                    
-            except subprocess.TimeoutExpired:
-                print(f"{Fore.YELLOW}[TIMEOUT] ? {package_name} (import timeout)")
-                self.missing_packages.append(package)
-            except Exception as e:
-                print(f"{Fore.RED}[ERROR] ✗ {package_name}: {e}")
-                self.missing_packages.append(package)
-        
+        self.report = validate_packages(required_packages, python=self.python_exe,
+                                        full_import=self.full_import)
+        if self.report["error"]:
+            print(f"{Fore.RED}[ERROR] Package check failed: {self.report['error']}")
+        
+        for package in self.report["packages"]:
+            name = package["name"]
+            version = f" {package['version']}" if package["version"] else ""
+            if package["status"] == "ok":
+                self.installed_packages.append(package["requirement"])
+                print(f"{Fore.GREEN}[OK]   ✓ {name}{version}")
+                continue
+            self.missing_packages.append(package["requirement"])
+            if package["status"] == "outdated":
+                print(f"{Fore.YELLOW}[OUTDATED] ✗ {name}{version} (requires {package['specifier']})")
+            elif package["status"] == "import_timeout":
+                print(f"{Fore.YELLOW}[TIMEOUT] ? {name} (import timeout)")
+            elif package["status"] == "import_failed":
+                print(f"{Fore.RED}[ERROR] ✗ {name}: {package['error']}")
+            else:
+                print(f"{Fore.RED}[MISSING] ✗ {name}")
+        
+        print(f"{Fore.CYAN}[INFO] Checked in {self.report['elapsed_ms']:.0f} ms")
         return len(self.missing_packages) == 0
     
     def generate_summary_report(self):
@@ -150,8 +156,9 @@ class EnvironmentValidator:
         for package in self.missing_packages:
             try:
                 print(f"{Fore.CYAN}[INFO] Installing {package}...")
+                # Install into the interpreter that was checked
                 result = subprocess.run([
-                    sys.executable, '-m', 'pip', 'install', package
+                    str(self.python_exe), '-m', 'pip', 'install', package
                 ], capture_output=True, text=True, timeout=300)
                 
                 if result.returncode == 0:
@@ -199,10 +206,13 @@ def main():
     parser = argparse.ArgumentParser(description='AI Environment Validator')
     parser.add_argument('--ai-env-path', default='.', 
                        help='Path to AI Environment directory')
+    parser.add_argument('--python', help='Interpreter to validate (default: this one)')
+    parser.add_argument('--full-import', action='store_true',
+                       help='Import every package instead of only locating it')
     
     args = parser.parse_args()
     
-    validator = EnvironmentValidator(args.ai_env_path)
+    validator = EnvironmentValidator(args.ai_env_path, python_exe=args.python, full_import=args.full_import)
     success = validator.run_validation()
     
     sys.exit(0 if success else 1)
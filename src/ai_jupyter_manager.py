@@ -27,6 +27,8 @@ try:
 except ImportError:
     PSUTIL_AVAILABLE = False
 
+from ai_process_supervisor import wait_for_port, wait_for_port_closed
+
 # Try to import colorama, fallback if not available
 try:
     from colorama import Fore, Style, init
@@ -180,38 +182,30 @@ class JupyterLabManager:
             except Exception as e:
                 self.print_warning(f"Could not track Jupyter process: {e}")
 
-            # Wait for server to start with retry mechanism
+            # Wait until the port accepts connections (or the process dies)
             self.print_info("Waiting for server to start...")
             max_wait_time = 15  # Maximum 15 seconds
-            check_interval = 1  # Check every 1 second
-            checks_performed = 0
-
-            for attempt in range(max_wait_time):
-                time.sleep(check_interval)
-                checks_performed += 1
+            started = time.monotonic()
 
-                if self.is_server_running(port):
-                    self.print_success(f"Jupyter Lab server started successfully on port {port} (after {checks_performed} seconds)")
-                    self.print_info(f"Working directory: {projects_dir}")
-                    self.print_info(f"Access at: http://localhost:{port}/lab")
+            if wait_for_port(port, host="localhost", timeout=max_wait_time, process=process):
+                self.print_success(f"Jupyter Lab server started successfully on port {port} (after {time.monotonic() - started:.1f} seconds)")
+                self.print_info(f"Working directory: {projects_dir}")
+                self.print_info(f"Access at: http://localhost:{port}/lab")
 
-                    # Update tracked process URL
-                    try:
-                        process_manager.tracked_processes[f"jupyter_lab_server_{port}"]['url'] = f"http://localhost:{port}/lab"
-                        process_manager.save_tracked_processes()
-                    except Exception:
-                        pass
-
-                    return True
+                # Update tracked process URL
+                try:
+                    process_manager.tracked_processes[f"jupyter_lab_server_{port}"]['url'] = f"http://localhost:{port}/lab"
+                    process_manager.save_tracked_processes()
+                except Exception:
+                    pass
 
-                # Show progress dots
-                if attempt % 3 == 0:
-                    print(f"{Fore.YELLOW}.{Style.RESET_ALL}", end="", flush=True)
+                return True
 
-            print()  # New line after dots
-            
-            # Final check - server might be starting but not ready yet
-            self.print_warning(f"Server not accessible on port {port} after {max_wait_time} seconds")
+            if process.poll() is not None:
+                self.print_warning(f"Jupyter Lab process exited with code {process.returncode}")
+            else:
+                # Server might be starting but not ready yet
+                self.print_warning(f"Server not accessible on port {port} after {max_wait_time} seconds")
             
             # Try to get error output from the process
             try:
@@ -289,23 +283,10 @@ class JupyterLabManager:
         server_started = self.start_server_only(port)
         
         if server_started:
-            # Wait for server to fully start with timeout
-            self.print_info("Waiting for server to fully initialize...")
-            max_wait = 10  # Maximum 10 seconds
-            wait_time = 0
-            
-            while wait_time < max_wait:
-                time.sleep(1)
-                wait_time += 1
-                if self.is_server_running(port):
-                    self.print_success("Server is ready!")
-                    break
-                print(f"{Fore.YELLOW}.{Style.RESET_ALL}", end="", flush=True)
-            
-            print()  # New line after dots
-            
-            # Check if server is actually running
-            if self.is_server_running(port):
+            # start_server_only returns once the port accepts connections;
+            # this only covers a server that was still initializing
+            if wait_for_port(port, host="localhost", timeout=10):
+                self.print_success("Server is ready!")
                 # Then start client
                 return self.start_client_only(port)
             else:
@@ -391,9 +372,8 @@ class JupyterLabManager:
                 if self._stop_server_on_port(port):
                     stopped_any = True
                     
-                    # Wait a moment and verify it stopped
-                    time.sleep(2)
-                    if not self.is_server_running(port):
+                    # Returns as soon as the port is released
+                    if wait_for_port_closed(port, host="localhost", timeout=10):
                         self.print_success(f"Successfully stopped server on port {port}")
                     else:
                         self.print_warning(f"Server on port {port} may still be running")
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+AI Lazy Import
+Deferred module loading and an import-time profiler for the launcher
+
+lazy_import() and lazy_attr() return stand-ins that import the real module
+on first use, so the main menu does not pay for Ollama/requests, model
+management, Jupyter or VS Code configuration until an option needs them:
+
+    OllamaManager = lazy_attr("ai_ollama_manager", "OllamaManager")
+    manager = OllamaManager(ai_env_path)      # ai_ollama_manager imported here
+
+ImportProfiler records how long each module takes to execute, nested like
+`python -X importtime`, and formats a report of the slowest ones.
+
+Version: 3.0.28
+Author: AI Environment Team
+Date: 2026-10-17
+"""
+
+import importlib
+import sys
+import threading
+import time
+
+
+class LazyModule:
+    """Module stand-in that imports the module on first attribute access"""
+
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            with self.__dict__["_lock"]:
+                module = self.__dict__["_module"]
+                if module is None:
+                    module = importlib.import_module(self.__dict__["_name"])
+                    self.__dict__["_module"] = module
+        return module
+
+    @property
+    def is_loaded(self):
+        return self.__dict__["_module"] is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+
+class LazyAttribute:
+    """Stand-in for a class or function that imports its module when used"""
+
+    def __init__(self, module_name, attr):
+        self._module_name = module_name
+        self._module = lazy_import(module_name)
+        self._attr = attr
+        self._target = None
+
+    def resolve(self):
+        """Import the module and return the real object"""
+        if self._target is None:
+            self._target = getattr(self._module, self._attr)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self):
+        return f"<lazy {self._module_name}.{self._attr}>"
+
+
+_lazy_modules = {}
+_lazy_modules_lock = threading.Lock()
+
+
+def lazy_import(name):
+    """Return the module if already imported, else a shared LazyModule"""
+    if name in sys.modules:
+        return sys.modules[name]
+    with _lazy_modules_lock:
+        if name not in _lazy_modules:
+            _lazy_modules[name] = LazyModule(name)
+        return _lazy_modules[name]
+
+
+def lazy_attr(module_name, attr):
+    """Return a stand-in for module_name.attr that imports on first call"""
+    return LazyAttribute(module_name, attr)
+
+
+class _TimedLoader:
+    """Wraps a loader for one import to time exec_module"""
+
+    def __init__(self, loader, profiler):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # Put the real loader back so the module looks normally imported
+        module.__loader__ = self._loader
+        if getattr(module, "__spec__", None) is not None:
+            module.__spec__.loader = self._loader
+        self._profiler._enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(module.__name__)
+
+
+class ImportProfiler:
+    """Meta path hook recording per-module import times (-X importtime style)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.records = []         # (depth, name, self_us, cumulative_us) in completion order
+        self._stack = []          # [name, start, child_us]
+        self._local = threading.local()
+
+    def start(self):
+        """Install the hook at the front of sys.meta_path"""
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+        return self
+
+    def stop(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path=None, target=None):
+        # Only time imports made on the thread that started the launcher
+        if getattr(self._local, "busy", False) or threading.current_thread() is not threading.main_thread():
+            return None
+        self._local.busy = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _TimedLoader(spec.loader, self)
+                    return spec
+            return None
+        finally:
+            self._local.busy = False
+
+    def _enter(self, name):
+        self._stack.append([name, time.perf_counter(), 0])
+
+    def _exit(self, name):
+        name, start, child_us = self._stack.pop()
+        cumulative_us = int((time.perf_counter() - start) * 1_000_000)
+        self.records.append((len(self._stack), name, cumulative_us - child_us, cumulative_us))
+        if self._stack:
+            self._stack[-1][2] += cumulative_us
+
+    def elapsed_ms(self):
+        """Milliseconds since the profiler was created"""
+        return (time.perf_counter() - self.started) * 1000
+
+    def total_import_ms(self):
+        """Milliseconds spent in top-level imports"""
+        return sum(cumulative for depth, _, _, cumulative in self.records if depth == 0) / 1000
+
+    def report(self, limit=15, prefix=""):
+        """Format the slowest imports by cumulative time
+
+        Args:
+            limit (int): Number of modules to list
+            prefix (str): Only list modules starting with this (e.g. 'ai_')
+        """
+        rows = [record for record in self.records if record[1].startswith(prefix)]
+        rows.sort(key=lambda record: record[3], reverse=True)
+        lines = [f"Imported {len(self.records)} modules in {self.total_import_ms():.1f} ms "
+                 f"({self.elapsed_ms():.1f} ms since start)",
+                 f"{'self [us]':>10} | {'cumulative':>10} | module"]
+        for depth, name, self_us, cumulative_us in rows[:limit]:
+            lines.append(f"{self_us:>10} | {cumulative_us:>10} | {'  ' * depth}{name}")
+        return "\n".join(lines)
@@ -144,6 +144,7 @@ class MenuSystem:
         print(f" 2. {Fore.RED}🛑 Stop Specific Process{Style.RESET_ALL}")
         print(f" 3. {Fore.RED}⚠️ Stop All Background Processes{Style.RESET_ALL}")
         print(f" 4. {Fore.GREEN}🔄 Refresh Process List{Style.RESET_ALL}")
+        print(f" 5. {Fore.CYAN}📈 Live Resource Dashboard{Style.RESET_ALL}")
         print(f" 0. {Fore.YELLOW}⬅️ Back to Main Menu{Style.RESET_ALL}")
         
     def print_validation_menu(self):
@@ -8,8 +8,8 @@ Date: 2025-08-14
 Time: 10:30
 """
 
-import subprocess
-import requests
+import sys
+import time
 from pathlib import Path
 
 try:
@@ -20,16 +20,23 @@ except ImportError:
     class Style:
         RESET_ALL = ""
 
+from ai_model_pull import PullQueue, format_progress, format_duration, estimate_download_time
+from ai_models_store import ModelStore
+
 class ModelDownloader:
     """Handles AI model downloading"""
     
-    def __init__(self, ollama_path):
+    def __init__(self, ollama_path, models_dir=None):
         """Initialize Model Downloader
         
         Args:
             ollama_path (Path): Path to Ollama executable
+            models_dir (Path, optional): Ollama models directory; enables the
+                free-space preflight before each pull
         """
         self.ollama_path = Path(ollama_path)
+        self.store = ModelStore(models_dir) if models_dir else None
+        self.pull_queue = PullQueue(preflight=self.store.preflight if self.store else None)
         
         # Popular models for quick download
         self.popular_models = {
@@ -93,10 +100,13 @@ class ModelDownloader:
         print(f" 1. {Fore.CYAN}📋 Popular Models (Quick Download){Style.RESET_ALL}")
         print(f" 2. {Fore.YELLOW}🔗 Custom Model (Enter URL/Name){Style.RESET_ALL}")
         print(f" 3. {Fore.BLUE}🌐 Browse Ollama Library{Style.RESET_ALL}")
+        print(f" 4. {Fore.MAGENTA}📥 Queue Several Models{Style.RESET_ALL}")
+        pending = self.pull_queue.pending()
+        print(f" 5. {Fore.GREEN}♻️ Resume Incomplete Downloads ({len(pending)}){Style.RESET_ALL}")
         print(f" 0. {Fore.WHITE}⬅️ Back{Style.RESET_ALL}")
         
         try:
-            choice = input(f"\n{Fore.YELLOW}Enter your choice (0-3): {Style.RESET_ALL}")
+            choice = input(f"\n{Fore.YELLOW}Enter your choice (0-5): {Style.RESET_ALL}")
             choice = int(choice)
             
             if choice == 0:
@@ -107,6 +117,10 @@ class ModelDownloader:
                 self.download_custom_model()
             elif choice == 3:
                 self.browse_ollama_library()
+            elif choice == 4:
+                self.download_multiple_models()
+            elif choice == 5:
+                self.resume_downloads()
             else:
                 self.print_error("Invalid choice")
         except ValueError:
@@ -129,6 +143,7 @@ class ModelDownloader:
             
             if choice in self.popular_models:
                 model = self.popular_models[choice]
+                self.print_info(f"Estimated time: {self.estimate_download_time(float(model['size'].split()[0]))}")
                 self.download_model(model['name'], model['display_name'])
             else:
                 self.print_error("Invalid choice")
@@ -170,6 +185,79 @@ class ModelDownloader:
         
         self.print_info("Copy model name from the website and use option 2 (Custom Model)")
 
+    def download_multiple_models(self):
+        """Queue several popular models and pull them concurrently"""
+        print(f"\n{Fore.MAGENTA}📥 Queue Several Models:{Style.RESET_ALL}")
+        for key, model in self.popular_models.items():
+            print(f" {key}. {model['display_name']} ({model['size']})")
+        
+        choice = input(f"\n{Fore.YELLOW}Enter numbers or model names separated by commas: {Style.RESET_ALL}")
+        models = []
+        for item in (part.strip() for part in choice.split(",")):
+            if item in self.popular_models:
+                models.append(self.popular_models[item]['name'])
+            elif item:
+                models.append(item)
+        
+        if not models:
+            self.print_info("Nothing queued")
+            return
+        self.run_pull_queue(models)
+
+    def resume_downloads(self):
+        """Re-issue pulls left incomplete by an earlier session"""
+        pending = self.pull_queue.pending()
+        if not pending:
+            self.print_info("No incomplete downloads")
+            return
+        self.print_info(f"Resuming: {', '.join(pending)}")
+        self.run_pull_queue()
+
+    def run_pull_queue(self, models=None):
+        """Pull queued models through the API with a live progress line
+        
+        Args:
+            models (list, optional): Models to add to the queue first
+            
+        Returns:
+            dict: model -> final status
+        """
+        if self.pull_queue.client.version() is None:
+            self.print_error("Ollama server is not running")
+            self.print_info("Start it from the main menu, then try again (queued downloads are kept)")
+            for model in models or []:
+                self.pull_queue.add(model)
+            return {}
+        
+        print(f"{Fore.YELLOW}Progress (Ctrl+C to pause - downloads resume later):{Style.RESET_ALL}")
+        last_render = [0.0]
+        
+        def on_progress(progress):
+            now = time.monotonic()
+            if progress['status'] != 'pulling':
+                sys.stdout.write("\r\033[K")
+                print(f"  {format_progress(progress)}")
+            elif now - last_render[0] >= 0.5:
+                active = [p for p in self.pull_queue.snapshot() if p['status'] == 'pulling']
+                line = " | ".join(format_progress(p) for p in active)
+                sys.stdout.write(f"\r\033[K  {line}")
+                sys.stdout.flush()
+            else:
+                return
+            last_render[0] = now
+        
+        try:
+            results = self.pull_queue.run(models, on_progress=on_progress)
+        except KeyboardInterrupt:
+            print()
+            self.print_warning("Downloads paused - use 'Resume Incomplete Downloads' to continue")
+            return {}
+        
+        for model, status in results.items():
+            if status == 'failed':
+                self.print_error(f"Failed to download {model}")
+        return results
+
     def download_model(self, model_name, display_name=None):
         """Download a specific model
         
@@ -185,35 +273,9 @@ class ModelDownloader:
         self.print_warning("Do not close this window during download")
         
         try:
-            # Check if Ollama is available
-            if not self.ollama_path.exists():
-                self.print_error(f"Ollama not found at: {self.ollama_path}")
-                return False
-            
-            # Start download
-            process = subprocess.Popen(
-                [str(self.ollama_path), "pull", model_name],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                encoding='utf-8',
-                errors='replace'
-            )
-            
-            # Show progress
-            print(f"{Fore.YELLOW}Progress:{Style.RESET_ALL}")
-            for line in process.stdout:
-                if line.strip():
-                    # Clean up the progress line
-                    if "pulling" in line.lower() or "%" in line:
-                        print(f"  {line.strip()}")
-                    elif "success" in line.lower():
-                        print(f"  {Fore.GREEN}{line.strip()}{Style.RESET_ALL}")
+            results = self.run_pull_queue([model_name])
             
-            # Wait for completion
-            return_code = process.wait()
-            
-            if return_code == 0:
+            if results.get(model_name) == 'done':
                 self.print_success(f"Successfully downloaded {display_name}")
                 self.print_info(f"Model '{model_name}' is now available")
                 self.show_usage_example(model_name)
@@ -222,10 +284,6 @@ class ModelDownloader:
                 self.print_error(f"Failed to download {display_name}")
                 return False
                 
-        except FileNotFoundError:
-            self.print_error("Ollama executable not found")
-            self.print_info("Make sure Ollama is properly installed")
-            return False
         except Exception as e:
             self.print_error(f"Download failed: {e}")
             return False
@@ -251,29 +309,23 @@ class ModelDownloader:
         """Check available disk space (Windows specific)"""
         try:
             import shutil
-            total, used, free = shutil.disk_usage(str(self.ollama_path.parent))
+            volume = self.store.models_dir if self.store and self.store.models_dir.exists() else self.ollama_path.parent
+            total, used, free = shutil.disk_usage(str(volume))
             free_gb = free // (1024**3)
             return free_gb
         except:
             return None
 
-    def estimate_download_time(self, size_gb, speed_mbps=10):
+    def estimate_download_time(self, size_gb, speed_mbps=None):
         """Estimate download time
         
         Args:
             size_gb (float): Size in GB
-            speed_mbps (float): Internet speed in Mbps
+            speed_mbps (float, optional): Internet speed in Mbps (default: the
+                throughput measured during the last pull, or 10 Mbps)
             
         Returns:
             str: Estimated time string
         """
-        size_mb = size_gb * 1024
-        time_seconds = (size_mb * 8) / speed_mbps
-        
-        if time_seconds < 60:
-            return f"{int(time_seconds)} seconds"
-        elif time_seconds < 3600:
-            return f"{int(time_seconds / 60)} minutes"
-        else:
-            return f"{int(time_seconds / 3600)} hours"
-			
\ No newline at end of file
+        rate_bps = speed_mbps * 1000 * 1000 / 8 if speed_mbps else self.pull_queue.measured_rate_bps
+        return format_duration(estimate_download_time(size_gb * 1000 ** 3, rate_bps))
@@ -7,8 +7,6 @@ Time: 05:30
 Handles loading and managing AI models with help system
 """
 
-import subprocess
-import time
 from pathlib import Path
 
 try:
@@ -19,18 +17,26 @@ except ImportError:
     class Style:
         RESET_ALL = ""
 
+from ai_model_registry import format_size, get_registry
+from ai_model_warmup import get_warmup
+from ai_model_residency import get_planner
+
 class ModelLoader:
     """Handles AI model loading and help system"""
     
-    def __init__(self, ollama_path, help_path):
+    def __init__(self, ollama_path, help_path, registry=None):
         """Initialize Model Loader
         
         Args:
             ollama_path (Path): Path to Ollama executable
             help_path (Path): Path to help directory containing model documentation
+            registry (ModelRegistry, optional): Shared model registry
         """
         self.ollama_path = Path(ollama_path)
         self.help_path = Path(help_path)
+        self.registry = registry or get_registry()
+        self.warmup = get_warmup()
+        self.planner = get_planner()
         
         # Model help file mapping
         self.help_files = {
@@ -57,63 +63,41 @@ class ModelLoader:
         """Print warning message"""
         print(f"{Fore.YELLOW}⚠️  {message}{Style.RESET_ALL}")
 
-    def get_installed_models(self):
-        """Get list of installed models"""
-        try:
-            result = subprocess.run(
-                [str(self.ollama_path), "list"],
-                capture_output=True,
-                text=True,
-                check=True,
-                encoding='utf-8',
-                errors='replace'
-            )
-            
-            models = []
-            lines = result.stdout.strip().split('\n')[1:]  # Skip header
-            for line in lines:
-                if line.strip():
-                    parts = line.split()
-                    if len(parts) >= 3:
-                        models.append({
-                            'name': parts[0],
-                            'id': parts[1],
-                            'size': parts[2],
-                            'modified': ' '.join(parts[3:]) if len(parts) > 3 else 'Unknown'
-                        })
-            return models
-        except Exception as e:
-            self.print_error(f"Failed to get installed models: {e}")
-            return []
+    def get_installed_models(self, from_disk=False):
+        """Get list of installed models
+        
+        Args:
+            from_disk (bool): If the server does not answer, read the models
+                directory instead (e.g. before Ollama has been started)
+        """
+        models = self.registry.installed()
+        if self.registry.last_error and from_disk:
+            models = self.get_installed_models_from_disk()
+            if models:
+                return models
+        if self.registry.last_error:
+            self.print_error(f"Failed to get installed models: {self.registry.last_error}")
+        return models
+
+    def get_installed_models_from_disk(self):
+        """Installed models from the manifests in the models directory (no server needed)
+        
+        Returns:
+            list: Records with 'name' and 'size', sorted by name
+        """
+        from ai_models_store import ModelStore, find_models_directory
+
+        # help/ lives in the AI_Environment root
+        store = ModelStore(find_models_directory(self.help_path.parent))
+        return [{"name": name, "size": format_size(usage["total_bytes"])}
+                for name, usage in sorted(store.model_usage().items()) if not usage["missing"]]
 
     def get_loaded_models(self):
         """Get list of currently loaded models"""
-        try:
-            result = subprocess.run(
-                [str(self.ollama_path), "ps"],
-                capture_output=True,
-                text=True,
-                check=True,
-                encoding='utf-8',
-                errors='replace'
-            )
-            
-            models = []
-            lines = result.stdout.strip().split('\n')[1:]  # Skip header
-            for line in lines:
-                if line.strip():
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        models.append({
-                            'name': parts[0],
-                            'id': parts[1],
-                            'size': parts[2] if len(parts) > 2 else 'Unknown',
-                            'processor': parts[3] if len(parts) > 3 else 'Unknown'
-                        })
-            return models
-        except Exception as e:
-            self.print_error(f"Failed to get loaded models: {e}")
-            return []
+        models = self.registry.loaded()
+        if self.registry.last_error:
+            self.print_error(f"Failed to get loaded models: {self.registry.last_error}")
+        return models
 
     def show_load_menu(self):
         """Show model loading menu"""
@@ -123,8 +107,7 @@ class ModelLoader:
             self.print_info("Use option 1 to download models first")
             return
         
-        loaded = self.get_loaded_models()
-        loaded_names = [m['name'] for m in loaded]
+        loaded_names = self.registry.loaded_names()
         
         print(f"\n{Fore.BLUE}🚀 Load AI Model:{Style.RESET_ALL}")
         print("Available models:")
@@ -156,8 +139,7 @@ class ModelLoader:
             model_name (str): Name of the model to load
         """
         # Check if already loaded
-        loaded = self.get_loaded_models()
-        if model_name in [m['name'] for m in loaded]:
+        if self.registry.is_loaded(model_name):
             self.print_info(f"Model '{model_name}' is already loaded")
             self.show_usage_instructions(model_name)
             return True
@@ -166,39 +148,33 @@ class ModelLoader:
         self.print_info("This may take 30 seconds to 5 minutes depending on model size")
         
         try:
-            # Start loading process with proper encoding
-            process = subprocess.Popen(
-                [str(self.ollama_path), "run", model_name, "Hello"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                stdin=subprocess.PIPE,
-                text=True,
-                encoding='utf-8',
-                errors='replace'
-            )
+            # Make room first: unload least-recently-used models, or refuse a
+            # load that would push the system into swap
+            plan = self.planner.ensure_capacity(model_name)
+            if not plan['fits']:
+                self.print_error(f"Not loading {model_name}: {plan['reason']}")
+                self.print_info("Unload other models or choose a smaller one like phi:2.7b")
+                return False
+            for name in plan['unloaded']:
+                self.print_info(f"Unloaded {name} to free memory")
             
-            # Send a simple prompt to load the model with extended timeout
-            try:
-                stdout, stderr = process.communicate(input="\n", timeout=300)  # 5 minutes for large models
-                
-                # Check if model is now loaded
-                time.sleep(3)  # Give more time for large models
-                loaded = self.get_loaded_models()
-                if model_name in [m['name'] for m in loaded]:
-                    self.print_success(f"Successfully loaded {model_name}")
-                    self.show_usage_instructions(model_name)
-                    return True
+            # Preload through the API (empty prompt + keep_alive) - no generation
+            result = self.warmup.warm(model_name)
+            
+            if result['ok'] and self.registry.is_loaded(model_name):
+                self.print_success(f"Successfully loaded {model_name}")
+                self.print_info(f"Load latency: {result['latency_s']:.2f}s (model load {result['load_duration_s']:.2f}s)")
+                self.show_usage_instructions(model_name)
+                return True
+            
+            self.print_error(f"Failed to load {model_name}")
+            if result['error']:
+                if 'timed out' in result['error'].lower():
+                    self.print_error("Loading timed out (5 minutes) - model may be too large")
+                    self.print_info("Try using a smaller model like phi:2.7b or mistral:7b")
                 else:
-                    self.print_error(f"Failed to load {model_name}")
-                    if stderr:
-                        self.print_error(f"Error: {stderr}")
-                    return False
-                    
-            except subprocess.TimeoutExpired:
-                process.kill()
-                self.print_error("Loading timed out (5 minutes) - model may be too large")
-                self.print_info("Try using a smaller model like phi:2.7b or mistral:7b")
-                return False
+                    self.print_error(f"Error: {result['error']}")
+            return False
                 
         except Exception as e:
             self.print_error(f"Error loading model: {e}")
@@ -308,7 +284,7 @@ class ModelLoader:
             self.print_error(f"Error reading help file: {e}")
 
     def select_model_for_activation(self, default_model="phi:2.7b"):
-        """Select model for Full Activation
+        """Select model for Full Activation (works before Ollama is started)
         
         Args:
             default_model (str): Default model to suggest
@@ -316,7 +292,7 @@ class ModelLoader:
         Returns:
             str: Selected model name or None if cancelled
         """
-        installed = self.get_installed_models()
+        installed = self.get_installed_models(from_disk=True)
         if not installed:
             self.print_warning("No models installed")
             self.print_info("Proceeding without model loading")
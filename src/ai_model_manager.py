@@ -9,7 +9,6 @@ Time: 10:30
 """
 
 import os
-import subprocess
 import json
 from pathlib import Path
 
@@ -23,6 +22,10 @@ except ImportError:
 
 from ai_model_downloader import ModelDownloader
 from ai_model_loader import ModelLoader
+from ai_model_registry import get_registry, format_size, normalize_name
+from ai_model_residency import get_planner
+from ai_models_store import ModelStore, format_gb
+from ai_ollama_manager import OllamaManager
 
 class AIModelManager:
     """Comprehensive AI model management system"""
@@ -38,9 +41,12 @@ class AIModelManager:
         self.ollama_path = ollama_path or self.ai_env_path / "Ollama" / "ollama.exe"
         self.models_help_path = self.ai_env_path / "models"
         
-        # Initialize components
-        self.downloader = ModelDownloader(self.ollama_path)
-        self.loader = ModelLoader(self.ollama_path, self.models_help_path)
+        # Initialize components (all menus share one model registry)
+        self.registry = get_registry()
+        self.models_dir = OllamaManager(self.ai_env_path, self.ollama_path).find_models_directory()
+        self.store = ModelStore(self.models_dir)
+        self.downloader = ModelDownloader(self.ollama_path, self.models_dir)
+        self.loader = ModelLoader(self.ollama_path, self.models_help_path, registry=self.registry)
         
         # Ensure models help directory exists
         self.models_help_path.mkdir(exist_ok=True)
@@ -105,65 +111,21 @@ class AIModelManager:
 
     def get_installed_models(self):
         """Get list of installed models"""
-        try:
-            result = subprocess.run(
-                [str(self.ollama_path), "list"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            models = []
-            lines = result.stdout.strip().split('\n')[1:]  # Skip header
-            for line in lines:
-                if line.strip():
-                    parts = line.split()
-                    if len(parts) >= 3:
-                        models.append({
-                            'name': parts[0],
-                            'id': parts[1],
-                            'size': parts[2],
-                            'modified': ' '.join(parts[3:]) if len(parts) > 3 else 'Unknown'
-                        })
-            return models
-        except Exception as e:
-            self.print_error(f"Failed to get installed models: {e}")
-            return []
+        return self.loader.get_installed_models()
 
     def get_loaded_models(self):
         """Get list of currently loaded models"""
-        try:
-            result = subprocess.run(
-                [str(self.ollama_path), "ps"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            models = []
-            lines = result.stdout.strip().split('\n')[1:]  # Skip header
-            for line in lines:
-                if line.strip():
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        models.append({
-                            'name': parts[0],
-                            'id': parts[1],
-                            'size': parts[2] if len(parts) > 2 else 'Unknown',
-                            'processor': parts[3] if len(parts) > 3 else 'Unknown'
-                        })
-            return models
-        except Exception as e:
-            self.print_error(f"Failed to get loaded models: {e}")
-            return []
+        return self.loader.get_loaded_models()
 
     def handle_download_model(self):
         """Handle model download"""
         self.downloader.show_download_menu()
+        self.registry.invalidate()
 
     def handle_load_model(self):
         """Handle model loading"""
         self.loader.show_load_menu()
+        self.registry.invalidate()
 
     def handle_show_available(self):
         """Handle showing available models"""
@@ -175,14 +137,27 @@ class AIModelManager:
             self.print_info("Use option 1 to download models")
             return
         
+        loaded_names = self.registry.loaded_names()
         print(f"\n{Fore.GREEN}Installed Models:{Style.RESET_ALL}")
         for i, model in enumerate(installed, 1):
-            status = "✅" if model['name'] in [m['name'] for m in self.get_loaded_models()] else "⭕"
-            print(f" {i}. {status} {model['name']} ({model['size']}) - {model['modified']}")
+            status = "✅" if model['name'] in loaded_names else "⭕"
+            details = " ".join(part for part in (model['parameter_size'], model['quantization']) if part)
+            details = f" [{details}]" if details else ""
+            print(f" {i}. {status} {model['name']} ({model['size']}){details} - {model['modified']}")
+        
+        usage = self.store.model_usage()
+        if usage:
+            summary = self.store.summary()
+            print(f"\n{Fore.CYAN}Disk Usage ({self.models_dir}):{Style.RESET_ALL}")
+            for name in sorted(usage):
+                shared = usage[name]['shared_bytes']
+                shared_text = f", {format_gb(shared)} shared" if shared else ""
+                print(f"   {name}: {format_gb(usage[name]['total_bytes'])}{shared_text}")
+            print(f"   Total on disk: {format_gb(summary['blob_bytes'])} | Free: {format_gb(summary['disk_free_bytes'])}")
         
         print(f"\n{Fore.YELLOW}Popular Models Available for Download:{Style.RESET_ALL}")
+        installed_names = {m['name'] for m in installed}
         for model_id, info in self.popular_models.items():
-            installed_names = [m['name'] for m in installed]
             if model_id not in installed_names:
                 rec = "⭐" if info['recommended'] else "  "
                 print(f" {rec} {info['name']} ({info['size']}) - {info['description']}")
@@ -199,52 +174,97 @@ class AIModelManager:
         else:
             self.print_info("No models currently loaded")
         
+        memory = get_planner().summary()
+        if memory:
+            print(f"\n{Fore.CYAN}Memory: {format_size(memory['available'])} available of "
+                  f"{format_size(memory['total'])} (models use {format_size(memory['models_bytes'])}){Style.RESET_ALL}")
+        
         installed = self.get_installed_models()
         if installed:
-            unloaded = [m for m in installed if m['name'] not in [l['name'] for l in loaded]]
+            loaded_names = {normalize_name(m['name']) for m in loaded}
+            unloaded = [m for m in installed if m['name'] not in loaded_names]
             if unloaded:
                 print(f"\n{Fore.YELLOW}Available but Not Loaded:{Style.RESET_ALL}")
                 for model in unloaded:
                     print(f" ⭕ {model['name']} ({model['size']})")
 
     def handle_delete_model(self):
-        """Handle model deletion"""
-        installed = self.get_installed_models()
+        """Handle model deletion (several models at once, with space prediction)"""
+        installed = [m['name'] for m in self.registry.installed()]
+        # Server down: work directly on the models directory
+        offline = self.registry.last_error is not None
+        if offline:
+            installed = sorted(self.store.manifests())
         if not installed:
             self.print_warning("No models installed to delete")
             return
         
+        usage = self.store.model_usage()
         print(f"\n{Fore.RED}🗑️ Delete Model:{Style.RESET_ALL}")
-        print("Select model to delete:")
+        if offline:
+            self.print_info(f"Ollama server not running - editing {self.models_dir} directly")
+        print("Select model(s) to delete:")
         
-        for i, model in enumerate(installed, 1):
-            print(f" {i}. {model['name']} ({model['size']})")
+        for i, name in enumerate(installed, 1):
+            info = usage.get(name)
+            size = f"{format_gb(info['total_bytes'])}, {format_gb(info['unique_bytes'])} unique" if info else "size unknown"
+            print(f" {i}. {name} ({size})")
         
         try:
-            choice = input(f"\n{Fore.YELLOW}Enter choice (1-{len(installed)}) or 0 to cancel: {Style.RESET_ALL}")
-            choice = int(choice)
+            choice = input(f"\n{Fore.YELLOW}Enter choice(s) (e.g. 1 or 1,3) or 0 to cancel: {Style.RESET_ALL}")
+            choices = [int(part) for part in choice.replace(" ", "").split(",") if part]
             
-            if choice == 0:
+            if not choices or choices == [0]:
                 self.print_info("Deletion cancelled")
                 return
             
-            if 1 <= choice <= len(installed):
-                model = installed[choice - 1]
-                confirm = input(f"{Fore.RED}Are you sure you want to delete '{model['name']}'? (y/N): {Style.RESET_ALL}")
-                
-                if confirm.lower() == 'y':
-                    try:
-                        subprocess.run(
-                            [str(self.ollama_path), "rm", model['name']],
-                            check=True
-                        )
-                        self.print_success(f"Deleted model: {model['name']}")
-                    except subprocess.CalledProcessError as e:
-                        self.print_error(f"Failed to delete model: {e}")
-                else:
-                    self.print_info("Deletion cancelled")
-            else:
+            if not all(1 <= c <= len(installed) for c in choices):
                 self.print_error("Invalid choice")
+                return
+            
+            targets = list(dict.fromkeys(installed[c - 1] for c in choices))
+            prediction = self.store.predict_freed(targets)
+            self.print_info(f"Frees {format_gb(prediction['freed_bytes'])} "
+                            f"({len(prediction['freed_blobs'])} blobs)")
+            if prediction['retained_bytes']:
+                self.print_info(f"{format_gb(prediction['retained_bytes'])} of shared layers stay for other models")
+            
+            confirm = input(f"{Fore.RED}Are you sure you want to delete {', '.join(targets)}? (y/N): {Style.RESET_ALL}")
+            if confirm.lower() != 'y':
+                self.print_info("Deletion cancelled")
+                return
+            
+            before = self.store.summary()['blob_bytes']
+            if offline:
+                report = self.store.delete_models(targets)
+                for error in report['errors']:
+                    self.print_error(error)
+                deleted = report['deleted']
+            else:
+                deleted = []
+                for name in targets:
+                    try:
+                        self.registry.client.delete_model(name)
+                        deleted.append(name)
+                    except Exception as e:
+                        self.print_error(f"Failed to delete {name}: {e}")
+            self.registry.invalidate()
+            
+            for name in deleted:
+                self.print_success(f"Deleted model: {name}")
+            freed = before - self.store.summary()['blob_bytes']
+            self.print_info(f"Reclaimed {format_gb(freed)} (predicted {format_gb(prediction['freed_bytes'])})")
+            
+            orphans = self.store.orphans()
+            if orphans and offline:
+                orphan_bytes = sum(size for _, size in orphans)
+                cleanup = input(f"{Fore.YELLOW}Remove {len(orphans)} orphaned blobs ({format_gb(orphan_bytes)}) "
+                                f"left by interrupted downloads? (y/N): {Style.RESET_ALL}")
+                if cleanup.lower() == 'y':
+                    report = self.store.delete_models([], remove_orphans=True)
+                    self.print_success(f"Removed {report['removed_blobs']} orphaned blobs ({format_gb(report['freed_bytes'])})")
+            elif orphans:
+                self.print_info(f"{len(orphans)} orphaned blobs found - stop the Ollama server to clean them up here")
         except ValueError:
             self.print_error("Invalid input")
 
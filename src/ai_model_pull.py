@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+AI Model Pull Queue
+Concurrent, resumable model downloads through Ollama's /api/pull
+
+Each pull streams JSON progress lines ({"status", "digest", "total",
+"completed"}); per-layer byte counts are summed into model-level progress
+with a rolling-window throughput and ETA. Queue state is written to
+cache/pull_queue.json after every status change, so pulls interrupted by a
+crash or restart are re-issued on the next run (Ollama keeps the partially
+downloaded blobs and continues from them).
+
+Version: 3.0.28
+Author: AI Environment Team
+Date: 2026-10-17
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+from ai_model_registry import get_registry
+from ai_ollama_client import DEFAULT_HOST, DEFAULT_PORT, get_client
+
+DEFAULT_CONCURRENCY = int(os.environ.get("AI_OLLAMA_PULL_CONCURRENCY", "2"))
+# Used for estimates until a real pull has been measured (10 Mbps)
+FALLBACK_RATE_BPS = 10 * 1000 * 1000 / 8
+RATE_WINDOW_SECONDS = 10
+
+PENDING_STATES = ("queued", "pulling")
+
+
+def get_default_state_path():
+    """Queue state file inside the AI_Environment tree"""
+    ai_env_path = Path(os.environ.get('AI_ENV_PATH', Path(__file__).resolve().parent.parent))
+    return ai_env_path / "cache" / "pull_queue.json"
+
+
+def format_bytes(size_bytes):
+    """Format a byte count as MB/GB"""
+    if size_bytes >= 1000 ** 3:
+        return f"{size_bytes / 1000 ** 3:.2f} GB"
+    return f"{size_bytes / 1000 ** 2:.1f} MB"
+
+
+def format_duration(seconds):
+    """Format seconds as a short duration such as '4m 10s'"""
+    if seconds is None:
+        return "--"
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+
+
+def format_progress(progress):
+    """Format a progress snapshot as a one-line status"""
+    total = progress.get("total", 0)
+    if progress["status"] == "done":
+        return f"{progress['model']}: done ({format_bytes(total)})"
+    if progress["status"] == "failed":
+        return f"{progress['model']}: failed - {progress.get('error')}"
+    if not total:
+        return f"{progress['model']}: {progress.get('detail') or progress['status']}"
+    percent = progress.get("completed", 0) * 100 / total
+    rate = progress.get("rate_bps")
+    rate_text = f"{format_bytes(rate)}/s" if rate else "--"
+    return (f"{progress['model']}: {percent:5.1f}% {format_bytes(progress.get('completed', 0))}"
+            f"/{format_bytes(total)} {rate_text} ETA {format_duration(progress.get('eta_s'))}")
+
+
+def estimate_download_time(size_bytes, rate_bps=None):
+    """Estimate how long a download of size_bytes takes at rate_bps"""
+    rate_bps = rate_bps or FALLBACK_RATE_BPS
+    return size_bytes / rate_bps
+
+
+class PullQueue:
+    """Queue of model pulls run by a pool of worker threads"""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, concurrency=DEFAULT_CONCURRENCY, state_path=None,
+                 preflight=None):
+        """Initialize pull queue
+
+        Args:
+            host (str): Ollama server host
+            port (int): Ollama server port
+            concurrency (int): Number of models pulled at the same time
+            state_path (Path, optional): Persisted queue state (default: cache/pull_queue.json)
+            preflight (callable, optional): preflight(model, reserved_bytes=...) -> dict
+                with 'ok', 'reason' and 'download_bytes' (see ModelStore.preflight);
+                a pull that fails it is marked failed without contacting Ollama
+        """
+        self.client = get_client(host, port)
+        self.preflight = preflight
+        self._reserved = {}
+        self.concurrency = max(1, concurrency)
+        self.state_path = Path(state_path) if state_path else get_default_state_path()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._progress = {}
+        self.state = self._load_state()
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            state = {}
+        state.setdefault("pulls", {})
+        state.setdefault("last_rate_bps", None)
+        return state
+
+    def _save_state(self):
+        """Write state atomically (caller holds the lock)"""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def _set_status(self, model, status, **fields):
+        with self._lock:
+            entry = self.state["pulls"].setdefault(model, {})
+            entry.update(fields, status=status, updated_at=time.time())
+            self._save_state()
+
+    def add(self, model):
+        """Queue a model (no-op if it is already pending)"""
+        entry = self.state["pulls"].get(model)
+        if entry and entry.get("status") in PENDING_STATES:
+            return
+        self._set_status(model, "queued", error=None, queued_at=time.time())
+
+    def pending(self):
+        """Models queued or interrupted mid-pull, oldest first"""
+        pulls = self.state["pulls"]
+        pending = [model for model, entry in pulls.items() if entry.get("status") in PENDING_STATES]
+        return sorted(pending, key=lambda model: pulls[model].get("queued_at", 0))
+
+    def failed(self):
+        return [model for model, entry in self.state["pulls"].items() if entry.get("status") == "failed"]
+
+    def forget(self, model):
+        """Remove a model from the persisted queue"""
+        with self._lock:
+            self.state["pulls"].pop(model, None)
+            self._save_state()
+
+    @property
+    def measured_rate_bps(self):
+        """Throughput of the most recent pull, or None if nothing was measured yet"""
+        return self.state.get("last_rate_bps")
+
+    def snapshot(self):
+        """Return current progress for every model pulled in this session"""
+        with self._lock:
+            return [dict(progress) for progress in self._progress.values()]
+
+    def stop(self):
+        """Ask workers to stop; interrupted pulls stay pending for the next run"""
+        self._stop_event.set()
+
+    def run(self, models=None, on_progress=None):
+        """Pull models with up to `concurrency` pulls in flight
+
+        Args:
+            models (list, optional): Models to queue and pull; other pending pulls
+                stay queued. Without models, every pending pull is resumed.
+            on_progress (callable, optional): Called with a progress dict on every update
+
+        Returns:
+            dict: model -> final status ('done', 'failed' or 'pulling' if stopped)
+        """
+        for model in models or []:
+            self.add(model)
+        self._stop_event.clear()
+        pending = list(dict.fromkeys(models)) if models else self.pending()
+        if not pending:
+            return {}
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="ModelPull") as pool:
+            futures = [pool.submit(self.pull, model, on_progress) for model in pending]
+            try:
+                statuses = [future.result() for future in futures]
+            except KeyboardInterrupt:
+                # Let workers close their streams; unfinished pulls stay pending
+                self.stop()
+                raise
+        return dict(zip(pending, statuses))
+
+    def pull(self, model, on_progress=None):
+        """Pull one model, streaming progress; returns the final status"""
+        if self._stop_event.is_set():
+            return self.state["pulls"].get(model, {}).get("status", "queued")
+        started = time.monotonic()
+        progress = {"model": model, "status": "pulling", "detail": "", "completed": 0, "total": 0,
+                    "rate_bps": None, "eta_s": None, "error": None}
+        with self._lock:
+            self._progress[model] = progress
+            reserved = sum(self._reserved.values())
+
+        if self.preflight:
+            check = self.preflight(model, reserved_bytes=reserved)
+            if not check["ok"]:
+                with self._lock:
+                    progress.update({"status": "failed", "error": f"preflight: {check['reason']}"})
+                self._set_status(model, "failed", error=progress["error"])
+                if on_progress:
+                    on_progress(dict(progress))
+                return "failed"
+            with self._lock:
+                self._reserved[model] = check.get("download_bytes") or 0
+        self._set_status(model, "pulling")
+
+        try:
+            return self._stream_pull(model, progress, started, on_progress)
+        finally:
+            with self._lock:
+                self._reserved.pop(model, None)
+
+    def _stream_pull(self, model, progress, started, on_progress):
+        """Drive /api/pull for one model and track its byte progress"""
+        layers = {}
+        # Bytes each layer already had when first reported (kept from an earlier pull)
+        resumed = {}
+        samples = deque()
+        stream_started = time.monotonic()
+        try:
+            payload = {"model": model, "name": model, "stream": True}
+            with self.client.post("/api/pull", payload, timeout=(10, 120), stream=True) as response:
+                for line in response.iter_lines():
+                    if self._stop_event.is_set():
+                        return "pulling"
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if "error" in chunk:
+                        raise requests.exceptions.RequestException(chunk["error"])
+
+                    if chunk.get("digest") and chunk.get("total"):
+                        resumed.setdefault(chunk["digest"], chunk.get("completed", 0))
+                        layers[chunk["digest"]] = (chunk.get("completed", 0), chunk["total"])
+                    completed = sum(done for done, _ in layers.values())
+                    total = sum(size for _, size in layers.values())
+
+                    now = time.monotonic()
+                    samples.append((now, completed))
+                    while len(samples) > 2 and now - samples[0][0] > RATE_WINDOW_SECONDS:
+                        samples.popleft()
+                    elapsed = now - samples[0][0]
+                    rate = (completed - samples[0][1]) / elapsed if elapsed > 0 else None
+
+                    with self._lock:
+                        progress.update({
+                            "detail": chunk.get("status", ""),
+                            "completed": completed,
+                            "total": total,
+                            "rate_bps": rate,
+                            "eta_s": (total - completed) / rate if rate else None,
+                        })
+                    if on_progress:
+                        on_progress(dict(progress))
+                    if chunk.get("status") == "success":
+                        break
+                else:
+                    raise requests.exceptions.RequestException("pull stream ended before success")
+        except (requests.exceptions.RequestException, ValueError) as e:
+            with self._lock:
+                progress.update({"status": "failed", "error": str(e)})
+            self._set_status(model, "failed", error=str(e))
+            if on_progress:
+                on_progress(dict(progress))
+            return "failed"
+
+        duration = time.monotonic() - started
+        total = progress["total"]
+        # Bytes downloaded in this pull; resumed and already-present layers don't count
+        transferred = sum(size - resumed.get(digest, 0) for digest, (_, size) in layers.items())
+        transfer_time = time.monotonic() - stream_started
+        with self._lock:
+            progress.update({"status": "done", "completed": total, "eta_s": 0})
+            # Only count pulls that actually downloaded something
+            if transferred > 0 and transfer_time > 0:
+                self.state["last_rate_bps"] = transferred / transfer_time
+        # The tag may now point at new weights; drop the cached list (and digests)
+        get_registry(self.client.host, self.client.port).invalidate()
+        self._set_status(model, "done", total=total, transferred=transferred, duration_s=round(duration, 1),
+                         error=None)
+        if on_progress:
+            on_progress(dict(progress))
+        return "done"
+
+
+def main():
+    """Pull models from the command line"""
+    parser = argparse.ArgumentParser(description="Pull Ollama models concurrently with progress and resume")
+    parser.add_argument("models", nargs="*", help="Models to pull (default: resume incomplete pulls)")
+    parser.add_argument("-c", "--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--state", help="Queue state file (default: cache/pull_queue.json)")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    queue = PullQueue(args.host, args.port, args.concurrency, args.state)
+    last_print = {}
+
+    def on_progress(progress):
+        now = time.monotonic()
+        if progress["status"] == "pulling" and now - last_print.get(progress["model"], 0) < 1:
+            return
+        last_print[progress["model"]] = now
+        print(format_progress(progress), flush=True)
+
+    try:
+        results = queue.run(args.models, on_progress=on_progress)
+    except KeyboardInterrupt:
+        queue.stop()
+        print("Interrupted - run again to resume")
+        return 130
+    if not results:
+        print("Nothing to pull")
+    return 1 if "failed" in results.values() else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+AI Model Registry
+Cached view of installed (/api/tags) and loaded (/api/ps) Ollama models
+
+Model records are plain dicts with these keys:
+    name, digest, id (short digest), size_bytes, size (human readable),
+    modified, family, parameter_size, quantization, format
+Loaded-model records additionally carry:
+    size_vram, processor, expires_at
+
+The 'name', 'id', 'size', 'modified' and 'processor' keys match the columns
+the menus used to parse out of `ollama list` / `ollama ps`.
+
+Version: 3.0.28
+Author: AI Environment Team
+Date: 2026-10-17
+"""
+
+import threading
+import time
+
+from ai_ollama_client import DEFAULT_HOST, DEFAULT_PORT, get_client
+
+# Long enough to cover one menu render, short enough to notice a pull/unload
+DEFAULT_TTL_SECONDS = 2.0
+
+
+def format_size(size_bytes):
+    """Format a byte count the way `ollama list` does (e.g. '1.6 GB')"""
+    size = float(size_bytes or 0)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1000 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit in ("B", "KB") else f"{size:.1f} {unit}"
+        size /= 1000
+
+
+def normalize_name(name):
+    """Add the implicit ':latest' tag, as Ollama does ('llama3.2' -> 'llama3.2:latest')"""
+    name = (name or "").strip()
+    return name if not name or ":" in name else f"{name}:latest"
+
+
+def _format_timestamp(value):
+    """Shorten an RFC 3339 timestamp from the API to 'YYYY-MM-DD HH:MM'"""
+    if not value or len(value) < 16:
+        return value or "Unknown"
+    return value[:16].replace("T", " ")
+
+
+def _processor(size_bytes, size_vram):
+    """Describe CPU/GPU placement like the PROCESSOR column of `ollama ps`"""
+    if not size_bytes:
+        return "Unknown"
+    if size_vram >= size_bytes:
+        return "100% GPU"
+    if not size_vram:
+        return "100% CPU"
+    gpu = round(size_vram * 100 / size_bytes)
+    return f"{100 - gpu}%/{gpu}% CPU/GPU"
+
+
+def make_record(entry):
+    """Build a model record from an /api/tags or /api/ps entry"""
+    details = entry.get("details") or {}
+    digest = entry.get("digest", "")
+    size_bytes = int(entry.get("size", 0) or 0)
+    record = {
+        "name": entry.get("name") or entry.get("model", ""),
+        "digest": digest,
+        "id": digest[:12] if digest else "Unknown",
+        "size_bytes": size_bytes,
+        "size": format_size(size_bytes),
+        "modified": _format_timestamp(entry.get("modified_at")),
+        "family": details.get("family", ""),
+        "parameter_size": details.get("parameter_size", ""),
+        "quantization": details.get("quantization_level", ""),
+        "format": details.get("format", ""),
+    }
+    if "size_vram" in entry or "expires_at" in entry:
+        size_vram = int(entry.get("size_vram", 0) or 0)
+        record.update({
+            "size_vram": size_vram,
+            "processor": _processor(size_bytes, size_vram),
+            "expires_at": entry.get("expires_at", ""),
+        })
+    return record
+
+
+class ModelRegistry:
+    """Installed/loaded model lists with a short TTL cache
+
+    Every model menu shares one registry (see get_registry), so a single
+    screen costs at most one /api/tags and one /api/ps request.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, ttl_seconds=DEFAULT_TTL_SECONDS):
+        """Initialize model registry
+
+        Args:
+            host (str): Ollama server host
+            port (int): Ollama server port
+            ttl_seconds (float): How long fetched lists are reused
+        """
+        self.client = get_client(host, port)
+        self.ttl_seconds = ttl_seconds
+        self.last_error = None
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _fetch(self, path, key):
+        """Return cached records for an endpoint, refreshing after the TTL"""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached and now - cached[0] < self.ttl_seconds:
+                return list(cached[1])
+
+            result = self.client.probe(path, timeout=5)
+            if result is None:
+                self.last_error = f"Ollama API not reachable at {self.client.base_url}"
+                self._cache.pop(path, None)
+                return []
+
+            self.last_error = None
+            records = [make_record(entry) for entry in result.get(key, [])]
+            self._cache[path] = (now, records)
+            return list(records)
+
+    def installed(self):
+        """Return records for all installed models"""
+        return self._fetch("/api/tags", "models")
+
+    def loaded(self):
+        """Return records for models currently loaded in memory"""
+        return self._fetch("/api/ps", "models")
+
+    def get(self, name):
+        """Return the installed record for a model name, or None"""
+        name = normalize_name(name)
+        for record in self.installed():
+            if record["name"] == name:
+                return record
+        return None
+
+    def loaded_names(self):
+        """Return the set of loaded model names (always tagged)"""
+        return {normalize_name(record["name"]) for record in self.loaded()}
+
+    def is_loaded(self, name):
+        """Check whether a model is currently loaded ('llama3.2' matches 'llama3.2:latest')"""
+        return normalize_name(name) in self.loaded_names()
+
+    def invalidate(self):
+        """Drop cached lists (call after pull, delete, load or unload)"""
+        with self._lock:
+            self._cache.clear()
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Return the process-wide shared registry for host:port"""
+    key = (host, int(port))
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = ModelRegistry(host, port)
+            _registries[key] = registry
+        return registry
+
+
+def main():
+    """List installed and loaded models"""
+    registry = get_registry()
+    installed = registry.installed()
+    if registry.last_error:
+        print(registry.last_error)
+        return
+    loaded = registry.loaded_names()
+    for record in installed:
+        marker = "*" if record["name"] in loaded else " "
+        print(f"{marker} {record['name']:<30} {record['id']}  {record['size']:>8}  "
+              f"{record['family']} {record['parameter_size']} {record['quantization']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+AI Model Residency
+Decides which Ollama models fit in system memory before loading another one
+
+Estimates assume the model is resident in system RAM (the common laptop
+case). Installed models are sized from the registry with an overhead factor
+for the KV cache and runtime; loaded models use the size reported by
+/api/ps. Least-recently-used models (earliest keep_alive expiry) are unloaded
+with keep_alive=0 until the new model fits, and loads that would still dip
+into the swap headroom are refused.
+
+AI_MODEL_RESIDENCY=off disables the checks (e.g. on machines with a large GPU).
+
+Version: 3.0.28
+Author: AI Environment Team
+Date: 2026-10-17
+"""
+
+import os
+import threading
+
+import requests
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+from ai_ollama_client import DEFAULT_HOST, DEFAULT_PORT, get_client
+from ai_model_registry import get_registry, format_size
+
+# Loaded models take more than their file size (KV cache, runtime buffers)
+DEFAULT_OVERHEAD_FACTOR = 1.2
+# Memory always left free for the OS and other applications
+MIN_HEADROOM_BYTES = 1024 ** 3
+HEADROOM_FRACTION = 0.10
+
+RESIDENCY_DISABLED_VALUES = ("0", "off", "false", "no")
+
+
+class ResidencyPlanner:
+    """Plans model loads against available memory and evicts LRU models"""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, registry=None,
+                 overhead_factor=DEFAULT_OVERHEAD_FACTOR, enabled=None):
+        """Initialize residency planner
+
+        Args:
+            host (str): Ollama server host
+            port (int): Ollama server port
+            registry (ModelRegistry, optional): Shared model registry
+            overhead_factor (float): Multiplier applied to on-disk model size
+            enabled (bool, optional): Defaults to the AI_MODEL_RESIDENCY variable
+        """
+        if enabled is None:
+            enabled = os.environ.get("AI_MODEL_RESIDENCY", "on").strip().lower() not in RESIDENCY_DISABLED_VALUES
+        self.enabled = enabled and PSUTIL_AVAILABLE
+        self.client = get_client(host, port)
+        self.registry = registry or get_registry(host, port)
+        self.overhead_factor = overhead_factor
+
+    def memory(self):
+        """Return total/available system memory and the reserved headroom"""
+        vm = psutil.virtual_memory()
+        headroom = max(MIN_HEADROOM_BYTES, int(vm.total * HEADROOM_FRACTION))
+        return {"total": vm.total, "available": vm.available, "headroom": headroom}
+
+    def required_bytes(self, model):
+        """Estimate the memory a model needs once loaded"""
+        record = self.registry.get(model)
+        if record is None:
+            return None
+        return int(record["size_bytes"] * self.overhead_factor)
+
+    def plan(self, model, allow_unload=True):
+        """Decide whether a model can be loaded and what must be unloaded first
+
+        Returns:
+            dict: model, fits, unload (model names, LRU first), required_bytes,
+                available_bytes, reason
+        """
+        result = {"model": model, "fits": True, "unload": [], "required_bytes": None,
+                  "available_bytes": None, "reason": ""}
+        if not self.enabled:
+            result["reason"] = "residency checks disabled"
+            return result
+
+        loaded = self.registry.loaded()
+        if self.registry.is_loaded(model):
+            result["reason"] = "already loaded"
+            return result
+
+        required = self.required_bytes(model)
+        if required is None:
+            # Unknown to the registry (e.g. not pulled yet) - let Ollama report it
+            result["reason"] = "model size unknown"
+            return result
+
+        mem = self.memory()
+        budget = mem["available"] - mem["headroom"]
+        result.update({"required_bytes": required, "available_bytes": max(budget, 0)})
+
+        if required <= budget:
+            result["reason"] = "fits in free memory"
+            return result
+
+        # Never enough, even with every other model unloaded
+        if required > mem["total"] - mem["headroom"]:
+            result.update({
+                "fits": False,
+                "reason": f"{model} needs ~{format_size(required)} but this machine has "
+                          f"{format_size(mem['total'])} RAM ({format_size(mem['headroom'])} kept free)",
+            })
+            return result
+
+        if allow_unload:
+            # Earliest keep_alive expiry == least recently used
+            for record in sorted(loaded, key=lambda r: r.get("expires_at") or ""):
+                result["unload"].append(record["name"])
+                budget += record["size_bytes"]
+                if required <= budget:
+                    result["reason"] = f"fits after unloading {', '.join(result['unload'])}"
+                    return result
+
+        result.update({
+            "fits": False,
+            "unload": [],
+            "reason": f"{model} needs ~{format_size(required)} but at most "
+                      f"{format_size(max(budget, 0))} would be free without swapping",
+        })
+        return result
+
+    def unload(self, model):
+        """Evict a model from memory (keep_alive=0)
+
+        Returns:
+            bool: True if Ollama accepted the unload
+        """
+        try:
+            self.client.post("/api/generate", {"model": model, "keep_alive": 0}, timeout=60)
+            return True
+        except requests.exceptions.RequestException:
+            return False
+        finally:
+            self.registry.invalidate()
+
+    def ensure_capacity(self, model):
+        """Plan a load and carry out the unloads it needs
+
+        Returns:
+            dict: The plan, plus 'unloaded' (models actually evicted)
+        """
+        result = self.plan(model)
+        result["unloaded"] = []
+        if result["fits"]:
+            for name in result["unload"]:
+                if self.unload(name):
+                    result["unloaded"].append(name)
+        return result
+
+    def summary(self):
+        """Return current memory figures and resident model sizes"""
+        if not PSUTIL_AVAILABLE:
+            return None
+        mem = self.memory()
+        loaded = self.registry.loaded()
+        mem.update({
+            "models": [(record["name"], record["size_bytes"]) for record in loaded],
+            "models_bytes": sum(record["size_bytes"] for record in loaded),
+        })
+        return mem
+
+
+_default_planner = None
+_default_planner_lock = threading.Lock()
+
+
+def get_planner():
+    """Return the process-wide residency planner"""
+    global _default_planner
+    with _default_planner_lock:
+        if _default_planner is None:
+            _default_planner = ResidencyPlanner()
+        return _default_planner
+
+
+def main():
+    """Show whether the given models would fit right now"""
+    import sys
+
+    planner = get_planner()
+    summary = planner.summary()
+    if summary:
+        print(f"Memory: {format_size(summary['available'])} available of {format_size(summary['total'])}, "
+              f"{format_size(summary['headroom'])} kept free")
+        for name, size in summary["models"]:
+            print(f"  loaded: {name} ({format_size(size)})")
+    for model in sys.argv[1:]:
+        plan = planner.plan(model)
+        print(f"{model}: {'OK' if plan['fits'] else 'REFUSED'} - {plan['reason']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+AI Model Warm-up
+Preloads Ollama models through the API and keeps a hot set resident
+
+A model is loaded by sending /api/generate an empty prompt with an explicit
+keep_alive; Ollama loads the weights and returns without generating. A
+background thread repeats this for the configured hot models before their
+keep_alive runs out, so real requests never pay the cold-load cost.
+
+Configuration: config/model_warmup.json
+
+Version: 3.0.28
+Author: AI Environment Team
+Date: 2026-10-17
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+from ai_ollama_client import DEFAULT_HOST, DEFAULT_PORT, get_client
+from ai_model_registry import get_registry
+from ai_model_residency import get_planner
+
+DEFAULT_CONFIG = {
+    "hot_models": ["phi:2.7b"],
+    "keep_alive": "30m",
+    "refresh_interval_seconds": None,   # Default: half of keep_alive
+    "load_timeout_seconds": 300,
+}
+
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600}
+
+
+def get_default_config_path():
+    """Warm-up configuration inside the AI_Environment tree"""
+    ai_env_path = Path(os.environ.get('AI_ENV_PATH', Path(__file__).resolve().parent.parent))
+    return ai_env_path / "config" / "model_warmup.json"
+
+
+def load_warmup_config(config_path=None):
+    """Load warm-up settings, falling back to defaults for missing keys"""
+    config = dict(DEFAULT_CONFIG)
+    config_path = Path(config_path) if config_path else get_default_config_path()
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config.update(json.load(f))
+    except (OSError, json.JSONDecodeError):
+        pass
+    return config
+
+
+def parse_duration(value):
+    """Convert an Ollama keep_alive value ('30m', '1h', 300) to seconds
+
+    Returns None for negative values, which Ollama treats as "keep forever".
+    """
+    if isinstance(value, (int, float)):
+        seconds = float(value)
+    else:
+        text = str(value).strip().lower()
+        unit = DURATION_UNITS.get(text[-1:])
+        seconds = float(text[:-1]) * unit if unit else float(text)
+    return None if seconds < 0 else seconds
+
+
+class ModelWarmup:
+    """Preloads models and refreshes their keep_alive in the background"""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, config=None, registry=None, planner=None):
+        """Initialize warm-up service
+
+        Args:
+            host (str): Ollama server host
+            port (int): Ollama server port
+            config (dict, optional): Settings (default: config/model_warmup.json)
+            registry (ModelRegistry, optional): Shared model registry
+            planner (ResidencyPlanner, optional): Memory planner consulted by the refresher
+        """
+        self.client = get_client(host, port)
+        self.registry = registry or get_registry(host, port)
+        self.planner = planner
+        self.config = config or load_warmup_config()
+        self.latencies = {}
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def keep_alive(self):
+        return self.config.get("keep_alive", DEFAULT_CONFIG["keep_alive"])
+
+    @property
+    def hot_models(self):
+        return list(self.config.get("hot_models") or [])
+
+    def refresh_interval(self):
+        """Seconds between keep_alive refreshes (always inside the keep_alive window)"""
+        interval = self.config.get("refresh_interval_seconds")
+        if interval:
+            return float(interval)
+        keep_alive_seconds = parse_duration(self.keep_alive)
+        return max(keep_alive_seconds / 2, 5) if keep_alive_seconds else 600
+
+    def warm(self, model, keep_alive=None, timeout=None):
+        """Load a model (or extend its residency) and measure the latency
+
+        Returns:
+            dict: model, ok, already_loaded, latency_s, load_duration_s, error
+        """
+        already_loaded = self.registry.is_loaded(model)
+        payload = {"model": model, "prompt": "", "stream": False,
+                   "keep_alive": keep_alive if keep_alive is not None else self.keep_alive}
+        started = time.perf_counter()
+        result = {"model": model, "already_loaded": already_loaded, "error": None}
+        try:
+            response = self.client.post(
+                "/api/generate", payload,
+                timeout=timeout or self.config.get("load_timeout_seconds", 300)
+            ).json()
+            result.update({
+                "ok": True,
+                "load_duration_s": round(response.get("load_duration", 0) / 1e9, 3),
+            })
+        except requests.exceptions.RequestException as e:
+            result.update({"ok": False, "load_duration_s": None, "error": str(e)})
+        result["latency_s"] = round(time.perf_counter() - started, 3)
+        result["warmed_at"] = time.time()
+
+        self.registry.invalidate()
+        self.latencies[model] = result
+        return result
+
+    def warm_all(self, models=None):
+        """Warm models one at a time (parallel loads only fight over memory)"""
+        return [self.warm(model) for model in (models or self.hot_models)]
+
+    def start(self, models=None):
+        """Keep models resident by refreshing them from a daemon thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        if models:
+            self.config["hot_models"] = list(dict.fromkeys(self.hot_models + list(models)))
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, name="ModelWarmup", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the refresh thread"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def is_running(self):
+        return bool(self._thread and self._thread.is_alive())
+
+    def _refresh_loop(self):
+        while not self._stop_event.is_set():
+            for model in self.hot_models:
+                if self._stop_event.is_set():
+                    break
+                # Re-load an evicted hot model only if it fits without evicting others
+                if self.planner and not self.registry.is_loaded(model) \
+                        and not self.planner.plan(model, allow_unload=False)["fits"]:
+                    continue
+                self.warm(model)
+            self._stop_event.wait(self.refresh_interval())
+
+    def report(self):
+        """Return the most recent warm-up result per model"""
+        return [self.latencies[model] for model in sorted(self.latencies)]
+
+
+_default_warmup = None
+_default_warmup_lock = threading.Lock()
+
+
+def get_warmup():
+    """Return the process-wide warm-up service"""
+    global _default_warmup
+    with _default_warmup_lock:
+        if _default_warmup is None:
+            _default_warmup = ModelWarmup(planner=get_planner())
+        return _default_warmup
+
+
+def format_warmup_result(result):
+    """Format a warm-up result as a one-line summary"""
+    if not result.get("ok"):
+        return f"{result['model']}: failed after {result['latency_s']:.1f}s - {result['error']}"
+    state = "already resident" if result.get("already_loaded") else f"loaded in {result['load_duration_s']:.1f}s"
+    return f"{result['model']}: {state} (request {result['latency_s']:.2f}s)"
+
+
+def main():
+    """Warm models from the command line"""
+    parser = argparse.ArgumentParser(description="Preload Ollama models and keep them resident")
+    parser.add_argument("models", nargs="*", help="Models to warm (default: hot_models from config)")
+    parser.add_argument("--keep-alive", help="Override keep_alive (e.g. 30m, 1h, -1 for forever)")
+    parser.add_argument("--watch", action="store_true", help="Keep refreshing until Ctrl+C")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    config = load_warmup_config()
+    if args.keep_alive:
+        config["keep_alive"] = args.keep_alive
+    if args.models:
+        config["hot_models"] = args.models
+
+    warmup = ModelWarmup(args.host, args.port, config=config)
+    for result in warmup.warm_all():
+        print(format_warmup_result(result))
+
+    if args.watch:
+        print(f"Refreshing every {warmup.refresh_interval():.0f}s - press Ctrl+C to stop")
+        warmup.start()
+        try:
+            while warmup.is_running():
+                time.sleep(1)
+        except KeyboardInterrupt:
+            warmup.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""
+AI Models Store
+Reads Ollama's on-disk model store (manifests + content-addressed blobs)
+
+Layout of an Ollama models directory:
+    manifests/<registry>/<namespace>/<model>/<tag>   JSON manifest per tag
+    blobs/sha256-<hex>                               one file per layer
+
+Tags that share a layer (same base weights, different template/params)
+point at the same blob, so per-model sizes are computed with shared-layer
+deduplication. Only the filesystem is used; the Ollama server does not
+need to be running, and an offline copy of a Models directory works too.
+
+Version: 3.0.28
+Author: AI Environment Team
+Date: 2026-10-17
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+
+try:
+    import requests
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+DEFAULT_REGISTRY = "registry.ollama.ai"
+# The registry can be pointed at a mirror or a local stub for testing
+REGISTRY_URL = os.environ.get("AI_OLLAMA_REGISTRY_URL", f"https://{DEFAULT_REGISTRY}")
+MANIFEST_ACCEPT = "application/vnd.docker.distribution.manifest.v2+json"
+
+# Free space that must remain on the models volume after a pull
+MIN_FREE_MARGIN_BYTES = 1024 ** 3
+# Unreferenced blobs younger than this may belong to a pull still in progress
+ORPHAN_MIN_AGE_SECONDS = 3600
+# Blob files Ollama writes: sha256-<hex>, plus sha256-<hex>-partial[-N] while pulling
+BLOB_NAME_RE = re.compile(r"^(sha256-[0-9a-f]{64})(-partial(-\d+)?)?$")
+
+
+def split_model_name(model):
+    """Split 'phi:2.7b' / 'user/model:tag' / 'host/ns/model:tag'
+
+    Returns:
+        tuple: (registry host, namespace, model, tag)
+    """
+    name, _, tag = model.partition(":")
+    parts = name.split("/")
+    host = parts.pop(0) if len(parts) > 1 and "." in parts[0] else DEFAULT_REGISTRY
+    namespace = parts.pop(0) if len(parts) > 1 else "library"
+    return host, namespace, "/".join(parts), tag or "latest"
+
+
+def model_display_name(host, namespace, model, tag):
+    """Inverse of split_model_name, matching the names `ollama list` shows"""
+    name = model if namespace == "library" else f"{namespace}/{model}"
+    if host != DEFAULT_REGISTRY:
+        name = f"{host}/{name}"
+    return f"{name}:{tag}"
+
+
+def manifest_layers(manifest):
+    """Return [(digest, size)] for the config and every layer of a manifest"""
+    entries = ([manifest["config"]] if manifest.get("config") else []) + manifest.get("layers", [])
+    return [(entry["digest"], int(entry.get("size", 0))) for entry in entries if entry.get("digest")]
+
+
+def fetch_remote_manifest(model, registry_url=None, timeout=10):
+    """Fetch a model's manifest from the registry without downloading layers
+
+    Returns:
+        dict: Manifest JSON
+
+    Raises:
+        requests.exceptions.RequestException: Registry unreachable or model unknown
+    """
+    host, namespace, name, tag = split_model_name(model)
+    base_url = registry_url or (REGISTRY_URL if host == DEFAULT_REGISTRY else f"https://{host}")
+    response = requests.get(
+        f"{base_url}/v2/{namespace}/{name}/manifests/{tag}",
+        headers={"Accept": MANIFEST_ACCEPT},
+        timeout=timeout,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def format_gb(size_bytes):
+    """Format bytes as GB with two decimals"""
+    return f"{size_bytes / 1000 ** 3:.2f} GB"
+
+
+class ModelStore:
+    """Index of manifests and blobs in an Ollama models directory"""
+
+    def __init__(self, models_dir):
+        """Initialize model store
+
+        Args:
+            models_dir (Path): Ollama models directory (contains blobs/ and manifests/)
+        """
+        self.models_dir = Path(models_dir)
+        self.blobs_dir = self.models_dir / "blobs"
+        self.manifests_dir = self.models_dir / "manifests"
+
+    def blob_path(self, digest):
+        """Path of the blob file for a 'sha256:<hex>' digest"""
+        return self.blobs_dir / digest.replace(":", "-")
+
+    def blob_sizes(self):
+        """Return {digest: size on disk} for every complete blob"""
+        sizes = {}
+        if not self.blobs_dir.is_dir():
+            return sizes
+        with os.scandir(self.blobs_dir) as entries:
+            for entry in entries:
+                # Skip in-progress downloads (sha256-<hex>-partial*)
+                if entry.is_file() and entry.name.startswith("sha256-") and "-partial" not in entry.name:
+                    sizes[entry.name.replace("-", ":", 1)] = entry.stat().st_size
+        return sizes
+
+    def manifests(self):
+        """Return {model name: [(digest, size), ...]} for every installed tag"""
+        return {name: layers for name, (_, layers) in self._read_manifests().items()}
+
+    def _read_manifests(self):
+        """Return {model name: (manifest path, [(digest, size), ...])}"""
+        models = {}
+        if not self.manifests_dir.is_dir():
+            return models
+        for path in self.manifests_dir.rglob("*"):
+            if not path.is_file():
+                continue
+            parts = path.relative_to(self.manifests_dir).parts
+            if len(parts) < 4:
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+            host, namespace, tag = parts[0], parts[1], parts[-1]
+            name = model_display_name(host, namespace, "/".join(parts[2:-1]), tag)
+            models[name] = (path, manifest_layers(manifest))
+        return models
+
+    @staticmethod
+    def _refcounts(manifests):
+        """Return {digest: [models referencing it]}"""
+        refs = {}
+        for model, layers in manifests.items():
+            for digest in {digest for digest, _ in layers}:
+                refs.setdefault(digest, []).append(model)
+        return refs
+
+    def model_usage(self):
+        """Bytes on disk per model, with shared layers counted once overall
+
+        Returns:
+            dict: {model: {"total_bytes", "unique_bytes", "shared_bytes", "missing"}}
+                unique_bytes are held only by that model; shared_bytes are
+                layers also referenced by another tag.
+        """
+        manifests = self.manifests()
+        sizes = self.blob_sizes()
+        refcount = {digest: len(models) for digest, models in self._refcounts(manifests).items()}
+
+        usage = {}
+        for model, layers in manifests.items():
+            total = unique = 0
+            missing = []
+            for digest, size in dict(layers).items():
+                if digest not in sizes:
+                    missing.append(digest)
+                    continue
+                total += sizes[digest]
+                if refcount[digest] == 1:
+                    unique += sizes[digest]
+            usage[model] = {"total_bytes": total, "unique_bytes": unique,
+                            "shared_bytes": total - unique, "missing": missing}
+        return usage
+
+    def shared_layers(self):
+        """Layers referenced by more than one tag
+
+        Returns:
+            list: [{"digest", "size", "models"}] largest first
+        """
+        sizes = self.blob_sizes()
+        shared = [
+            {"digest": digest, "size": sizes.get(digest, 0), "models": sorted(models)}
+            for digest, models in self._refcounts(self.manifests()).items() if len(models) > 1
+        ]
+        return sorted(shared, key=lambda layer: layer["size"], reverse=True)
+
+    def predict_freed(self, models):
+        """Predict what deleting a set of models reclaims
+
+        A blob is freed only if every tag referencing it is in the set.
+
+        Returns:
+            dict: freed_bytes, freed_blobs (digests), retained_bytes (layers
+                still used by remaining models), unknown (names not installed)
+        """
+        manifests = self.manifests()
+        targets = set(models)
+        sizes = self.blob_sizes()
+        freed, retained = [], 0
+        for digest, users in self._refcounts(manifests).items():
+            if not targets.intersection(users):
+                continue
+            if targets.issuperset(users):
+                freed.append(digest)
+            else:
+                retained += sizes.get(digest, 0)
+        return {
+            "freed_bytes": sum(sizes.get(digest, 0) for digest in freed),
+            "freed_blobs": sorted(freed),
+            "retained_bytes": retained,
+            "unknown": sorted(targets - set(manifests)),
+        }
+
+    def orphans(self, min_age_seconds=ORPHAN_MIN_AGE_SECONDS):
+        """Blob files no manifest references (e.g. left by interrupted pulls)
+
+        Only Ollama's own sha256-<hex> blob files are considered; anything
+        else in the directory is left alone. Files modified within
+        min_age_seconds are skipped so a running pull never loses its
+        partial download, and nothing is reported while the pull queue still
+        has pulls to resume: their partial and finished layers have no
+        manifest until the pull completes.
+
+        Returns:
+            list: [(path, size)]
+        """
+        if not self.blobs_dir.is_dir() or pulls_pending():
+            return []
+        referenced = {digest.replace(":", "-") for digest in self._refcounts(self.manifests())}
+        cutoff = time.time() - min_age_seconds
+        found = []
+        with os.scandir(self.blobs_dir) as entries:
+            for entry in entries:
+                match = BLOB_NAME_RE.match(entry.name)
+                if not match or not entry.is_file():
+                    continue
+                blob_name, partial = match.group(1), match.group(2)
+                stat = entry.stat()
+                if (blob_name not in referenced or partial) and stat.st_mtime < cutoff:
+                    found.append((Path(entry.path), stat.st_size))
+        return sorted(found)
+
+    def delete_models(self, models, remove_orphans=False, dry_run=False):
+        """Delete several models (and optionally orphans) in a single pass
+
+        Manifests are removed first, then every blob no remaining manifest
+        references. Do not run this against the directory of a running
+        Ollama server - use its delete API instead.
+
+        Returns:
+            dict: deleted (model names), removed_blobs, freed_bytes, errors
+        """
+        manifests = self._read_manifests()
+        targets = [model for model in models if model in manifests]
+        prediction = self.predict_freed(targets)
+        victims = [(self.blob_path(digest), None) for digest in prediction["freed_blobs"]]
+        if remove_orphans:
+            victims += self.orphans()
+
+        report = {"deleted": targets, "removed_blobs": 0, "freed_bytes": 0, "errors": [], "dry_run": dry_run}
+        if dry_run:
+            report["removed_blobs"] = len(victims)
+            report["freed_bytes"] = prediction["freed_bytes"] + sum(size or 0 for _, size in victims)
+            return report
+
+        for model in targets:
+            path = manifests[model][0]
+            try:
+                path.unlink()
+                # Drop now-empty <model>/ and <namespace>/ folders
+                for parent in path.parents:
+                    if parent == self.manifests_dir or any(parent.iterdir()):
+                        break
+                    parent.rmdir()
+            except OSError as e:
+                report["errors"].append(f"{path}: {e}")
+
+        for path, _ in victims:
+            try:
+                size = path.stat().st_size
+                path.unlink()
+                report["removed_blobs"] += 1
+                report["freed_bytes"] += size
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                report["errors"].append(f"{path}: {e}")
+        return report
+
+    def summary(self):
+        """Return blob count, deduplicated bytes on disk and free space"""
+        sizes = self.blob_sizes()
+        result = {"models": len(self.manifests()), "blobs": len(sizes), "blob_bytes": sum(sizes.values())}
+        result.update(self.disk_space())
+        return result
+
+    def disk_space(self):
+        """Return total/free bytes on the volume holding the models directory"""
+        path = self.models_dir
+        while not path.exists() and path != path.parent:
+            path = path.parent
+        usage = shutil.disk_usage(str(path))
+        return {"disk_total_bytes": usage.total, "disk_free_bytes": usage.free}
+
+    def preflight(self, model, reserved_bytes=0, registry_url=None, timeout=10):
+        """Check that a pull fits on the models volume before it starts
+
+        Layers already present in blobs/ are not downloaded again, so only
+        the missing ones count against free space.
+
+        Args:
+            model (str): Model to pull
+            reserved_bytes (int): Space already promised to concurrent pulls
+            registry_url (str, optional): Registry base URL override
+
+        Returns:
+            dict: model, ok, download_bytes, total_bytes, free_bytes, reason
+        """
+        result = {"model": model, "ok": True, "download_bytes": None, "total_bytes": None,
+                  "free_bytes": None, "reason": ""}
+        if not REQUESTS_AVAILABLE:
+            result["reason"] = "requests not installed - preflight skipped"
+            return result
+        try:
+            layers = manifest_layers(fetch_remote_manifest(model, registry_url, timeout))
+        except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+            # Can't size it - let Ollama try (it reports unknown models itself)
+            result["reason"] = f"manifest size unavailable ({type(e).__name__})"
+            return result
+
+        present = self.blob_sizes()
+        layers = dict(layers)
+        download = sum(size for digest, size in layers.items() if present.get(digest) != size)
+        free = self.disk_space()["disk_free_bytes"] - reserved_bytes
+        result.update({"download_bytes": download, "total_bytes": sum(layers.values()), "free_bytes": free})
+
+        if download + MIN_FREE_MARGIN_BYTES > free:
+            result.update({
+                "ok": False,
+                "reason": f"needs {format_gb(download)} plus {format_gb(MIN_FREE_MARGIN_BYTES)} margin, "
+                          f"only {format_gb(max(free, 0))} free on {self.models_dir}",
+            })
+        else:
+            result["reason"] = f"{format_gb(download)} to download, {format_gb(free)} free"
+        return result
+
+
+def pulls_pending():
+    """True if the pull queue (cache/pull_queue.json) has pulls to resume"""
+    try:
+        from ai_model_pull import PENDING_STATES, get_default_state_path
+    except ImportError:
+        return False   # No pull queue without requests
+    try:
+        with open(get_default_state_path(), 'r', encoding='utf-8') as f:
+            pulls = json.load(f).get("pulls", {})
+    except (OSError, ValueError, AttributeError):
+        return False
+    return any(isinstance(entry, dict) and entry.get("status") in PENDING_STATES for entry in pulls.values())
+
+
+def candidate_models_dirs(ai_env_path):
+    """Possible models directory locations, in priority order"""
+    ai_env_path = Path(ai_env_path)
+    return [
+        ai_env_path / "AI_Environment" / "Models",        # Inside AI_Environment subfolder (check first)
+        ai_env_path / "Models",                           # Direct in AI_Lab
+        ai_env_path.parent / "AI_Environment" / "Models", # Sibling directory
+    ]
+
+
+def get_models_index_path(ai_env_path):
+    """Index file remembering the resolved models directory"""
+    return Path(ai_env_path) / "cache" / "models_index.json"
+
+
+def _read_models_index(index_path):
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def load_models_index(ai_env_path):
+    """Return the persisted index: models_path, blob_count, blob_bytes, blobs_mtime"""
+    return _read_models_index(get_models_index_path(ai_env_path)).get("resolved", {})
+
+
+def find_models_directory(ai_env_path, use_index=True):
+    """Find the Ollama models directory, reusing a persisted index
+
+    The first candidate whose blobs/ folder contains files wins; otherwise the
+    first existing candidate; otherwise AI_Environment/Models is created.
+    Each candidate's blobs/ mtime is recorded, and listing a folder (slow on
+    USB drives with thousands of blobs) only happens again when that mtime
+    changes. The winner's blob inventory (count, bytes) is refreshed the
+    same way.
+
+    Args:
+        ai_env_path (Path): AI Lab root
+        use_index (bool): Set False to force a full re-scan
+
+    Returns:
+        Path: Models directory
+    """
+    index_path = get_models_index_path(ai_env_path)
+    index = _read_models_index(index_path) if use_index else {}
+    known = index.get("candidates", {})
+    candidates = {}
+
+    def blobs_state(path):
+        """(exists, blobs mtime, has blobs) for a candidate, listing only when needed"""
+        blobs_dir = path / "blobs"
+        try:
+            mtime = blobs_dir.stat().st_mtime
+        except OSError:
+            return {"exists": path.is_dir(), "mtime": None, "has_blobs": False}
+        cached = known.get(str(path))
+        # An empty folder is cheap to list, so only trust a cached non-empty result
+        if cached and cached.get("mtime") == mtime and cached.get("has_blobs"):
+            return cached
+        with os.scandir(blobs_dir) as entries:
+            has_blobs = any(True for _ in entries)
+        return {"exists": True, "mtime": mtime, "has_blobs": has_blobs}
+
+    models_path = None
+    for path in candidate_models_dirs(ai_env_path):
+        state = candidates[str(path)] = blobs_state(path)
+        if state["has_blobs"]:
+            models_path = path
+            break
+
+    if models_path is None:
+        # If no existing directory with models found, check for any existing empty directories
+        models_path = next((path for path in candidate_models_dirs(ai_env_path) if path.is_dir()), None)
+    if models_path is None:
+        # If no existing directory found, create in AI_Environment subfolder
+        models_path = candidate_models_dirs(ai_env_path)[0]
+        models_path.mkdir(parents=True, exist_ok=True)
+
+    resolved = index.get("resolved", {})
+    blobs_mtime = candidates.get(str(models_path), {}).get("mtime")
+    if resolved.get("models_path") != str(models_path) or resolved.get("blobs_mtime") != blobs_mtime:
+        sizes = ModelStore(models_path).blob_sizes()
+        resolved = {"models_path": str(models_path), "blobs_mtime": blobs_mtime,
+                    "blob_count": len(sizes), "blob_bytes": sum(sizes.values())}
+
+    new_index = {"candidates": candidates, "resolved": resolved}
+    if new_index != index:
+        try:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = index_path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(new_index, f, indent=2)
+            os.replace(tmp_path, index_path)
+        except OSError:
+            pass  # Read-only media - just scan again next time
+    return models_path
+
+
+def main():
+    """Analyze (or clean up) a models directory, online or an offline copy"""
+    parser = argparse.ArgumentParser(description="Ollama models directory usage, shared layers and cleanup")
+    parser.add_argument("models_dir", nargs="?", default=os.environ.get("OLLAMA_MODELS", "Models"))
+    parser.add_argument("--delete", nargs="+", metavar="MODEL", help="Delete these models in one pass")
+    parser.add_argument("--orphans", action="store_true", help="List (or with --delete/--clean remove) orphaned blobs")
+    parser.add_argument("--clean", action="store_true", help="Remove orphaned blobs")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be removed")
+    args = parser.parse_args()
+
+    store = ModelStore(args.models_dir)
+    if args.delete or args.clean:
+        if args.delete:
+            prediction = store.predict_freed(args.delete)
+            for name in prediction["unknown"]:
+                print(f"not installed: {name}")
+            print(f"Predicted: {format_gb(prediction['freed_bytes'])} freed, "
+                  f"{format_gb(prediction['retained_bytes'])} kept for other models")
+        report = store.delete_models(args.delete or [], remove_orphans=args.clean or args.orphans, dry_run=args.dry_run)
+        action = "Would remove" if args.dry_run else "Removed"
+        print(f"{action} {len(report['deleted'])} models, {report['removed_blobs']} blobs, {format_gb(report['freed_bytes'])}")
+        for error in report["errors"]:
+            print(f"error: {error}")
+        return
+
+    for model, usage in sorted(store.model_usage().items()):
+        print(f"{model:<35} {format_gb(usage['total_bytes']):>10}  "
+              f"(unique {format_gb(usage['unique_bytes'])}, shared {format_gb(usage['shared_bytes'])})")
+    shared = store.shared_layers()
+    if shared:
+        print("\nShared layers:")
+        for layer in shared:
+            print(f"  {layer['digest'][:19]} {format_gb(layer['size'])}  {', '.join(layer['models'])}")
+    if args.orphans:
+        orphans = store.orphans()
+        print(f"\nOrphaned blobs: {len(orphans)} ({format_gb(sum(size for _, size in orphans))})")
+        for path, size in orphans:
+            print(f"  {path.name} {format_gb(size)}")
+    summary = store.summary()
+    print(f"\n{summary['models']} models, {summary['blobs']} blobs, {format_gb(summary['blob_bytes'])} on disk, "
+          f"{format_gb(summary['disk_free_bytes'])} free")
+
+
+if __name__ == "__main__":
+    main()
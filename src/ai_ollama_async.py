@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+AI Ollama Async Client
+asyncio client for fanning out many prompts to the local Ollama server
+
+Version: 3.0.28
+Author: AI Environment Team
+Date: 2026-10-17
+"""
+
+import asyncio
+
+import aiohttp
+
+from ai_ollama_client import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_MODEL
+
+# Ollama serves OLLAMA_NUM_PARALLEL requests per model at once (default 4);
+# more in-flight requests than that only queue inside the server
+DEFAULT_CONCURRENCY = 4
+DEFAULT_TIMEOUT = 300
+
+
+class AsyncOllamaClient:
+    """Bounded-concurrency asyncio client for the Ollama API
+
+    Use as an async context manager so the connection pool is closed:
+
+        async with AsyncOllamaClient(max_concurrency=4) as client:
+            results = await client.map_generate(prompts, model="phi:2.7b")
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, max_concurrency=DEFAULT_CONCURRENCY,
+                 timeout=DEFAULT_TIMEOUT, connect_timeout=10):
+        """Initialize async client
+
+        Args:
+            host (str): Ollama server host
+            port (int): Ollama server port
+            max_concurrency (int): Maximum requests in flight at once
+            timeout (float): Default total timeout per request in seconds
+            connect_timeout (float): Timeout for establishing a connection
+        """
+        self.base_url = f"http://{host}:{port}"
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session = None
+        self._tasks = set()
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def open(self):
+        """Create the pooled HTTP session (idempotent)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self._session = aiohttp.ClientSession(base_url=self.base_url, connector=connector)
+
+    async def close(self):
+        """Cancel in-flight requests and close the HTTP session"""
+        self.cancel_all()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def _post(self, path, payload, timeout=None):
+        """POST a JSON payload, holding a concurrency slot for the whole request"""
+        await self.open()
+        request_timeout = aiohttp.ClientTimeout(total=timeout or self.timeout, connect=self.connect_timeout)
+        async with self._semaphore:
+            async with self._session.post(path, json=payload, timeout=request_timeout) as response:
+                response.raise_for_status()
+                return await response.json()
+
+    async def generate(self, prompt, model=DEFAULT_MODEL, options=None, timeout=None, **extra):
+        """Run a completion and return the full /api/generate response dict"""
+        payload = {"model": model, "prompt": prompt, "stream": False}
+        if options:
+            payload["options"] = options
+        payload.update(extra)
+        return await self._post("/api/generate", payload, timeout)
+
+    async def chat(self, messages, model=DEFAULT_MODEL, options=None, timeout=None, **extra):
+        """Run a chat turn and return the full /api/chat response dict
+
+        Args:
+            messages (list): [{"role": "user", "content": "..."}, ...]
+        """
+        payload = {"model": model, "messages": messages, "stream": False}
+        if options:
+            payload["options"] = options
+        payload.update(extra)
+        return await self._post("/api/chat", payload, timeout)
+
+    async def embeddings(self, prompt, model=DEFAULT_MODEL, timeout=None):
+        """Return the embedding vector for a prompt"""
+        result = await self._post("/api/embeddings", {"model": model, "prompt": prompt}, timeout)
+        return result.get("embedding", [])
+
+    def submit(self, coro):
+        """Schedule a request coroutine as a tracked task so cancel_all() can reach it"""
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def cancel_all(self):
+        """Cancel every request task created through submit()/map_*
+
+        Returns:
+            int: Number of tasks that were still pending
+        """
+        pending = [task for task in self._tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        return len(pending)
+
+    async def map_generate(self, prompts, model=DEFAULT_MODEL, options=None, timeout=None, return_exceptions=True):
+        """Generate completions for many prompts concurrently
+
+        Results are returned in prompt order. With return_exceptions=True a
+        failed or timed-out prompt yields its exception instead of aborting
+        the whole batch. Cancelling the awaiting task cancels every request.
+        """
+        tasks = [self.submit(self.generate(prompt, model=model, options=options, timeout=timeout)) for prompt in prompts]
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+
+    async def map_embeddings(self, prompts, model=DEFAULT_MODEL, timeout=None, return_exceptions=True):
+        """Compute embeddings for many prompts concurrently, in prompt order"""
+        tasks = [self.submit(self.embeddings(prompt, model=model, timeout=timeout)) for prompt in prompts]
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+
+
+def run_prompts(prompts, model=DEFAULT_MODEL, max_concurrency=DEFAULT_CONCURRENCY, **kwargs):
+    """Synchronous helper: generate completions for prompts and return the response texts
+
+    Failed prompts come back as "Error: ..." strings, matching query_ollama.
+    """
+    async def _run():
+        async with AsyncOllamaClient(max_concurrency=max_concurrency, **kwargs) as client:
+            return await client.map_generate(prompts, model=model)
+
+    results = asyncio.run(_run())
+    return [
+        f"Error: {result!r}" if isinstance(result, BaseException) else result.get("response", "")
+        for result in results
+    ]
+
+
+def main():
+    """Test async client"""
+    import time
+
+    prompts = [f"Count to {i}" for i in range(1, 9)]
+    started = time.perf_counter()
+    for prompt, response in zip(prompts, run_prompts(prompts)):
+        print(f"{prompt!r} -> {response[:60]!r}")
+    print(f"{len(prompts)} prompts in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
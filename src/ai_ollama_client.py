@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+AI Ollama Client
+Shared HTTP client for the Ollama REST API with a pooled keep-alive session
+
+Version: 3.0.28
+Author: AI Environment Team
+Date: 2026-10-17
+"""
+
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ai_response_cache import get_response_cache, make_cache_key
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 11434
+DEFAULT_MODEL = "phi:2.7b"
+DEFAULT_TIMEOUT = 60
+
+# Pool and retry defaults can be overridden per environment without code changes
+DEFAULT_POOL_SIZE = int(os.environ.get("AI_OLLAMA_POOL_SIZE", "10"))
+DEFAULT_MAX_RETRIES = int(os.environ.get("AI_OLLAMA_MAX_RETRIES", "3"))
+
+
+class OllamaClient:
+    """Thin wrapper around a pooled requests.Session for the Ollama API"""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, pool_size=DEFAULT_POOL_SIZE,
+                 max_retries=DEFAULT_MAX_RETRIES, backoff_factor=0.5, timeout=DEFAULT_TIMEOUT, cache=None):
+        """Initialize Ollama client
+
+        Args:
+            host (str): Ollama server host
+            port (int): Ollama server port
+            pool_size (int): Maximum keep-alive connections kept in the pool
+            max_retries (int): Retries for connection errors and 502/503/504 responses
+            backoff_factor (float): Exponential backoff factor between retries
+            timeout (float): Default request timeout in seconds
+            cache (ResponseCache, optional): Response cache used by generate()
+        """
+        self.host = host
+        self.port = port
+        self.base_url = f"http://{host}:{port}"
+        self.timeout = timeout
+        self.cache = cache
+
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=0,  # Never replay a generation that reached the server
+            backoff_factor=backoff_factor,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=None,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Health probes must fail fast, so they bypass the retrying adapter
+        self._probe_session = requests.Session()
+
+    def url(self, path):
+        """Build full API URL for a path such as '/api/generate'"""
+        return f"{self.base_url}{path}"
+
+    def get(self, path, timeout=None, **kwargs):
+        """GET an API path and return the decoded JSON body"""
+        response = self.session.get(self.url(path), timeout=timeout or self.timeout, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    def post(self, path, payload, timeout=None, **kwargs):
+        """POST a JSON payload to an API path and return the raw response"""
+        response = self.session.post(self.url(path), json=payload, timeout=timeout or self.timeout, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def delete_model(self, model, timeout=None):
+        """Delete an installed model (server removes blobs no other tag uses)"""
+        response = self.session.delete(self.url("/api/delete"), json={"model": model, "name": model},
+                                       timeout=timeout or self.timeout)
+        response.raise_for_status()
+        from ai_model_registry import get_registry   # ai_model_registry imports this module
+        get_registry(self.host, self.port).invalidate()
+
+    def generate(self, prompt, model=DEFAULT_MODEL, options=None, timeout=None, use_cache=True, **extra):
+        """Run a non-streaming completion and return the full response dict
+
+        Args:
+            prompt (str): Prompt text
+            model (str): Model name
+            options (dict, optional): Ollama model options (temperature, num_ctx, ...)
+            timeout (float, optional): Request timeout override
+            use_cache (bool): Set False to bypass the response cache for this call
+            **extra: Additional top-level request fields (system, format, keep_alive, ...)
+        """
+        payload = {"model": model, "prompt": prompt, "stream": False}
+        if options:
+            payload["options"] = options
+        payload.update(extra)
+
+        cache_key = None
+        if use_cache and self.cache is not None and self.cache.enabled and prompt:
+            # keep_alive only affects residency, not the answer
+            key_extra = {k: v for k, v in extra.items() if k != "keep_alive"}
+            digest = self.model_digest(model)
+            # Without the digest a replaced model could be answered from the old one's entries
+            if digest:
+                cache_key = make_cache_key(digest, prompt, options, key_extra)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    cached["cached"] = True
+                    return cached
+
+        result = self.post("/api/generate", payload, timeout=timeout).json()
+        if cache_key and result.get("done", True):
+            self.cache.put(cache_key, model, result)
+        return result
+
+    def model_digest(self, model):
+        """Return the digest of an installed model, or None if it cannot be resolved
+
+        Read from the shared ModelRegistry, whose /api/tags view expires after
+        a few seconds, so a re-pulled tag is seen with its new digest.
+        """
+        from ai_model_registry import get_registry   # ai_model_registry imports this module
+
+        record = get_registry(self.host, self.port).get(model)
+        return record.get("digest") if record else None
+
+    def stream_generate(self, prompt, model=DEFAULT_MODEL, options=None, timeout=None, stats=None, **extra):
+        """Stream a completion, yielding response tokens as NDJSON chunks arrive
+
+        Args:
+            prompt (str): Prompt text
+            model (str): Model name
+            options (dict, optional): Ollama model options
+            timeout (float, optional): Connect/read timeout between chunks
+            stats (dict, optional): Filled with timing stats once the stream ends
+                (see build_stream_stats)
+            **extra: Additional top-level request fields
+
+        Yields:
+            str: Response text fragments in generation order
+        """
+        payload = {"model": model, "prompt": prompt, "stream": True}
+        if options:
+            payload["options"] = options
+        payload.update(extra)
+
+        started = time.perf_counter()
+        first_token_at = None
+        final_chunk = {}
+
+        with self.post("/api/generate", payload, timeout=timeout, stream=True) as response:
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    raise requests.exceptions.RequestException(chunk["error"])
+                token = chunk.get("response", "")
+                if token:
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    yield token
+                if chunk.get("done"):
+                    final_chunk = chunk
+                    break
+
+        if stats is not None:
+            stats.update(build_stream_stats(final_chunk, started, first_token_at, time.perf_counter()))
+
+    def probe(self, path="/api/version", timeout=1.0):
+        """Single fast health probe without retries
+
+        Returns:
+            dict: Decoded JSON body, or None if the server did not answer
+        """
+        try:
+            response = self._probe_session.get(self.url(path), timeout=timeout)
+            response.raise_for_status()
+            return response.json()
+        except (requests.exceptions.RequestException, ValueError):
+            return None
+
+    def version(self, timeout=1.0):
+        """Return the server version string (liveness), or None"""
+        result = self.probe("/api/version", timeout=timeout)
+        return result.get("version") if result else None
+
+    def is_ready(self, timeout=2.0):
+        """Return True once the server answers /api/tags (readiness)"""
+        return self.probe("/api/tags", timeout=timeout) is not None
+
+    def wait_until_ready(self, timeout=30, initial_delay=0.05, max_delay=1.0, is_alive=None):
+        """Poll liveness then readiness with exponential backoff
+
+        Args:
+            timeout (float): Give up after this many seconds
+            initial_delay (float): First pause between probes
+            max_delay (float): Upper bound for the backoff pause
+            is_alive (callable, optional): Returns False if the server process
+                died, so waiting stops immediately instead of running out the clock
+
+        Returns:
+            bool: True as soon as the server accepts API requests
+        """
+        deadline = time.monotonic() + timeout
+        delay = initial_delay
+        while True:
+            if self.version(timeout=min(1.0, max_delay)) is not None and self.is_ready():
+                return True
+            if is_alive is not None and not is_alive():
+                return False
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, max_delay)
+
+    def tags(self, timeout=None):
+        """Return installed models from /api/tags"""
+        return self.get("/api/tags", timeout=timeout).get("models", [])
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+        self._probe_session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def build_stream_stats(final_chunk, started, first_token_at, finished):
+    """Build timing stats for a finished stream
+
+    Time-to-first-token and wall time are measured on the client; tokens/sec
+    comes from Ollama's own eval_count / eval_duration (nanoseconds) so it
+    excludes model load and prompt evaluation.
+    """
+    eval_count = final_chunk.get("eval_count", 0)
+    eval_duration_ns = final_chunk.get("eval_duration", 0)
+    return {
+        "time_to_first_token_s": round(first_token_at - started, 3) if first_token_at else None,
+        "total_time_s": round(finished - started, 3),
+        "eval_count": eval_count,
+        "eval_duration_s": round(eval_duration_ns / 1e9, 3),
+        "tokens_per_sec": round(eval_count / (eval_duration_ns / 1e9), 2) if eval_duration_ns else None,
+        "prompt_eval_count": final_chunk.get("prompt_eval_count", 0),
+        "load_duration_s": round(final_chunk.get("load_duration", 0) / 1e9, 3),
+    }
+
+
+def format_stream_stats(stats):
+    """Format stream stats as a one-line summary"""
+    ttft = stats.get("time_to_first_token_s")
+    tps = stats.get("tokens_per_sec")
+    ttft_text = f"{ttft:.2f}s" if ttft is not None else "n/a"
+    tps_text = f"{tps:.1f} tok/s" if tps is not None else "n/a"
+    return f"first token {ttft_text} | {stats.get('eval_count', 0)} tokens at {tps_text} | total {stats.get('total_time_s', 0):.2f}s"
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(host=DEFAULT_HOST, port=DEFAULT_PORT, **kwargs):
+    """Return the process-wide shared client for host:port
+
+    The first call for a given host:port creates the client (kwargs are only
+    honoured then); later calls reuse its connection pool.
+    """
+    key = (host, int(port))
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            kwargs.setdefault("cache", get_response_cache())
+            client = OllamaClient(host=host, port=port, **kwargs)
+            _clients[key] = client
+        return client
+
+
+def query_ollama(prompt, model=DEFAULT_MODEL, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=DEFAULT_TIMEOUT, options=None, use_cache=True):
+    """Query Ollama and return the response text (or an error string)
+
+    Drop-in replacement for the per-project query_ollama helpers, but every
+    call reuses the shared keep-alive connection pool and identical requests
+    are answered from the on-disk response cache (use_cache=False, or
+    AI_LLM_CACHE=off, to bypass it).
+    """
+    try:
+        result = get_client(host, port).generate(prompt, model=model, options=options, timeout=timeout, use_cache=use_cache)
+        return result.get("response", "No response received")
+    except requests.exceptions.RequestException as e:
+        return f"Error: {e}\nMake sure Ollama server is running (AI Environment Menu → Option 6)"
+
+
+def stream_ollama(prompt, model=DEFAULT_MODEL, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=DEFAULT_TIMEOUT, options=None, stats=None):
+    """Stream an Ollama completion token by token
+
+    Yields response fragments as they are generated. Pass a dict as `stats`
+    to receive time-to-first-token and tokens/sec once the stream finishes.
+    Connection problems are yielded as a single error string, matching
+    query_ollama.
+    """
+    try:
+        yield from get_client(host, port).stream_generate(prompt, model=model, options=options, timeout=timeout, stats=stats)
+    except requests.exceptions.RequestException as e:
+        yield f"Error: {e}\nMake sure Ollama server is running (AI Environment Menu → Option 6)"
+
+
+def main():
+    """Test Ollama client"""
+    import sys
+
+    prompt = " ".join(sys.argv[1:]) or "Explain artificial intelligence in one sentence."
+    print(f"Question: {prompt}")
+    print("AI Response: ", end="", flush=True)
+    stats = {}
+    for token in stream_ollama(prompt, stats=stats):
+        print(token, end="", flush=True)
+    print()
+    if stats:
+        print(f"[{format_stream_stats(stats)}]")
+
+
+if __name__ == "__main__":
+    main()
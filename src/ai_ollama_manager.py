@@ -22,6 +22,16 @@ except ImportError:
     PSUTIL_AVAILABLE = False
     print("[WARNING] psutil not available - some process management features will be limited")
 
+from ai_models_store import find_models_directory, load_models_index, format_gb
+from ai_process_supervisor import SupervisedProcess, stop_processes
+
+try:
+    from ai_ollama_client import get_client
+    from ai_model_registry import get_registry
+    CLIENT_AVAILABLE = True
+except ImportError:
+    CLIENT_AVAILABLE = False
+
 try:
     from colorama import Fore, Style
 except ImportError:
@@ -33,13 +43,17 @@ except ImportError:
 class OllamaManager:
     """Manages Ollama server lifecycle and operations"""
 
-    def __init__(self, ai_env_path, ollama_path=None):
+    def __init__(self, ai_env_path, ollama_path=None, host="127.0.0.1", port=11434):
         self.ai_env_path = Path(ai_env_path)
         # Use provided ollama_path or default to portable location
         if ollama_path is None:
             ollama_path = Path(ai_env_path) / "Ollama" / "ollama.exe"
         self.ollama_exe = Path(ollama_path)
+        self.host = host
+        self.port = port
         self.process = None
+        self.supervised = None
+        self.client = get_client(host, port) if CLIENT_AVAILABLE else None
 
     def find_models_directory(self):
         """Find Ollama models directory using multiple detection methods
@@ -47,29 +61,8 @@ class OllamaManager:
         Returns:
             Path: Path to models directory, or None if not found
         """
-        # Check multiple possible locations in priority order
-        possible_paths = [
-            self.ai_env_path / "AI_Environment" / "Models",        # Inside AI_Environment subfolder (check first)
-            self.ai_env_path / "Models",                           # Direct in AI_Lab
-            self.ai_env_path.parent / "AI_Environment" / "Models", # Sibling directory
-        ]
-
-        for path in possible_paths:
-            if path.exists() and path.is_dir():
-                # Verify this directory actually contains models by checking for blobs
-                blobs_dir = path / "blobs"
-                if blobs_dir.exists() and any(blobs_dir.iterdir()):
-                    return path
-
-        # If no existing directory with models found, check for any existing empty directories
-        for path in possible_paths:
-            if path.exists() and path.is_dir():
-                return path
-
-        # If no existing directory found, create in AI_Environment subfolder
-        default_path = self.ai_env_path / "AI_Environment" / "Models"
-        default_path.mkdir(parents=True, exist_ok=True)
-        return default_path
+        # Shared lookup; the resolved path is indexed and revalidated by mtime
+        return find_models_directory(self.ai_env_path)
         
     def print_info(self, message):
         """Print info message"""
@@ -108,8 +101,44 @@ class OllamaManager:
             pass
         return ollama_processes
         
+    def probe_server(self, timeout=1.0):
+        """Probe the Ollama API for liveness
+
+        Returns:
+            str: Server version if it answered /api/version, otherwise None
+        """
+        if self.client is None:
+            return None
+        return self.client.version(timeout=timeout)
+
+    def wait_for_server(self, timeout=15):
+        """Wait until the API accepts requests, polling with exponential backoff
+
+        Returns as soon as /api/version and /api/tags answer, or early if the
+        server process we started has already exited.
+        """
+        if self.client is None:
+            # No HTTP client available - fall back to watching for the process
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                if self.get_ollama_processes():
+                    return True
+                time.sleep(0.5)
+            return False
+
+        def is_alive():
+            return self.process is None or self.process.poll() is None
+
+        return self.client.wait_until_ready(timeout=timeout, is_alive=is_alive)
+
     def is_ollama_running(self):
-        """Check if Ollama server is running"""
+        """Check if Ollama server is running
+
+        Asks the API first; the full process scan only runs when the server
+        does not answer (e.g. still starting, or bound to another port).
+        """
+        if self.probe_server() is not None:
+            return True
         processes = self.get_ollama_processes()
         return len(processes) > 0
         
@@ -141,6 +170,7 @@ class OllamaManager:
                 
         return {
             'running': True,
+            'responding': self.probe_server() is not None,
             'process_count': len(processes),
             'processes': process_info
         }
@@ -151,56 +181,91 @@ class OllamaManager:
             if not self.check_ollama_exists():
                 return False
 
-            if self.is_ollama_running():
+            if self.probe_server() is not None:
                 self.print_warning("Ollama server is already running")
                 return True
 
+            # A server that is still starting (or started outside the menu) holds the
+            # port; a second `ollama serve` would only fail to bind it
+            existing = [proc for proc in self.get_ollama_processes()
+                        if not any(part in proc.info['name'].lower() for part in ('runner', 'llama_server'))]
+            if existing:
+                pids = ", ".join(str(proc.pid) for proc in existing)
+                self.print_info(f"Ollama process already running (PID: {pids}) - waiting for it to become ready...")
+                if self.client is None or self.client.wait_until_ready(
+                        timeout=15, is_alive=lambda: any(proc.is_running() for proc in existing)):
+                    self.print_success("Ollama server is ready")
+                    return True
+                if any(proc.is_running() for proc in existing):
+                    self.print_error(f"Ollama process (PID: {pids}) is running but the API is not responding "
+                                     f"on {self.host}:{self.port}")
+                    self.print_info("Stop it (Ollama menu) and start the server again")
+                    return False
+                self.print_warning("Existing Ollama process exited - starting a new server")
+
             self.print_info("Starting Ollama server in background...")
 
             # Find and set models directory
             models_path = self.find_models_directory()
-            self.print_info(f"Using models directory: {models_path}")
+            inventory = load_models_index(self.ai_env_path)
+            if inventory.get("models_path") == str(models_path):
+                self.print_info(f"Using models directory: {models_path} "
+                                f"({inventory['blob_count']} blobs, {format_gb(inventory['blob_bytes'])})")
+            else:
+                self.print_info(f"Using models directory: {models_path}")
 
             # Prepare environment with OLLAMA_MODELS variable
             import os
             env = os.environ.copy()
             env['OLLAMA_MODELS'] = str(models_path)
 
-            # Start Ollama server as background process
-            self.process = subprocess.Popen(
-                [str(self.ollama_exe), 'serve'],
+            # Start Ollama server in the background, restarted on failure while the menu runs
+            command = [str(self.ollama_exe), 'serve']
+            popen_kwargs = dict(
                 env=env,
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
                 creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
             )
+            try:
+                from ai_process_manager import BackgroundProcessManager
+                process_manager = BackgroundProcessManager(self.ai_env_path)
+            except Exception as e:
+                self.print_warning(f"Could not track Ollama process: {e}")
+                process_manager = None
+            if process_manager is not None:
+                self.supervised = process_manager.launch_supervised(
+                    "ollama_server",
+                    {
+                        'name': "Ollama Server",
+                        'command': f"{self.ollama_exe} serve",
+                        'started_at': time.strftime("%Y-%m-%d %H:%M:%S"),
+                        'status': 'running',
+                        'url': f"http://{self.host}:{self.port}"
+                    },
+                    command, **popen_kwargs
+                )
+            else:
+                self.supervised = SupervisedProcess("Ollama Server", command, **popen_kwargs)
+                self.supervised.start()
+            self.process = self.supervised.process
             
-            # Wait for server to start
+            # Wait for the API to accept requests (returns the moment it does)
             self.print_info("Waiting for server to initialize...")
-            for i in range(10):  # Wait up to 10 seconds
-                time.sleep(1)
-                if self.is_ollama_running():
-                    status = self.get_ollama_status()
-                    pid = status['processes'][0]['pid']
-                    self.print_success(f"Ollama server started successfully (PID: {pid})")
-                    
-                    # Track the process
-                    try:
-                        from ai_process_manager import BackgroundProcessManager
-                        process_manager = BackgroundProcessManager(self.ai_env_path)
-                        process_manager.track_process(
-                            process_id="ollama_server",
-                            name="Ollama Server",
-                            pid=pid,
-                            command=f"{self.ollama_exe} serve",
-                            url="http://127.0.0.1:11434"
-                        )
-                    except Exception as e:
-                        self.print_warning(f"Could not track Ollama process: {e}")
-                    
-                    return True
-                    
-            self.print_error("Ollama server failed to start within timeout")
+            started = time.monotonic()
+            if self.wait_for_server(timeout=15):
+                self.print_success(f"Ollama server started successfully (PID: {self.process.pid}) "
+                                   f"in {time.monotonic() - started:.1f}s")
+                return True
+                
+            if self.process.poll() is not None:
+                self.print_error(f"Ollama server exited during startup (exit code: {self.process.returncode})")
+            else:
+                self.print_error("Ollama server failed to start within timeout")
+            # A server that never came up is not worth restarting
+            self.supervised.stop(timeout=5)
+            if process_manager is not None:
+                process_manager.untrack_process("ollama_server")
             return False
             
         except Exception as e:
@@ -218,28 +283,13 @@ class OllamaManager:
                 
             self.print_info(f"Stopping {len(processes)} Ollama process(es)...")
             
-            # Try graceful shutdown first
-            for proc in processes:
-                try:
-                    proc.terminate()
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-                    
-            # Wait for graceful shutdown
-            time.sleep(3)
+            # Graceful shutdown first, force kill whatever outlives the grace period;
+            # returns as soon as every process has actually exited
+            stop_processes(
+                processes, timeout=10, kill_timeout=3,
+                on_kill=lambda procs: self.print_warning("Force killing remaining Ollama processes...")
+            )
             
-            # Force kill if still running
-            remaining_processes = self.get_ollama_processes()
-            if remaining_processes:
-                self.print_warning("Force killing remaining Ollama processes...")
-                for proc in remaining_processes:
-                    try:
-                        proc.kill()
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        continue
-                        
-                time.sleep(1)
-                
             # Verify shutdown
             if not self.is_ollama_running():
                 self.print_success("Ollama server stopped successfully")
@@ -258,8 +308,6 @@ class OllamaManager:
         
         if not self.stop_ollama_server():
             return False
-            
-        time.sleep(2)  # Brief pause between stop and start
         
         return self.start_ollama_server()
         
@@ -275,6 +323,11 @@ class OllamaManager:
             print(f"{Fore.YELLOW}Use option 6 to start Ollama server{Style.RESET_ALL}")
         else:
             print(f"{Fore.GREEN}Status: Running{Style.RESET_ALL}")
+            version = self.probe_server()
+            if version:
+                print(f"{Fore.GREEN}API: Responding (version {version}){Style.RESET_ALL}")
+            else:
+                print(f"{Fore.YELLOW}API: Not responding on {self.host}:{self.port}{Style.RESET_ALL}")
             print(f"{Fore.YELLOW}Process Count: {status['process_count']}{Style.RESET_ALL}")
             
             for i, proc in enumerate(status['processes'], 1):
@@ -297,26 +350,23 @@ class OllamaManager:
                 
             self.print_info("Fetching available models...")
             
-            result = subprocess.run(
-                [str(self.ollama_exe), 'list'],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            # Same cached /api/tags view the model menus use
+            registry = get_registry(self.host, self.port)
+            models = registry.installed()
+            if registry.last_error:
+                self.print_error(f"Failed to list models: {registry.last_error}")
+                return False
             
-            if result.returncode == 0:
-                output = result.stdout.strip()
-                if output:
-                    print(f"\n{Fore.CYAN}🤖 Available AI Models:{Style.RESET_ALL}")
-                    print(f"{Fore.CYAN}{'='*40}{Style.RESET_ALL}")
-                    print(output)
-                else:
-                    self.print_warning("No models are currently installed")
-                    self.print_info("Use option 7 to download AI models")
-                return True
+            if models:
+                print(f"\n{Fore.CYAN}🤖 Available AI Models:{Style.RESET_ALL}")
+                print(f"{Fore.CYAN}{'='*40}{Style.RESET_ALL}")
+                print(f"{'NAME':<30} {'ID':<12}  {'SIZE':>8}  MODIFIED")
+                for model in models:
+                    print(f"{model['name']:<30} {model['id']:<12}  {model['size']:>8}  {model['modified']}")
             else:
-                self.print_error(f"Failed to list models: {result.stderr}")
-                return False
+                self.print_warning("No models are currently installed")
+                self.print_info("Use option 7 to download AI models")
+            return True
                 
         except Exception as e:
             self.print_error(f"Failed to list models: {e}")
@@ -325,26 +375,22 @@ class OllamaManager:
     def test_ollama_connection(self):
         """Test Ollama server connection"""
         try:
-            if not self.is_ollama_running():
-                self.print_error("Ollama server is not running")
-                return False
-                
             self.print_info("Testing Ollama server connection...")
             
-            # Try to get version info
-            result = subprocess.run(
-                [str(self.ollama_exe), '--version'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            # Ask the server itself rather than the CLI binary
+            version = self.probe_server(timeout=5)
+            if version is None:
+                if self.get_ollama_processes():
+                    self.print_error(f"Ollama process found but API is not responding on {self.host}:{self.port}")
+                else:
+                    self.print_error("Ollama server is not running")
+                return False
             
-            if result.returncode == 0:
-                version = result.stdout.strip()
-                self.print_success(f"Ollama server is responsive - {version}")
+            if self.client.is_ready(timeout=5):
+                self.print_success(f"Ollama server is responsive - version {version}")
                 return True
             else:
-                self.print_error("Ollama server is not responding")
+                self.print_error("Ollama server is alive but not ready to serve requests")
                 return False
                 
         except Exception as e:
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+AI Package Validator
+Checks all required packages in a single interpreter
+
+Instead of one `python -c "import X"` per package, one child interpreter
+(the AI2025 Python, or any other) looks every package up with
+importlib.util.find_spec and reads its installed version from
+importlib.metadata - neither executes the package. Full imports are
+opt-in and run in a bounded thread pool with a per-package timeout.
+
+Distribution names are mapped to import names (scikit-learn -> sklearn,
+beautifulsoup4 -> bs4, ...), and version constraints from
+install_config.json (">=0.1.0") are checked against the installed version.
+
+The result is a report dict:
+    {"ok", "python", "executable", "elapsed_ms", "error",
+     "packages": [{"requirement", "name", "import_name", "status", "version",
+                   "location", "import_ms", "error"}, ...]}
+with status one of ok, missing, outdated, import_failed, import_timeout.
+
+Version: 3.0.28
+Author: AI Environment Team
+Date: 2026-10-17
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Distribution name -> top-level import name, where they differ
+IMPORT_NAMES = {
+    "scikit-learn": "sklearn",
+    "python-dotenv": "dotenv",
+    "beautifulsoup4": "bs4",
+    "faiss-cpu": "faiss",
+    "faiss-gpu": "faiss",
+    "pyautogen": "autogen",
+    "langraph": "langgraph",
+    "pyyaml": "yaml",
+    "pillow": "PIL",
+    "opencv-python": "cv2",
+    "pywin32": "win32api",
+    "protobuf": "google.protobuf",
+}
+
+DEFAULT_WORKERS = 4
+DEFAULT_IMPORT_TIMEOUT = 30
+# Marks the report line in the child's stdout (full imports may print)
+REPORT_MARKER = "@@AI_PACKAGE_REPORT@@"
+
+_REQUIREMENT_PATTERN = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(\[[^\]]*\])?\s*(.*)$")
+
+
+def parse_requirement(requirement):
+    """Split 'name>=1.0' into ('name', '>=1.0')"""
+    match = _REQUIREMENT_PATTERN.match(requirement)
+    if not match:
+        return requirement.strip(), ""
+    return match.group(1), match.group(3).strip()
+
+
+def import_name_for(name):
+    """Top-level import name of a distribution"""
+    return IMPORT_NAMES.get(name.lower(), name.replace("-", "_"))
+
+
+def _version_tuple(version):
+    parts = []
+    for part in version.split("."):
+        digits = re.match(r"\d+", part)
+        if not digits:
+            break
+        parts.append(int(digits.group()))
+    return tuple(parts)
+
+
+def version_satisfies(version, specifier):
+    """Check a version against comma-separated constraints like '>=0.1,<2'
+
+    Returns:
+        bool: True/False, or None if either side cannot be compared
+    """
+    if not specifier:
+        return True
+    if not version:
+        return None
+    installed = _version_tuple(version)
+    if not installed:
+        return None
+    checks = {">=": lambda a, b: a >= b, "<=": lambda a, b: a <= b, "==": lambda a, b: a == b,
+              "!=": lambda a, b: a != b, ">": lambda a, b: a > b, "<": lambda a, b: a < b}
+    for constraint in specifier.split(","):
+        match = re.match(r"\s*(>=|<=|==|!=|>|<)\s*([\w.]+)", constraint)
+        if not match:
+            return None
+        wanted = _version_tuple(match.group(2))
+        width = max(len(installed), len(wanted))
+        pad = lambda value: value + (0,) * (width - len(value))
+        if not checks[match.group(1)](pad(installed), pad(wanted)):
+            return False
+    return True
+
+
+def _lookup(name, import_name):
+    """find_spec + metadata for one package (nothing is executed)"""
+    import importlib.util
+    try:
+        from importlib import metadata
+    except ImportError:        # Python < 3.8
+        metadata = None
+
+    result = {"found": False, "location": None, "version": None, "error": None}
+    try:
+        spec = importlib.util.find_spec(import_name)
+    except (ImportError, ValueError) as e:
+        # Dotted names import their parent package; a broken parent lands here
+        spec = None
+        result["error"] = f"{type(e).__name__}: {e}"
+    if spec is not None:
+        result["found"] = True
+        result["location"] = spec.origin or (list(spec.submodule_search_locations or []) or [None])[0]
+    if metadata is not None:
+        for candidate in (name, import_name):
+            try:
+                result["version"] = metadata.version(candidate)
+                break
+            except metadata.PackageNotFoundError:
+                continue
+    return result
+
+
+def _import_all(import_names, workers, import_timeout):
+    """Import modules in a bounded pool; name -> (ok, error, ms)"""
+    import importlib
+    from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+    def timed_import(module_name):
+        started = time.perf_counter()
+        try:
+            importlib.import_module(module_name)
+            return True, None, round((time.perf_counter() - started) * 1000, 1)
+        except BaseException as e:     # SystemExit/KeyboardInterrupt from a broken package too
+            return False, f"{type(e).__name__}: {e}", round((time.perf_counter() - started) * 1000, 1)
+
+    results = {}
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    futures = {module_name: pool.submit(timed_import, module_name) for module_name in import_names}
+    deadline = time.monotonic() + import_timeout * max(1, -(-len(import_names) // max(1, workers)))
+    for module_name, future in futures.items():
+        try:
+            # Each import gets its timeout; the pool as a whole gets one per round of workers
+            results[module_name] = future.result(timeout=max(min(import_timeout, deadline - time.monotonic()), 0))
+        except FutureTimeout:
+            results[module_name] = (None, f"import did not finish within {import_timeout}s", None)
+    # Hung imports cannot be cancelled; leave their threads behind
+    pool.shutdown(wait=False)
+    return results
+
+
+def check_packages(requirements, full_import=False, workers=DEFAULT_WORKERS,
+                   import_timeout=DEFAULT_IMPORT_TIMEOUT):
+    """Check packages in the current interpreter
+
+    Args:
+        requirements (list): Requirement strings ('pandas', 'langchain>=0.1.0') or
+            (distribution, import name) tuples
+        full_import (bool): Also import every found package
+        workers (int): Threads used for full imports
+        import_timeout (float): Seconds allowed per full import
+
+    Returns:
+        dict: Report (see module docstring)
+    """
+    started = time.perf_counter()
+    packages = []
+    for requirement in requirements:
+        if isinstance(requirement, (list, tuple)):
+            name, import_name = requirement
+            requirement, specifier = name, ""
+        else:
+            name, specifier = parse_requirement(requirement)
+            import_name = import_name_for(name)
+        found = _lookup(name, import_name)
+        if not found["found"]:
+            status = "missing"
+        elif version_satisfies(found["version"], specifier) is False:
+            status = "outdated"
+        else:
+            status = "ok"
+        packages.append({"requirement": requirement, "name": name, "import_name": import_name,
+                         "specifier": specifier, "status": status, "version": found["version"],
+                         "location": found["location"], "import_ms": None, "error": found["error"]})
+
+    if full_import:
+        to_import = [package["import_name"] for package in packages if package["status"] != "missing"]
+        imported = _import_all(to_import, workers, import_timeout)
+        for package in packages:
+            if package["import_name"] not in imported:
+                continue
+            ok, error, import_ms = imported[package["import_name"]]
+            package["import_ms"] = import_ms
+            if ok is None:
+                package.update(status="import_timeout", error=error)
+            elif not ok:
+                package.update(status="import_failed", error=error)
+
+    return {
+        "ok": all(package["status"] == "ok" for package in packages),
+        "python": sys.version.split()[0],
+        "executable": sys.executable,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "error": None,
+        "packages": packages,
+    }
+
+
+def child_main():
+    """Entry point inside the child interpreter: options on stdin, report on stdout"""
+    options = json.loads(sys.stdin.read())
+    report = check_packages(options["requirements"], options.get("full_import", False),
+                            options.get("workers", DEFAULT_WORKERS),
+                            options.get("import_timeout", DEFAULT_IMPORT_TIMEOUT))
+    sys.stdout.write("\n" + REPORT_MARKER + json.dumps(report) + "\n")
+    sys.stdout.flush()
+    # Skip interpreter teardown: a hung import thread would otherwise block exit
+    os._exit(0)
+
+
+def validate_packages(requirements, python=None, full_import=False, workers=DEFAULT_WORKERS,
+                      import_timeout=DEFAULT_IMPORT_TIMEOUT, timeout=None):
+    """Check packages in one child interpreter
+
+    Args:
+        requirements (list): Requirement strings or (distribution, import name) tuples
+        python (str, optional): Interpreter to check (default: this one)
+        full_import (bool): Also import every found package (in a bounded pool)
+        workers (int): Threads used for full imports
+        import_timeout (float): Seconds allowed per full import
+        timeout (float, optional): Overall limit for the child
+
+    Returns:
+        dict: Report (see module docstring); 'error' is set if the child failed
+    """
+    python = str(python or sys.executable)
+    if timeout is None:
+        rounds = -(-len(requirements) // max(1, workers))
+        timeout = 60 + (import_timeout * rounds if full_import else 0)
+    src_dir = str(Path(__file__).resolve().parent)
+    command = [python, "-c", f"import sys; sys.path.insert(0, {src_dir!r}); "
+                             f"import ai_package_validator; ai_package_validator.child_main()"]
+    options = {"requirements": [list(r) if isinstance(r, tuple) else r for r in requirements],
+               "full_import": full_import, "workers": workers, "import_timeout": import_timeout}
+
+    started = time.perf_counter()
+    error = None
+    try:
+        result = subprocess.run(command, input=json.dumps(options), capture_output=True, text=True,
+                                encoding="utf-8", errors="replace", timeout=timeout)
+        for line in reversed(result.stdout.splitlines()):
+            if line.startswith(REPORT_MARKER):
+                report = json.loads(line[len(REPORT_MARKER):])
+                report["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                return report
+        error = (result.stderr.strip().splitlines() or [f"exit code {result.returncode}"])[-1]
+    except subprocess.TimeoutExpired:
+        error = f"package check did not finish within {timeout:.0f}s"
+    except OSError as e:
+        error = f"could not start {python}: {e}"
+
+    return {"ok": False, "python": None, "executable": python,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1), "error": error,
+            "packages": [dict(requirement=str(r), name=str(r), import_name=None, specifier="", status="unknown",
+                              version=None, location=None, import_ms=None, error=error) for r in requirements]}
+
+
+def format_report(report):
+    """Format a report as text lines"""
+    lines = [f"Python {report.get('python') or '?'} ({report.get('executable')}) - "
+             f"{len(report['packages'])} packages checked in {report['elapsed_ms']:.0f} ms"]
+    if report.get("error"):
+        lines.append(f"ERROR: {report['error']}")
+    for package in report["packages"]:
+        version = package["version"] or "-"
+        extra = f" ({package['import_ms']:.0f} ms import)" if package.get("import_ms") is not None else ""
+        if package["status"] == "outdated":
+            extra = f" (requires {package['specifier']})"
+        elif package.get("error") and package["status"] != "ok":
+            extra = f" ({package['error']})"
+        lines.append(f"  {package['status']:<15} {package['name']:<28} {version:<14}{extra}")
+    return "\n".join(lines)
+
+
+def main():
+    """Validate install_config.json packages from the command line"""
+    import argparse
+
+    default_config = Path(__file__).resolve().parent.parent / "config" / "install_config.json"
+    parser = argparse.ArgumentParser(description="Check required packages in one interpreter")
+    parser.add_argument("packages", nargs="*", help="Requirements (default: install_config.json)")
+    parser.add_argument("--python", help="Interpreter to check (default: this one)")
+    parser.add_argument("--config", default=str(default_config), help="install_config.json to read")
+    parser.add_argument("--full-import", action="store_true", help="Also import every package")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Threads for full imports")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    requirements = args.packages
+    if not requirements:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            requirements = json.load(f).get("python_packages", [])
+
+    report = validate_packages(requirements, python=args.python, full_import=args.full_import,
+                               workers=args.workers)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
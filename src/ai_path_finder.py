@@ -2,46 +2,200 @@
 """
 AI Path Finder - Finds AI_Environment across all drives
 Shared utility for all AI Environment modules
+
+Lookup order:
+1. AI_ENV_PATH environment variable (set by activate_ai_env.bat)
+2. The AI_Environment this copy of src/ belongs to
+3. The last location found, if its fingerprint still matches
+4. A scan of all drive letters, probed concurrently with a per-drive
+   timeout so a disconnected network drive or a sleeping USB disk cannot
+   stall startup
+
+The last location is cached per user (it cannot live inside the
+AI_Environment tree it points to).
+
+Version: 3.0.28
+Author: AI Environment Team
+Date: 2026-10-17
 """
 
+import json
+import os
 import string
+import threading
+import time
 from pathlib import Path
 from typing import Optional
 
+ENV_OVERRIDE = "AI_ENV_PATH"
+# Seconds to wait for a drive before treating it as unavailable
+DRIVE_PROBE_TIMEOUT = 2.0
+MARKERS = ("Ollama", "Miniconda")
+
+
+def get_cache_path() -> Path:
+    """Per-user cache file holding the last known AI_Environment location"""
+    if os.environ.get('LOCALAPPDATA'):
+        base = Path(os.environ['LOCALAPPDATA']) / "AI_Environment"
+    else:
+        base = Path.home() / ".cache" / "ai_environment"
+    return base / "ai_env_location.json"
 
-def find_ai_environment(verbose: bool = False) -> Optional[Path]:
+
+def _run_with_timeout(func, timeout):
+    """Run func in a daemon thread; return its result or None after timeout
+
+    A stat() on an unreachable drive can block far longer than any timeout,
+    so the thread is abandoned rather than joined.
+    """
+    result = {}
+
+    def target():
+        try:
+            result["value"] = func()
+        except OSError:
+            result["value"] = None
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return result.get("value")
+
+
+def fingerprint(path: Path) -> Optional[dict]:
+    """Identity of an AI_Environment folder, or None if it is not one
+
+    The volume and folder ids change when a different disk is mounted under
+    the same letter; the markers change when the installation is removed.
+    """
+    try:
+        if not path.is_dir():
+            return None
+        markers = sorted(marker for marker in MARKERS if (path / marker).exists())
+        if not markers:
+            return None
+        stat = path.stat()
+        return {"path": str(path), "device": stat.st_dev, "inode": stat.st_ino, "markers": markers}
+    except OSError:
+        return None
+
+
+def _load_cached(cache_path: Path) -> Optional[dict]:
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        return cached if isinstance(cached, dict) and cached.get("path") else None
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _save_cached(cache_path: Path, fp: dict):
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_suffix(".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(fp, saved_at=time.time()), f, indent=2)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        pass   # Caching is an optimization only
+
+
+def _probe_drive(letter: str) -> Optional[Path]:
+    """AI_Environment on one drive (AI_Lab layout first), or None"""
+    drive_path = Path(f"{letter}:\\")
+    if not drive_path.exists():
+        return None
+    # AI_Lab\AI_Environment (external drives), then Drive:\AI_Environment (internal drives)
+    for candidate in (drive_path / "AI_Lab" / "AI_Environment", drive_path / "AI_Environment"):
+        if fingerprint(candidate):
+            return candidate
+    return None
+
+
+def scan_drives(timeout: float = DRIVE_PROBE_TIMEOUT, verbose: bool = False) -> Optional[Path]:
+    """
+    Probe every drive letter concurrently.
+
+    The earliest letter with an installation wins, as with a serial scan.
+    Drives that do not answer within timeout (counted from the start of
+    the scan, so the whole scan is bounded by it) are skipped.
+    """
+    results = {}
+    done = {letter: threading.Event() for letter in string.ascii_uppercase}
+
+    def probe(letter):
+        try:
+            results[letter] = _probe_drive(letter)
+        except OSError:
+            results[letter] = None
+        done[letter].set()
+
+    for letter in string.ascii_uppercase:
+        threading.Thread(target=probe, args=(letter,), daemon=True, name=f"probe-{letter}").start()
+
+    deadline = time.monotonic() + timeout
+    for letter in string.ascii_uppercase:
+        if not done[letter].wait(max(deadline - time.monotonic(), 0)):
+            if verbose:
+                print(f"[VERBOSE] Drive {letter}: did not answer within {timeout:g}s, skipped")
+            continue
+        if results.get(letter):
+            return results[letter]
+    return None
+
+
+def find_ai_environment(verbose: bool = False, use_cache: bool = True,
+                        timeout: float = DRIVE_PROBE_TIMEOUT) -> Optional[Path]:
     """
     Find AI_Environment installation across all drives.
     Searches for AI_Environment in both external (AI_Lab) and internal locations.
 
     Args:
         verbose: If True, print debug messages
+        use_cache: If False, ignore the cached location and rescan the drives
+        timeout: Seconds to wait for slow drives
 
     Returns:
         Path to AI_Environment or None if not found
     """
-    # Search all drives for AI_Environment
-    for letter in string.ascii_uppercase:
-        drive_path = Path(f"{letter}:\\")
+    override = os.environ.get(ENV_OVERRIDE)
+    if override:
+        override_path = Path(override)
+        if _run_with_timeout(lambda: fingerprint(override_path), timeout):
+            if verbose:
+                print(f"[VERBOSE] Using AI_Environment from {ENV_OVERRIDE}: {override_path}")
+            return override_path
+        if verbose:
+            print(f"[VERBOSE] {ENV_OVERRIDE}={override} is not an AI_Environment, searching")
 
-        if not drive_path.exists():
-            continue
+    # The installation this module was loaded from
+    own_path = Path(__file__).resolve().parent.parent
+    if fingerprint(own_path):
+        if verbose:
+            print(f"[VERBOSE] Found AI_Environment at current location: {own_path}")
+        return own_path
 
-        # Check AI_Lab\AI_Environment (external drives)
-        ai_lab_path = drive_path / "AI_Lab" / "AI_Environment"
-        if ai_lab_path.exists() and ai_lab_path.is_dir():
-            if (ai_lab_path / "Ollama").exists() or (ai_lab_path / "Miniconda").exists():
+    cache_path = get_cache_path()
+    if use_cache:
+        cached = _load_cached(cache_path)
+        if cached:
+            cached_path = Path(cached["path"])
+            current = _run_with_timeout(lambda: fingerprint(cached_path), timeout)
+            if current and all(current[key] == cached.get(key) for key in ("device", "inode", "markers")):
                 if verbose:
-                    print(f"[VERBOSE] Found AI_Environment at: {ai_lab_path}")
-                return ai_lab_path
+                    print(f"[VERBOSE] Found AI_Environment at cached location: {cached_path}")
+                return cached_path
+            if verbose:
+                print(f"[VERBOSE] Cached location {cached_path} changed, rescanning drives")
 
-        # Check Drive:\AI_Environment (internal drives)
-        ai_env_path = drive_path / "AI_Environment"
-        if ai_env_path.exists() and ai_env_path.is_dir():
-            if (ai_env_path / "Ollama").exists() or (ai_env_path / "Miniconda").exists():
-                if verbose:
-                    print(f"[VERBOSE] Found AI_Environment at: {ai_env_path}")
-                return ai_env_path
+    found = scan_drives(timeout=timeout, verbose=verbose)
+    if found:
+        if verbose:
+            print(f"[VERBOSE] Found AI_Environment at: {found}")
+        fp = fingerprint(found)
+        if fp:
+            _save_cached(cache_path, fp)
+        return found
 
     if verbose:
         print("[VERBOSE] AI_Environment not found on any drive")
@@ -50,13 +204,21 @@ def find_ai_environment(verbose: bool = False) -> Optional[Path]:
 
 def main():
     """Test path finder"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Find the AI_Environment installation")
+    parser.add_argument("--rescan", action="store_true", help="Ignore the cached location")
+    args = parser.parse_args()
+
     print("Searching for AI_Environment...")
-    ai_env_path = find_ai_environment(verbose=True)
+    started = time.perf_counter()
+    ai_env_path = find_ai_environment(verbose=True, use_cache=not args.rescan)
+    elapsed_ms = (time.perf_counter() - started) * 1000
 
     if ai_env_path:
-        print(f"\nFound: {ai_env_path}")
+        print(f"\nFound: {ai_env_path} ({elapsed_ms:.0f} ms)")
     else:
-        print("\nNot found")
+        print(f"\nNot found ({elapsed_ms:.0f} ms)")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+AI Process Dashboard
+Live terminal view of tracked services and Ollama processes
+
+Redraws about once per second with CPU%, memory (RSS, children included),
+threads, listening ports, uptime and a CPU sparkline per service. Ollama
+processes (the server and its per-model runners) are shown even if they
+were not launched from the menu. Every sample can be appended to a JSONL
+or CSV time series for later analysis.
+
+Version: 3.0.28
+Author: AI Environment Team
+Date: 2026-10-17
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+try:
+    from colorama import Fore, Style, init
+    init()
+except ImportError:
+    class Fore:
+        GREEN = RED = YELLOW = CYAN = BLUE = MAGENTA = WHITE = ""
+    class Style:
+        RESET_ALL = ""
+
+from ai_process_sampler import ProcessSampler
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+DEFAULT_INTERVAL = 1.0
+DEFAULT_HISTORY = 30
+EXPORT_FIELDS = ["timestamp", "process_id", "name", "pid", "cpu_percent", "rss_mb", "threads",
+                 "children", "ports", "uptime_s"]
+# Cursor home + clear screen; redraws in place instead of scrolling
+CLEAR_SCREEN = "\033[H\033[J"
+
+
+def sparkline(values, floor=100):
+    """Render values as a unicode sparkline (None values as spaces)
+
+    The scale is the larger of floor and the highest value, so an idle
+    service does not look busy just because its own maximum is tiny.
+    """
+    known = [value for value in values if value is not None]
+    if not known:
+        return ""
+    top = max(floor or 0, max(known)) or 1
+    chars = []
+    for value in values:
+        if value is None:
+            chars.append(" ")
+        else:
+            index = min(int(value / top * (len(SPARK_CHARS) - 1)), len(SPARK_CHARS) - 1)
+            chars.append(SPARK_CHARS[max(index, 0)])
+    return "".join(chars)
+
+
+def format_uptime(seconds):
+    """Format seconds as '1h02m', '5m10s' or '42s'"""
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+def listening_ports(pids):
+    """Map pid -> sorted listening TCP ports for the given pids"""
+    pids = set(pids)
+    ports = {}
+    try:
+        for conn in psutil.net_connections(kind="tcp"):
+            if conn.pid in pids and conn.status == psutil.CONN_LISTEN and conn.laddr:
+                ports.setdefault(conn.pid, set()).add(conn.laddr.port)
+    except psutil.AccessDenied:
+        # macOS needs root for the system-wide table; ask each process instead
+        for pid in pids:
+            try:
+                connections = psutil.Process(pid).connections(kind="tcp")
+            except psutil.Error:
+                continue
+            for conn in connections:
+                if conn.status == psutil.CONN_LISTEN and conn.laddr:
+                    ports.setdefault(pid, set()).add(conn.laddr.port)
+    return {pid: sorted(found) for pid, found in ports.items()}
+
+
+class ProcessDashboard:
+    """Samples tracked services periodically and renders a live table"""
+
+    def __init__(self, process_manager, interval=DEFAULT_INTERVAL, history=DEFAULT_HISTORY,
+                 export_path=None, include_ollama=True):
+        """Initialize dashboard
+
+        Args:
+            process_manager (BackgroundProcessManager): Source of tracked processes
+            interval (float): Seconds between samples
+            history (int): Samples kept per service for the sparkline
+            export_path (Path, optional): Append samples to this .jsonl or .csv file
+            include_ollama (bool): Also show Ollama processes not launched from the menu
+        """
+        self.process_manager = process_manager
+        self.interval = interval
+        self.include_ollama = include_ollama
+        self.export_path = Path(export_path) if export_path else None
+        # Own sampler: its cpu baselines are independent of other samplers in the process
+        self.sampler = ProcessSampler()
+        self.history = {}
+        self.history_length = history
+
+    def entries(self, table):
+        """Tracked services plus Ollama processes found in the process table
+
+        The registry is only read: dead entries are hidden using the same
+        process table snapshot the metrics come from, and pruning them is left
+        to the managers that own them.
+        """
+        entries = self.process_manager.registry.entries()
+        if table:
+            entries = {process_id: info for process_id, info in entries.items()
+                       if self.sampler.matches(table, info.get('pid'), info.get('create_time'))}
+        if self.include_ollama:
+            tracked_pids = {info.get('pid') for info in entries.values()}
+            for pid, (_, create_time, name) in table.items():
+                if name.lower().startswith("ollama") and pid not in tracked_pids:
+                    label = "Ollama runner" if "runner" in name.lower() or "llama_server" in name.lower() else "Ollama"
+                    entries[f"ollama_{pid}"] = {"pid": pid, "create_time": create_time,
+                                                "name": f"{label} ({name})"}
+        return entries
+
+    def sample(self):
+        """Take one sample of every service
+
+        Returns:
+            list: Row dicts with the EXPORT_FIELDS keys plus 'alive', 'status' and 'spark'
+        """
+        table = self.sampler.process_table()
+        entries = self.entries(table)
+        samples = self.sampler.sample(entries, prime_interval=0, table=table)
+        pids = [pid for sample in samples.values() if sample["alive"]
+                for pid in [sample["pid"]] + [child["pid"] for child in sample["children"]]]
+        ports = listening_ports(pids) if PSUTIL_AVAILABLE and pids else {}
+
+        now = time.time()
+        rows = []
+        for process_id, sample in samples.items():
+            info = entries[process_id]
+            tree_pids = [sample["pid"]] + [child["pid"] for child in sample["children"]]
+            create_time = table.get(sample["pid"], (None, None))[1]
+            cpu = sample["cpu_percent_total"]
+            history = self.history.setdefault(process_id, deque(maxlen=self.history_length))
+            history.append(cpu)
+            rows.append({
+                "timestamp": datetime.fromtimestamp(now).isoformat(timespec="seconds"),
+                "process_id": process_id,
+                "name": info.get("name", process_id),
+                "pid": sample["pid"],
+                "alive": sample["alive"],
+                "status": sample["status"],
+                "cpu_percent": cpu,
+                "rss_mb": round(sample["memory_rss_total"] / 1024 / 1024, 1),
+                "threads": sample["num_threads"] + sum(child["num_threads"] for child in sample["children"]),
+                "children": len(sample["children"]),
+                "ports": sorted({port for pid in tree_pids for port in ports.get(pid, [])}),
+                "uptime_s": round(now - create_time) if sample["alive"] and create_time else None,
+                "spark": sparkline(list(history)),
+            })
+        for process_id in list(self.history):
+            if process_id not in samples:
+                del self.history[process_id]
+        return rows
+
+    def export(self, rows):
+        """Append rows to the export file (JSONL or CSV by extension)"""
+        if not self.export_path:
+            return
+        self.export_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.export_path.suffix.lower() == ".csv":
+            new_file = not self.export_path.exists()
+            with open(self.export_path, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+                if new_file:
+                    writer.writeheader()
+                for row in rows:
+                    writer.writerow(dict(row, ports=" ".join(map(str, row["ports"]))))
+        else:
+            with open(self.export_path, 'a', encoding='utf-8') as f:
+                for row in rows:
+                    f.write(json.dumps({field: row[field] for field in EXPORT_FIELDS}) + "\n")
+
+    def render(self, rows):
+        """Format rows as the dashboard screen"""
+        lines = [f"{Fore.CYAN}📊 AI Environment - Live Resources "
+                 f"({datetime.now().strftime('%H:%M:%S')}, every {self.interval:g}s, Ctrl+C to exit){Style.RESET_ALL}"]
+        if PSUTIL_AVAILABLE:
+            vm = psutil.virtual_memory()
+            lines.append(f"System: CPU {psutil.cpu_percent():5.1f}%  "
+                         f"RAM {vm.used / 1024 ** 3:.1f}/{vm.total / 1024 ** 3:.1f} GB ({vm.percent:.0f}%)")
+        if self.export_path:
+            lines.append(f"Exporting to: {self.export_path}")
+        lines.append("")
+        lines.append(f"{'Service':<28} {'PID':>7} {'CPU%':>6} {'RSS MB':>8} {'Thr':>4} {'Uptime':>7}  "
+                     f"{'Ports':<12} CPU history")
+        lines.append("-" * 100)
+        if not rows:
+            lines.append("No tracked services running")
+        for row in sorted(rows, key=lambda r: (not r["alive"], -(r["cpu_percent"] or 0))):
+            name = row["name"][:27] + (f" +{row['children']}" if row["children"] else "")
+            if not row["alive"]:
+                lines.append(f"{Fore.RED}{name:<28} {row['pid'] or '':>7}  (exited){Style.RESET_ALL}")
+                continue
+            cpu = f"{row['cpu_percent']:.1f}" if row["cpu_percent"] is not None else "--"
+            color = Fore.RED if (row["cpu_percent"] or 0) >= 90 else Fore.YELLOW if (row["cpu_percent"] or 0) >= 40 else ""
+            ports = ",".join(map(str, row["ports"])) or "-"
+            uptime = format_uptime(row["uptime_s"]) if row["uptime_s"] is not None else "--"
+            lines.append(f"{color}{name:<28} {row['pid']:>7} {cpu:>6} {row['rss_mb']:>8.1f} {row['threads']:>4} "
+                         f"{uptime:>7}  {ports:<12} {row['spark']}{Style.RESET_ALL}")
+        return "\n".join(lines)
+
+    def run(self, duration=None):
+        """Redraw until Ctrl+C (or for duration seconds)
+
+        Returns:
+            int: Number of samples taken
+        """
+        started = time.monotonic()
+        ticks = 0
+        next_tick = started
+        try:
+            while duration is None or time.monotonic() - started < duration:
+                rows = self.sample()
+                self.export(rows)
+                ticks += 1
+                print(CLEAR_SCREEN + self.render(rows), flush=True)
+                # Fixed cadence regardless of how long sampling took
+                next_tick += self.interval
+                time.sleep(max(next_tick - time.monotonic(), 0))
+        except KeyboardInterrupt:
+            pass
+        return ticks
+
+
+def main():
+    """Run the dashboard from the command line"""
+    from ai_path_finder import find_ai_environment
+    from ai_process_manager import BackgroundProcessManager
+
+    parser = argparse.ArgumentParser(description="Live resource dashboard for AI Environment services")
+    parser.add_argument("-i", "--interval", type=float, default=DEFAULT_INTERVAL, help="Seconds between samples")
+    parser.add_argument("-e", "--export", help="Append samples to a .jsonl or .csv file")
+    parser.add_argument("-d", "--duration", type=float, help="Stop after this many seconds")
+    parser.add_argument("--no-ollama", action="store_true", help="Only show services launched from the menu")
+    args = parser.parse_args()
+
+    ai_env_path = Path(os.environ['AI_ENV_PATH']) if os.environ.get('AI_ENV_PATH') else find_ai_environment()
+    if not ai_env_path:
+        print("AI_Environment not found on any drive!")
+        return 1
+    if not PSUTIL_AVAILABLE:
+        print("psutil is required for the dashboard")
+        return 1
+    dashboard = ProcessDashboard(BackgroundProcessManager(ai_env_path), interval=args.interval,
+                                 export_path=args.export, include_ollama=not args.no_ollama)
+    dashboard.run(duration=args.duration)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
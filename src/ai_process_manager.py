@@ -13,7 +13,7 @@ Tracks and controls all background processes launched from the menu with enhance
 """
 
 import subprocess
-import time
+import threading
 import json
 from pathlib import Path
 from datetime import datetime
@@ -25,6 +25,11 @@ except ImportError:
     PSUTIL_AVAILABLE = False
     print("[WARNING] psutil not available - some process management features will be limited")
 
+from ai_process_registry import ProcessRegistry, is_same_process
+from ai_process_sampler import get_sampler
+from ai_process_supervisor import SupervisedProcess, get_service_logger, stop_process_trees
+from ai_resource_policy import ResourcePolicyEnforcer
+
 try:
     from colorama import Fore, Style
 except ImportError:
@@ -38,8 +43,21 @@ class BackgroundProcessManager:
     
     def __init__(self, ai_env_path):
         self.ai_env_path = Path(ai_env_path)
+        # Legacy tracking file, imported into the registry once
         self.processes_file = self.ai_env_path / "background_processes.json"
+        self.registry = ProcessRegistry(self.ai_env_path / "cache" / "process_registry.sqlite")
         self.tracked_processes = {}
+        # Entries as last loaded/saved by this instance; save_tracked_processes()
+        # writes only what changed since, and removes only ids seen here
+        self._known = {}
+        # Supervised services started by this instance (restarted on failure)
+        self.supervised = {}
+        # Guards tracked_processes against supervisor watcher threads
+        self._lock = threading.RLock()
+        # Priority/affinity from config/service_policies.json, applied at launch
+        self.policy = ResourcePolicyEnforcer(self)
+        if self.processes_file.exists():
+            self.registry.migrate_json(self.processes_file)
         self.load_tracked_processes()
         
     def print_info(self, message):
@@ -59,42 +77,56 @@ class BackgroundProcessManager:
         print(f"{Fore.YELLOW}[WARNING] {message}{Style.RESET_ALL}")
         
     def load_tracked_processes(self):
-        """Load tracked processes from file"""
+        """Load tracked processes from the registry
+
+        Returns:
+            dict: process_id -> process info
+        """
         try:
-            if self.processes_file.exists():
-                with open(self.processes_file, 'r') as f:
-                    data = json.load(f)
-                    self.tracked_processes = data
-                    # Clean up dead processes
-                    self.cleanup_dead_processes()
+            self.tracked_processes = self.registry.entries()
+            self._known = {process_id: dict(info) for process_id, info in self.tracked_processes.items()}
+            # Clean up dead processes
+            self.cleanup_dead_processes()
         except Exception as e:
-            self.print_warning(f"Could not load process tracking file: {e}")
+            self.print_warning(f"Could not load process registry: {e}")
             self.tracked_processes = {}
+        return self.tracked_processes
             
     def save_tracked_processes(self):
-        """Save tracked processes to file"""
+        """Write tracked processes to the registry in one transaction
+        
+        Only this manager's changes are written: new or modified entries are
+        upserted and entries removed from tracked_processes are deleted.
+        Entries other managers added or removed in the meantime are kept as
+        they are.
+        """
         try:
-            with open(self.processes_file, 'w') as f:
-                json.dump(self.tracked_processes, f, indent=2)
+            with self._lock:
+                new_ids = set(self.tracked_processes) - set(self._known)
+                self.tracked_processes.update(self.registry.sync(self.tracked_processes, self._known))
+                self._known = {process_id: dict(info) for process_id, info in self.tracked_processes.items()}
+            for process_id in new_ids:
+                self.policy.apply(self.tracked_processes[process_id])
         except Exception as e:
-            self.print_warning(f"Could not save process tracking file: {e}")
+            self.print_warning(f"Could not save process registry: {e}")
             
-    def cleanup_dead_processes(self):
-        """Remove dead processes from tracking"""
-        dead_processes = []
-        for process_id, process_info in self.tracked_processes.items():
-            try:
-                pid = process_info['pid']
-                if not psutil.pid_exists(pid):
-                    dead_processes.append(process_id)
-            except:
-                dead_processes.append(process_id)
-                
-        for process_id in dead_processes:
-            del self.tracked_processes[process_id]
+    def snapshot(self):
+        """Copy of tracked_processes that is safe to read while other threads launch"""
+        with self._lock:
+            return {process_id: dict(info) for process_id, info in self.tracked_processes.items()}
             
-        if dead_processes:
-            self.save_tracked_processes()
+    def cleanup_dead_processes(self):
+        """Remove dead processes (or reused PIDs) from tracking"""
+        try:
+            # One process table pass for every entry instead of a lookup per PID
+            dead_processes = self.registry.prune_dead(get_sampler().live)
+        except Exception as e:
+            self.print_warning(f"Could not clean up process registry: {e}")
+            return
+        with self._lock:
+            for process_id in dead_processes:
+                self.tracked_processes.pop(process_id, None)
+                self._known.pop(process_id, None)
             
     def track_process(self, process_id, name, pid, command, url=None):
         """Track a background process"""
@@ -118,8 +150,11 @@ class BackgroundProcessManager:
             if url:
                 process_info['url'] = url
 
-            self.tracked_processes[process_id] = process_info
-            self.save_tracked_processes()
+            stored = self.registry.register(process_id, process_info)
+            with self._lock:
+                self.tracked_processes[process_id] = stored
+                self._known[process_id] = dict(stored)
+            self.policy.apply(process_info)
             self.print_success(f"Tracking process: {name} (PID: {pid})")
             return True
 
@@ -131,9 +166,10 @@ class BackgroundProcessManager:
         """Stop tracking a background process"""
         try:
             if process_id in self.tracked_processes:
-                process_info = self.tracked_processes[process_id]
-                del self.tracked_processes[process_id]
-                self.save_tracked_processes()
+                with self._lock:
+                    process_info = self.tracked_processes.pop(process_id)
+                    self._known.pop(process_id, None)
+                self.registry.unregister(process_id)
                 self.print_success(f"Stopped tracking: {process_info['name']}")
                 return True
             else:
@@ -148,6 +184,57 @@ class BackgroundProcessManager:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         return f"{app_name}_{timestamp}"
         
+    def launch_supervised(self, process_id, process_info, command, restart="on-failure", **popen_kwargs):
+        """Start a service under a SupervisedProcess and track it
+        
+        While this interpreter runs, the service is restarted according to
+        its restart policy (exponential backoff, see SupervisedProcess); each
+        restart re-registers the same process id with the new PID. Restarts
+        are written to the service log, not the console.
+        
+        Args:
+            process_id (str): Registry id of the service
+            process_info (dict): Entry to track ('name', 'command', ...); 'pid' is filled in
+            command (list): argv passed to subprocess.Popen
+            restart (str): 'no', 'on-failure' or 'always'
+            **popen_kwargs: Passed through to subprocess.Popen
+            
+        Returns:
+            SupervisedProcess: The started service
+        """
+        logger = get_service_logger()
+        
+        def on_event(name, event, detail):
+            if event == "started" and supervised.spawns > 1:
+                info = dict(process_info, pid=detail, create_time=None, argv=list(command), restart=restart,
+                            restarts=supervised.spawns - 1, started_at=datetime.now().isoformat())
+                try:
+                    stored = self.registry.register(process_id, info)
+                except Exception as e:
+                    logger.warning("%s restarted (PID %s) but could not be re-registered: %s", name, detail, e)
+                    return
+                with self._lock:
+                    self.tracked_processes[process_id] = stored
+                    self._known[process_id] = dict(stored)
+                self.policy.apply(stored)
+                logger.info("%s restarted (PID %s, restart %d)", name, detail, supervised.spawns - 1)
+            elif event == "exited":
+                logger.info("%s exited with code %s", name, detail)
+            elif event == "restarting":
+                logger.warning("%s restarting in %.1fs", name, detail)
+            elif event == "gave_up":
+                logger.error("%s not restarted any more (%s)", name, detail)
+        
+        supervised = SupervisedProcess(process_info['name'], command, restart=restart, on_event=on_event,
+                                       **popen_kwargs)
+        supervised.start()
+        with self._lock:
+            self.tracked_processes[process_id] = dict(process_info, pid=supervised.pid, argv=list(command),
+                                                      restart=restart)
+            self.supervised[process_id] = supervised
+        self.save_tracked_processes()
+        return supervised
+        
     def launch_vscode(self, project_path=None):
         """Launch VS Code in background with proper AI2025 interpreter setup"""
         try:
@@ -188,14 +275,15 @@ class BackgroundProcessManager:
             
             # Track the process
             process_id = self.generate_process_id("vscode")
-            self.tracked_processes[process_id] = {
-                'pid': process.pid,
-                'name': 'VS Code',
-                'command': ' '.join(cmd),
-                'started_at': datetime.now().isoformat(),
-                'type': 'application',
-                'project_path': str(project_path)
-            }
+            with self._lock:
+                self.tracked_processes[process_id] = {
+                    'pid': process.pid,
+                    'name': 'VS Code',
+                    'command': ' '.join(cmd),
+                    'started_at': datetime.now().isoformat(),
+                    'type': 'application',
+                    'project_path': str(project_path)
+                }
             
             self.save_tracked_processes()
             self.print_success(f"VS Code launched successfully (PID: {process.pid})")
@@ -214,28 +302,15 @@ Basic LLM Example - Test Ollama Connection
 Make sure Ollama is running: ollama serve
 """
 
-import requests
-import json
+import os
+import sys
+from pathlib import Path
 
-def query_ollama(prompt, model="phi:2.7b", host="127.0.0.1", port=11434):
-    """Query Ollama API"""
-    url = f"http://{host}:{port}/api/generate"
-    
-    data = {
-        "model": model,
-        "prompt": prompt,
-        "stream": False
-    }
-    
-    try:
-        response = requests.post(url, json=data, timeout=60)
-        response.raise_for_status()
-        
-        result = response.json()
-        return result.get("response", "No response received")
-        
-    except requests.exceptions.RequestException as e:
-        return f"Error: {e}"
+# Shared Ollama client lives in the AI Environment src/ folder
+ai_env_path = Path(os.environ.get('AI_ENV_PATH', Path(__file__).resolve().parents[2]))
+sys.path.insert(0, str(ai_env_path / "src"))
+
+from ai_ollama_client import stream_ollama, format_stream_stats
 
 def main():
     print("Basic LLM Example")
@@ -245,11 +320,15 @@ def main():
     # Test prompt
     prompt = "Explain artificial intelligence in simple terms"
     print(f"Question: {prompt}")
-    print("Thinking...")
     
-    # Query Ollama
-    response = query_ollama(prompt)
-    print(f"AI Response: {response}")
+    # Query Ollama, printing tokens as they are generated
+    stats = {}
+    print("AI Response: ", end="", flush=True)
+    for token in stream_ollama(prompt, stats=stats):
+        print(token, end="", flush=True)
+    print()
+    if stats:
+        print(f"[{format_stream_stats(stats)}]")
 
 if __name__ == "__main__":
     main()
@@ -339,7 +418,17 @@ if __name__ == "__main__":
             work_dir = self.ai_env_path / "Projects"
             work_dir.mkdir(exist_ok=True)
             
-            process = subprocess.Popen(
+            # Tracked and restarted on failure while the menu runs
+            process = self.launch_supervised(
+                self.generate_process_id("jupyter"),
+                {
+                    'name': 'Jupyter Lab',
+                    'command': 'jupyter lab --no-browser --port=8888',
+                    'started_at': datetime.now().isoformat(),
+                    'type': 'web_service',
+                    'url': 'http://localhost:8888',
+                    'work_dir': str(work_dir)
+                },
                 ['jupyter', 'lab', '--no-browser', '--port=8888'],
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
@@ -347,18 +436,6 @@ if __name__ == "__main__":
                 creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
             )
             
-            # Track the process
-            process_id = self.generate_process_id("jupyter")
-            self.tracked_processes[process_id] = {
-                'pid': process.pid,
-                'name': 'Jupyter Lab',
-                'command': 'jupyter lab --no-browser --port=8888',
-                'started_at': datetime.now().isoformat(),
-                'type': 'web_service',
-                'url': 'http://localhost:8888'
-            }
-            
-            self.save_tracked_processes()
             self.print_success(f"Jupyter Lab launched successfully (PID: {process.pid})")
             self.print_info("Access Jupyter Lab at: http://localhost:8888")
             return True
@@ -370,29 +447,41 @@ if __name__ == "__main__":
     def launch_streamlit_demo(self):
         """Launch Streamlit demo app in background"""
         try:
-            # Check for existing Streamlit processes and kill them
+            # Check for existing Streamlit processes and stop them all at once
             import psutil
-            for proc_id, proc_info in list(self.tracked_processes.items()):
-                if 'streamlit' in proc_id.lower() and proc_info.get('type') == 'web_service':
-                    try:
-                        pid = proc_info.get('pid')
-                        if pid and psutil.pid_exists(pid):
-                            self.print_info(f"Stopping existing Streamlit process (PID: {pid})...")
-                            psutil.Process(pid).terminate()
-                            time.sleep(1)  # Give it time to terminate
-                        # Remove from tracking
-                        del self.tracked_processes[proc_id]
-                    except Exception:
-                        pass
+            from ai_process_supervisor import stop_processes
+            old_processes = []
+            # Only the dict update holds the lock; the stop below can take seconds
+            with self._lock:
+                for proc_id, proc_info in list(self.tracked_processes.items()):
+                    if 'streamlit' in proc_id.lower() and proc_info.get('type') == 'web_service':
+                        try:
+                            pid = proc_info.get('pid')
+                            if pid and psutil.pid_exists(pid):
+                                self.print_info(f"Stopping existing Streamlit process (PID: {pid})...")
+                                old_processes.append(psutil.Process(pid))
+                            # Remove from tracking
+                            del self.tracked_processes[proc_id]
+                        except Exception:
+                            pass
+            # Returns as soon as they have exited (the port is then free)
+            stop_processes(old_processes, timeout=5)
             self.save_tracked_processes()
 
             # Create a simple demo app if it doesn't exist
             demo_file = self.ai_env_path / "Projects" / "streamlit_demo.py"
             if not demo_file.exists():
-                demo_content = '''import streamlit as st
+                demo_content = '''import sys
+from pathlib import Path
+
+import streamlit as st
 import pandas as pd
 import numpy as np
 
+# Shared Ollama client lives in the AI Environment src/ folder
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+from ai_ollama_client import stream_ollama, format_stream_stats
+
 st.title("AI Environment Demo")
 st.write("Welcome to your portable AI development environment!")
 
@@ -407,14 +496,38 @@ st.line_chart(data)
 
 st.subheader("Sample Data")
 st.dataframe(data.head())
+
+st.subheader("Ask a Local Model")
+model = st.text_input("Model", value="phi:2.7b")
+prompt = st.text_area("Prompt", value="Explain artificial intelligence in simple terms")
+if st.button("Generate"):
+    # Render tokens progressively as Ollama streams them
+    placeholder = st.empty()
+    stats = {}
+    text = ""
+    for token in stream_ollama(prompt, model=model, timeout=300, stats=stats):
+        text += token
+        placeholder.markdown(text + "▌")
+    placeholder.markdown(text)
+    if stats:
+        st.caption(format_stream_stats(stats))
 '''
                 demo_file.parent.mkdir(exist_ok=True)
-                with open(demo_file, 'w') as f:
+                with open(demo_file, 'w', encoding='utf-8') as f:
                     f.write(demo_content)
                     
             self.print_info("Launching Streamlit demo in background...")
             
-            process = subprocess.Popen(
+            # Tracked and restarted on failure while the menu runs
+            process = self.launch_supervised(
+                self.generate_process_id("streamlit"),
+                {
+                    'name': 'Streamlit Demo',
+                    'command': f'streamlit run {demo_file} --server.port=8501',
+                    'started_at': datetime.now().isoformat(),
+                    'type': 'web_service',
+                    'url': 'http://localhost:8501'
+                },
                 ['streamlit', 'run', str(demo_file), '--server.port=8501'],
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
@@ -422,18 +535,6 @@ st.dataframe(data.head())
                 creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
             )
             
-            # Track the process
-            process_id = self.generate_process_id("streamlit")
-            self.tracked_processes[process_id] = {
-                'pid': process.pid,
-                'name': 'Streamlit Demo',
-                'command': f'streamlit run {demo_file} --server.port=8501',
-                'started_at': datetime.now().isoformat(),
-                'type': 'web_service',
-                'url': 'http://localhost:8501'
-            }
-            
-            self.save_tracked_processes()
             self.print_success(f"Streamlit demo launched successfully (PID: {process.pid})")
             self.print_info("Access Streamlit demo at: http://localhost:8501")
             return True
@@ -442,6 +543,79 @@ st.dataframe(data.head())
             self.print_error(f"Failed to launch Streamlit demo: {e}")
             return False
             
+    def launch_tensorboard(self, log_dir=None):
+        """Launch TensorBoard in background"""
+        try:
+            self.print_info("Launching TensorBoard in background...")
+            
+            if log_dir is None:
+                log_dir = self.ai_env_path / "Projects" / "logs"
+            log_dir = Path(log_dir)
+            log_dir.mkdir(parents=True, exist_ok=True)
+            
+            # argv (no shell), tracked and restarted on failure while the menu runs
+            process = self.launch_supervised(
+                self.generate_process_id("tensorboard"),
+                {
+                    'name': 'TensorBoard',
+                    'command': f'tensorboard --logdir="{log_dir}" --port=6006',
+                    'started_at': datetime.now().isoformat(),
+                    'type': 'web_service',
+                    'url': 'http://localhost:6006',
+                    'work_dir': str(self.ai_env_path)
+                },
+                ['tensorboard', f'--logdir={log_dir}', '--port=6006'],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                stdin=subprocess.DEVNULL,
+                cwd=str(self.ai_env_path),
+                creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
+            )
+            
+            self.print_success(f"TensorBoard launched successfully (PID: {process.pid})")
+            return True
+            
+        except Exception as e:
+            self.print_error(f"Failed to launch TensorBoard: {e}")
+            return False
+            
+    def launch_mlflow_ui(self, store_dir=None):
+        """Launch MLflow UI in background"""
+        try:
+            self.print_info("Launching MLflow UI in background...")
+            
+            if store_dir is None:
+                store_dir = self.ai_env_path / "Projects" / "mlruns"
+            store_dir = Path(store_dir)
+            store_dir.mkdir(parents=True, exist_ok=True)
+            store_uri = store_dir.resolve().as_uri()
+            
+            # argv (no shell), tracked and restarted on failure while the menu runs
+            process = self.launch_supervised(
+                self.generate_process_id("mlflow_ui"),
+                {
+                    'name': 'MLflow UI',
+                    'command': f'mlflow ui --backend-store-uri "{store_uri}" --port=5000',
+                    'started_at': datetime.now().isoformat(),
+                    'type': 'web_service',
+                    'url': 'http://localhost:5000',
+                    'work_dir': str(self.ai_env_path)
+                },
+                ['mlflow', 'ui', '--backend-store-uri', store_uri, '--port=5000'],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                stdin=subprocess.DEVNULL,
+                cwd=str(self.ai_env_path),
+                creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
+            )
+            
+            self.print_success(f"MLflow UI launched successfully (PID: {process.pid})")
+            return True
+            
+        except Exception as e:
+            self.print_error(f"Failed to launch MLflow UI: {e}")
+            return False
+            
     def launch_custom_command(self, command, name, work_dir=None):
         """Launch custom command in background"""
         try:
@@ -461,13 +635,15 @@ st.dataframe(data.head())
             
             # Track the process
             process_id = self.generate_process_id(name.lower().replace(' ', '_'))
-            self.tracked_processes[process_id] = {
-                'pid': process.pid,
-                'name': name,
-                'command': command,
-                'started_at': datetime.now().isoformat(),
-                'type': 'custom'
-            }
+            with self._lock:
+                self.tracked_processes[process_id] = {
+                    'pid': process.pid,
+                    'name': name,
+                    'command': command,
+                    'started_at': datetime.now().isoformat(),
+                    'type': 'custom',
+                    'work_dir': str(work_dir)
+                }
             
             self.save_tracked_processes()
             self.print_success(f"{name} launched successfully (PID: {process.pid})")
@@ -477,6 +653,14 @@ st.dataframe(data.head())
             self.print_error(f"Failed to launch {name}: {e}")
             return False
             
+    def sample_processes(self):
+        """Sample status, CPU and memory of every tracked process and its children
+        
+        Returns:
+            dict: process_id -> sample dict (see ProcessSampler.sample)
+        """
+        return get_sampler().sample(self.tracked_processes)
+        
     def list_background_processes(self):
         """List all tracked background processes"""
         self.cleanup_dead_processes()
@@ -488,91 +672,124 @@ st.dataframe(data.head())
         print(f"\n{Fore.CYAN}🔄 Background Processes:{Style.RESET_ALL}")
         print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
         
+        samples = self.sample_processes()
         for process_id, process_info in self.tracked_processes.items():
-            try:
-                pid = process_info['pid']
-                proc = psutil.Process(pid)
-                
-                status = proc.status()
-                cpu_percent = proc.cpu_percent()
-                memory_mb = round(proc.memory_info().rss / 1024 / 1024, 1)
-                
-                print(f"\n{Fore.YELLOW}ID: {process_id}{Style.RESET_ALL}")
-                print(f"  Name: {process_info['name']}")
-                print(f"  PID: {pid}")
-                print(f"  Status: {status}")
-                print(f"  CPU: {cpu_percent}%")
-                print(f"  Memory: {memory_mb} MB")
-                print(f"  Started: {process_info['started_at']}")
-                print(f"  Command: {process_info['command']}")
-                
-                if 'url' in process_info:
-                    print(f"  URL: {process_info['url']}")
-                    
-            except psutil.NoSuchProcess:
+            sample = samples.get(process_id)
+            if not sample or not sample['alive']:
                 print(f"\n{Fore.RED}ID: {process_id} (DEAD){Style.RESET_ALL}")
                 print(f"  Name: {process_info['name']}")
                 print(f"  Status: Process no longer exists")
+                continue
+                
+            cpu = sample['cpu_percent_total']
+            print(f"\n{Fore.YELLOW}ID: {process_id}{Style.RESET_ALL}")
+            print(f"  Name: {process_info['name']}")
+            print(f"  PID: {sample['pid']}")
+            print(f"  Status: {sample['status']}")
+            print(f"  CPU: {cpu if cpu is not None else '--'}%")
+            print(f"  Memory: {round(sample['memory_rss_total'] / 1024 / 1024, 1)} MB")
+            if sample['children']:
+                names = sorted({child['name'] or str(child['pid']) for child in sample['children']})
+                print(f"  Children: {len(sample['children'])} ({', '.join(names)}) - included in CPU/Memory")
+            print(f"  Started: {process_info['started_at']}")
+            print(f"  Command: {process_info['command']}")
+            
+            if 'url' in process_info:
+                print(f"  URL: {process_info['url']}")
                 
+    def _stop_tracked(self, process_ids, timeout=5, kill_timeout=3):
+        """Stop tracked processes and all their children at once
+        
+        Wrappers (conda run, shell=True launches) are stopped together with
+        the servers they started; everything is signalled together and
+        waited on under a single deadline.
+        
+        Returns:
+            list: process ids that were stopped (and untracked)
+        """
+        if not PSUTIL_AVAILABLE:
+            self.print_error("psutil is required to stop background processes")
+            return []
+            
+        roots = {}
+        for process_id in process_ids:
+            # No restart for a service stopped on purpose (even one waiting to be restarted)
+            supervised = self.supervised.pop(process_id, None)
+            if supervised:
+                supervised.detach()
+            process_info = self.tracked_processes[process_id]
+            pid = process_info['pid']
+            # Never signal an unrelated process that inherited a recycled PID
+            if is_same_process(pid, process_info.get('create_time')):
+                try:
+                    roots[process_id] = psutil.Process(pid)
+                    self.print_info(f"Stopping {process_info['name']} (PID: {pid})...")
+                    continue
+                except psutil.NoSuchProcess:
+                    pass
+            self.print_warning(f"Process {process_info['name']} was already dead")
+            
+        killed = set()
+        
+        def on_kill(procs):
+            killed.update(proc.pid for proc in procs)
+            self.print_warning(f"Graceful shutdown failed for {len(procs)} process(es), force killing...")
+            
+        gone, alive = stop_process_trees(list(roots.values()), timeout=timeout, kill_timeout=kill_timeout,
+                                         on_kill=on_kill)
+        alive_pids = {proc.pid for proc in alive}
+        
+        stopped = []
+        for process_id in process_ids:
+            process_info = self.tracked_processes[process_id]
+            proc = roots.get(process_id)
+            if proc is not None:
+                if proc.pid in alive_pids:
+                    self.print_error(f"Failed to stop {process_info['name']} (PID: {proc.pid})")
+                    continue
+                state = "force killed" if proc.pid in killed else "stopped gracefully"
+                self.print_success(f"{process_info['name']} {state}")
+            # Remove from tracking
+            with self._lock:
+                del self.tracked_processes[process_id]
+            stopped.append(process_id)
+            
+        stray = alive_pids - {proc.pid for proc in roots.values()}
+        if stray:
+            self.print_warning(f"Could not stop child process(es): {', '.join(map(str, sorted(stray)))}")
+        self.save_tracked_processes()
+        return stopped
+        
     def stop_process(self, process_id):
-        """Stop a specific background process"""
+        """Stop a specific background process (and its child processes)"""
         if process_id not in self.tracked_processes:
             self.print_error(f"Process ID '{process_id}' not found")
             return False
             
-        process_info = self.tracked_processes[process_id]
-        
         try:
-            pid = process_info['pid']
-            proc = psutil.Process(pid)
-            
-            self.print_info(f"Stopping {process_info['name']} (PID: {pid})...")
-            
-            # Try graceful termination first
-            proc.terminate()
-            
-            # Wait for graceful shutdown
-            try:
-                proc.wait(timeout=5)
-                self.print_success(f"{process_info['name']} stopped gracefully")
-            except psutil.TimeoutExpired:
-                # Force kill if graceful shutdown fails
-                self.print_warning("Graceful shutdown failed, force killing...")
-                proc.kill()
-                proc.wait(timeout=3)
-                self.print_success(f"{process_info['name']} force killed")
-                
-            # Remove from tracking
-            del self.tracked_processes[process_id]
-            self.save_tracked_processes()
-            return True
-            
-        except psutil.NoSuchProcess:
-            self.print_warning(f"Process {process_info['name']} was already dead")
-            del self.tracked_processes[process_id]
-            self.save_tracked_processes()
-            return True
+            return bool(self._stop_tracked([process_id]))
         except Exception as e:
-            self.print_error(f"Failed to stop {process_info['name']}: {e}")
+            self.print_error(f"Failed to stop {self.tracked_processes[process_id]['name']}: {e}")
             return False
             
     def stop_all_processes(self):
-        """Stop all tracked background processes"""
+        """Stop all tracked background processes
+        
+        All process trees are stopped in parallel, so this takes one
+        timeout window in total rather than one per process.
+        """
         if not self.tracked_processes:
             self.print_info("No background processes to stop")
             return True
             
         self.print_info("Stopping all background processes...")
         
-        success_count = 0
         total_count = len(self.tracked_processes)
-        
-        # Create a copy of the keys to avoid dictionary size change during iteration
-        process_ids = list(self.tracked_processes.keys())
-        
-        for process_id in process_ids:
-            if self.stop_process(process_id):
-                success_count += 1
+        try:
+            success_count = len(self._stop_tracked(list(self.tracked_processes)))
+        except Exception as e:
+            self.print_error(f"Failed to stop background processes: {e}")
+            return False
                 
         self.print_success(f"Stopped {success_count}/{total_count} processes")
         return success_count == total_count
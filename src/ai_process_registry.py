@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+AI Process Registry
+Crash-safe record of background processes launched from the menu (SQLite)
+
+Every change is a single SQLite transaction in WAL mode, so several
+managers - in this process or in another console - can track and untrack
+processes at the same time without overwriting each other, and a crash
+mid-write never leaves a truncated file behind. Each entry stores the
+process create_time next to its PID; a PID that now belongs to a different
+process (PID reuse) counts as dead.
+
+Version: 3.0.28
+Author: AI Environment Team
+Date: 2026-10-17
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Same process if the start times agree to within this many seconds
+CREATE_TIME_TOLERANCE = 1.0
+# Legacy entries: the process must have started before it was tracked (plus clock slack)
+LEGACY_START_SLACK_SECONDS = 60
+
+
+def get_default_registry_path():
+    """Registry database location inside the AI_Environment tree"""
+    ai_env_path = Path(os.environ.get('AI_ENV_PATH', Path(__file__).resolve().parent.parent))
+    return ai_env_path / "cache" / "process_registry.sqlite"
+
+
+def get_create_time(pid):
+    """Return the start time of a running PID, or None if unknown"""
+    if not PSUTIL_AVAILABLE or not pid:
+        return None
+    try:
+        return psutil.Process(pid).create_time()
+    except psutil.Error:
+        return None
+
+
+def is_same_process(pid, create_time):
+    """True if pid is running and is still the process that was tracked
+
+    Without psutil, or for entries recorded without a create_time, a
+    running PID is all that can be checked.
+    """
+    if not PSUTIL_AVAILABLE:
+        return True
+    try:
+        proc = psutil.Process(pid)
+        if create_time is None:
+            return True
+        return abs(proc.create_time() - create_time) < CREATE_TIME_TOLERANCE
+    except psutil.AccessDenied:
+        return True
+    except (psutil.Error, TypeError, ValueError):
+        return False
+
+
+def _parse_started_at(value):
+    """Timestamp of a legacy 'started_at' string, or None"""
+    for fmt in ("%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S"):
+        try:
+            return datetime.strptime(value, fmt).timestamp()
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+class ProcessRegistry:
+    """SQLite-backed registry of tracked background processes"""
+
+    def __init__(self, db_path=None):
+        """Initialize process registry
+
+        Args:
+            db_path (Path, optional): SQLite file (default: <AI_Environment>/cache/process_registry.sqlite)
+        """
+        self.db_path = Path(db_path) if db_path else get_default_registry_path()
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            # Autocommit mode; every change goes through _transaction()
+            self._conn = sqlite3.connect(str(self.db_path), timeout=10, check_same_thread=False,
+                                         isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS processes ("
+                " process_id TEXT PRIMARY KEY, pid INTEGER NOT NULL, create_time REAL,"
+                " info TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+        return self._conn
+
+    @contextmanager
+    def _transaction(self):
+        """Serialize writers across threads (lock) and processes (BEGIN IMMEDIATE)"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _upsert(self, conn, process_id, info):
+        info = dict(info)
+        if info.get("create_time") is None:
+            info["create_time"] = get_create_time(info.get("pid"))
+        conn.execute(
+            "INSERT OR REPLACE INTO processes(process_id, pid, create_time, info, updated_at) VALUES(?, ?, ?, ?, ?)",
+            (process_id, info["pid"], info["create_time"], json.dumps(info), time.time()),
+        )
+        return info
+
+    def register(self, process_id, info):
+        """Add or replace an entry; the PID's create_time is recorded with it
+
+        Returns:
+            dict: The stored entry
+        """
+        with self._transaction() as conn:
+            return self._upsert(conn, process_id, info)
+
+    def unregister(self, process_id):
+        """Remove an entry
+
+        Returns:
+            bool: True if the entry existed
+        """
+        with self._transaction() as conn:
+            return conn.execute("DELETE FROM processes WHERE process_id = ?", (process_id,)).rowcount > 0
+
+    def get(self, process_id):
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT info FROM processes WHERE process_id = ?", (process_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def entries(self):
+        """Return every entry as {process_id: info}, oldest first"""
+        with self._lock:
+            rows = self._connect().execute("SELECT process_id, info FROM processes ORDER BY rowid").fetchall()
+        return {process_id: json.loads(info) for process_id, info in rows}
+
+    def sync(self, entries, known=None):
+        """Apply a caller's changes to the registry in one transaction
+
+        Only the caller's own changes are written: entries that are new or
+        differ from `known` (the caller's last loaded/saved view) are
+        upserted, and ids in `known` that are no longer in `entries` are
+        removed. Entries other managers added, changed or removed since the
+        caller loaded are left alone, so their deletes are not undone.
+
+        Args:
+            entries (dict): process_id -> info as the caller now has it
+            known (dict, optional): process_id -> info as the caller last loaded/saved it
+
+        Returns:
+            dict: The upserted entries (with create_time filled in)
+        """
+        known = known or {}
+        stored = {}
+        with self._transaction() as conn:
+            for process_id in set(known) - set(entries):
+                conn.execute("DELETE FROM processes WHERE process_id = ?", (process_id,))
+            for process_id, info in entries.items():
+                if known.get(process_id) != info:
+                    stored[process_id] = self._upsert(conn, process_id, info)
+        return stored
+
+    def prune_dead(self, check_alive=None):
+        """Remove entries whose process exited or whose PID was reused
+
+        Args:
+            check_alive (callable, optional): Batch check taking {process_id: {'pid',
+                'create_time'}} and returning {process_id: bool} (e.g. ProcessSampler.live);
+                defaults to is_same_process per entry
+
+        Returns:
+            list: Removed process ids
+        """
+        with self._transaction() as conn:
+            rows = conn.execute("SELECT process_id, pid, create_time FROM processes").fetchall()
+            if check_alive:
+                alive = check_alive({process_id: {"pid": pid, "create_time": create_time}
+                                     for process_id, pid, create_time in rows})
+            else:
+                alive = {process_id: is_same_process(pid, create_time) for process_id, pid, create_time in rows}
+            dead = [process_id for process_id, _, _ in rows if not alive.get(process_id)]
+            conn.executemany("DELETE FROM processes WHERE process_id = ?", [(process_id,) for process_id in dead])
+        return dead
+
+    def migrate_json(self, json_path):
+        """Import a legacy background_processes.json and rename it to *.migrated
+
+        Entries are imported only if their PID is still running and started
+        no later than the entry's started_at (otherwise the PID was reused).
+        A file that cannot be read is left in place and retried next time.
+
+        Returns:
+            int: Number of entries imported
+        """
+        json_path = Path(json_path)
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            # Leave the file in place so its entries are not lost
+            return 0
+
+        imported = 0
+        if isinstance(legacy, dict):
+            with self._transaction() as conn:
+                for process_id, info in legacy.items():
+                    pid = info.get("pid") if isinstance(info, dict) else None
+                    create_time = get_create_time(pid)
+                    if create_time is None:
+                        continue
+                    tracked_at = _parse_started_at(info.get("started_at"))
+                    if tracked_at is not None and create_time > tracked_at + LEGACY_START_SLACK_SECONDS:
+                        continue
+                    conn.execute(
+                        "INSERT OR IGNORE INTO processes(process_id, pid, create_time, info, updated_at)"
+                        " VALUES(?, ?, ?, ?, ?)",
+                        (process_id, pid, create_time, json.dumps(dict(info, create_time=create_time)), time.time()),
+                    )
+                    imported += 1
+        # Renamed only after the import committed
+        try:
+            os.replace(json_path, json_path.with_name(json_path.name + ".migrated"))
+        except OSError:
+            pass
+        return imported
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+AI Process Sampler
+Batched liveness and resource sampling for tracked background processes
+
+One psutil.process_iter pass per sample gives every PID with its parent and
+start time, which answers liveness (including PID reuse) for all tracked
+entries and finds their descendants - the real server behind a `conda run`
+or shell wrapper. Metrics for the tracked trees are then read inside
+oneshot() blocks. The sampler keeps its psutil.Process objects between
+samples, so cpu_percent reports usage since the previous sample instead of
+the 0.0 a fresh object always returns.
+
+Version: 3.0.28
+Author: AI Environment Team
+Date: 2026-10-17
+"""
+
+import threading
+import time
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+from ai_process_registry import CREATE_TIME_TOLERANCE
+
+# Short priming interval used when a process has no cpu_percent baseline yet
+DEFAULT_PRIME_INTERVAL = 0.2
+
+
+class ProcessSampler:
+    """Samples tracked processes and their children in one pass"""
+
+    def __init__(self):
+        self._procs = {}          # (pid, create_time) -> psutil.Process with cpu baseline
+        self._lock = threading.Lock()
+
+    def process_table(self):
+        """Return {pid: (ppid, create_time, name)} for every process, in one pass"""
+        if not PSUTIL_AVAILABLE:
+            return {}
+        table = {}
+        for proc in psutil.process_iter(['ppid', 'create_time', 'name']):
+            table[proc.pid] = (proc.info['ppid'], proc.info['create_time'], proc.info['name'] or "")
+        return table
+
+    @staticmethod
+    def matches(table, pid, create_time):
+        """True if pid is in the table and is the process that was tracked
+
+        A start time that is unknown on either side (untracked, or unreadable
+        for this user) cannot disprove it, so only the PID is checked then.
+        """
+        if pid not in table:
+            return False
+        current = table[pid][1]
+        if create_time is None or current is None:
+            return True
+        return abs(current - create_time) < CREATE_TIME_TOLERANCE
+
+    @staticmethod
+    def descendants(table, pid):
+        """All descendant PIDs of pid according to the table"""
+        children = {}
+        for child, (ppid, *_) in table.items():
+            children.setdefault(ppid, []).append(child)
+        found = []
+        stack = list(children.get(pid, []))
+        while stack:
+            child = stack.pop()
+            if child in found or child == pid:
+                continue
+            found.append(child)
+            stack.extend(children.get(child, []))
+        return found
+
+    def _process(self, pid, create_time):
+        """Cached psutil.Process for (pid, create_time); True if newly created"""
+        key = (pid, create_time)
+        proc = self._procs.get(key)
+        if proc is not None:
+            return proc, False
+        proc = psutil.Process(pid)
+        self._procs[key] = proc
+        return proc, True
+
+    def _read(self, pid, create_time):
+        """Metrics for one process, or None if it vanished
+
+        'unprimed' is True for a fresh object whose cpu has no baseline yet;
+        a process we may not read has no cpu value but is never unprimed, so
+        it does not trigger a priming pause on every sample.
+        """
+        try:
+            proc, fresh = self._process(pid, create_time)
+            with proc.oneshot():
+                cpu = proc.cpu_percent(None)
+                return {
+                    "pid": pid,
+                    "name": proc.name(),
+                    "status": proc.status(),
+                    # A fresh object has no baseline yet - its 0.0 means "unknown"
+                    "cpu_percent": None if fresh else cpu,
+                    "memory_rss": proc.memory_info().rss,
+                    "num_threads": proc.num_threads(),
+                    "unprimed": fresh,
+                }
+        except psutil.AccessDenied:
+            return {"pid": pid, "name": None, "status": "access denied", "cpu_percent": None,
+                    "memory_rss": 0, "num_threads": 0, "unprimed": False}
+        except psutil.Error:
+            return None
+
+    def sample(self, entries, include_children=True, prime_interval=DEFAULT_PRIME_INTERVAL, table=None):
+        """Sample tracked processes
+
+        Args:
+            entries (dict): process_id -> info with 'pid' (and optional 'create_time', 'name')
+            include_children (bool): Include descendant processes in totals
+            prime_interval (float): If some process has no cpu baseline yet, take one,
+                wait this long once, and sample again (0 to skip)
+            table (dict, optional): A process_table() the caller already took
+
+        Returns:
+            dict: process_id -> {process_id, name, pid, alive, status, cpu_percent,
+                memory_rss, num_threads, children, cpu_percent_total, memory_rss_total,
+                sampled_at}; cpu values are None until a baseline exists (or when the
+                process may not be read), and totals sum the values that exist
+        """
+        with self._lock:
+            result, needs_baseline = self._sample(entries, include_children, table)
+            if prime_interval and needs_baseline:
+                time.sleep(prime_interval)
+                result, _ = self._sample(entries, include_children)
+            return result
+
+    def _sample(self, entries, include_children, table=None):
+        table = table if table is not None else self.process_table()
+        sampled_at = time.time()
+        result = {}
+        seen = set()
+        needs_baseline = False
+        for process_id, info in entries.items():
+            pid = info.get('pid')
+            create_time = info.get('create_time')
+            sample = {"process_id": process_id, "name": info.get('name'), "pid": pid, "alive": False,
+                      "status": "dead", "cpu_percent": None, "memory_rss": 0, "num_threads": 0,
+                      "children": [], "cpu_percent_total": None, "memory_rss_total": 0,
+                      "sampled_at": sampled_at}
+            result[process_id] = sample
+            if not PSUTIL_AVAILABLE or not self.matches(table, pid, create_time):
+                continue
+
+            own = self._read(pid, table[pid][1])
+            if own is None:
+                continue
+            seen.add((pid, table[pid][1]))
+            sample.update({key: own[key] for key in ("status", "cpu_percent", "memory_rss", "num_threads")})
+            sample["alive"] = True
+
+            unprimed = own.pop("unprimed")
+            cpu_values = [own["cpu_percent"]]
+            memory_total = own["memory_rss"]
+            if include_children:
+                for child_pid in self.descendants(table, pid):
+                    child = self._read(child_pid, table[child_pid][1])
+                    if child is None:
+                        continue
+                    seen.add((child_pid, table[child_pid][1]))
+                    unprimed = child.pop("unprimed") or unprimed
+                    sample["children"].append(child)
+                    cpu_values.append(child["cpu_percent"])
+                    memory_total += child["memory_rss"]
+            sample["memory_rss_total"] = memory_total
+            known = [value for value in cpu_values if value is not None]
+            if known:
+                sample["cpu_percent_total"] = round(sum(known), 1)
+            needs_baseline = needs_baseline or unprimed
+
+        # Drop baselines of processes that are gone or no longer sampled
+        for key in list(self._procs):
+            if key not in seen:
+                del self._procs[key]
+        return result, needs_baseline
+
+    def live(self, entries):
+        """Liveness only (no metrics) for tracked entries in one pass
+
+        Returns:
+            dict: process_id -> bool
+        """
+        if not PSUTIL_AVAILABLE:
+            return {process_id: True for process_id in entries}
+        table = self.process_table()
+        return {process_id: self.matches(table, info.get('pid'), info.get('create_time'))
+                for process_id, info in entries.items()}
+
+
+_default_sampler = None
+_default_sampler_lock = threading.Lock()
+
+
+def get_sampler():
+    """Return the process-wide sampler (keeps cpu baselines across calls)"""
+    global _default_sampler
+    with _default_sampler_lock:
+        if _default_sampler is None:
+            _default_sampler = ProcessSampler()
+        return _default_sampler
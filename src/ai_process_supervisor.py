@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+AI Process Supervisor
+Event-driven waits for process start/stop and restart policies
+
+Instead of sleeping a fixed number of seconds and checking afterwards,
+callers wait for the actual condition: a TCP port accepting connections
+(non-blocking connect + select), processes exiting (psutil.wait_procs), or
+a supervised child dying (a watcher thread blocked in Popen.wait).
+Processes stopped on purpose through stop_processes() are released from
+supervision first, so their restart policy does not bring them back.
+
+Version: 3.0.28
+Author: AI Environment Team
+Date: 2026-10-17
+"""
+
+import errno
+import logging
+import os
+import select
+import socket
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+RESTART_POLICIES = ("no", "on-failure", "always")
+SERVICE_LOGGER = "ai_environment.services"
+
+# SupervisedProcess objects whose watcher is running in this interpreter
+_supervised = set()
+_supervised_lock = threading.Lock()
+
+
+def get_default_log_path():
+    """Service log inside the AI_Environment tree"""
+    ai_env_path = Path(os.environ.get('AI_ENV_PATH', Path(__file__).resolve().parent.parent))
+    return ai_env_path / "cache" / "logs" / "services.log"
+
+
+def get_service_logger(log_path=None):
+    """Logger for events raised by background threads (restarts, policy actions)
+
+    Writes to <AI_Environment>/cache/logs/services.log rather than the
+    console, so watcher threads never print into the interactive menu.
+    """
+    logger = logging.getLogger(SERVICE_LOGGER)
+    if not logger.handlers:
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        try:
+            log_path = Path(log_path) if log_path else get_default_log_path()
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            handler = logging.FileHandler(log_path, encoding='utf-8')
+            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        except OSError:
+            handler = logging.NullHandler()
+        logger.addHandler(handler)
+    return logger
+
+
+def find_supervised(pid):
+    """The SupervisedProcess currently running pid in this interpreter, or None"""
+    with _supervised_lock:
+        for supervised in _supervised:
+            if supervised.pid == pid:
+                return supervised
+    return None
+
+
+def release_supervision(pids):
+    """Stop restarting supervised children that are being stopped on purpose
+
+    Args:
+        pids (iterable): PIDs about to be terminated
+    """
+    pids = set(pids)
+    with _supervised_lock:
+        released = [supervised for supervised in _supervised if supervised.pid in pids]
+    for supervised in released:
+        supervised.detach()
+
+
+def _is_alive(process):
+    """True while a Popen / psutil.Process has not exited"""
+    if process is None:
+        return True
+    if isinstance(process, subprocess.Popen):
+        return process.poll() is None
+    try:
+        return process.is_running() and process.status() != psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return False
+
+
+def try_connect(port, host="127.0.0.1", timeout=0.5):
+    """Attempt one non-blocking TCP connect
+
+    Returns:
+        bool: True if something accepted the connection within timeout
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setblocking(False)
+    try:
+        result = sock.connect_ex((host, port))
+        if result == 0:
+            return True
+        if result not in (errno.EINPROGRESS, errno.EWOULDBLOCK, getattr(errno, "WSAEWOULDBLOCK", -1)):
+            return False  # Refused right away - nothing is listening
+        # Windows reports a failed connect through the exception set
+        _, writable, failed = select.select([], [sock], [sock], timeout)
+        if not writable or failed:
+            return False
+        return sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def wait_for_port(port, host="127.0.0.1", timeout=30, process=None, initial_delay=0.05, max_delay=0.5):
+    """Wait until a port accepts connections
+
+    Args:
+        port (int): TCP port
+        host (str): Host to connect to
+        timeout (float): Give up after this many seconds
+        process (Popen | psutil.Process, optional): Stop waiting as soon as it exits
+        initial_delay (float): First pause between refused attempts (doubles up to max_delay)
+
+    Returns:
+        bool: True the moment the port is open; False on timeout or if the process died
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial_delay
+    while True:
+        remaining = deadline - time.monotonic()
+        if try_connect(port, host, timeout=max(min(remaining, 0.5), 0.01)):
+            return True
+        if not _is_alive(process):
+            return False
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
+
+
+def wait_for_port_closed(port, host="127.0.0.1", timeout=10, interval=0.1):
+    """Wait until nothing accepts connections on a port
+
+    Returns:
+        bool: True once the port is closed, False on timeout
+    """
+    deadline = time.monotonic() + timeout
+    while try_connect(port, host, timeout=0.2):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+    return True
+
+
+def wait_for_exit(processes, timeout=10):
+    """Block until the given psutil processes exit (or timeout)
+
+    Returns:
+        tuple: (gone, alive) lists of psutil.Process
+    """
+    processes = [proc for proc in processes if proc is not None]
+    if not processes or not PSUTIL_AVAILABLE:
+        return [], processes
+    deadline = time.monotonic() + timeout
+    gone, alive = [], processes
+    while True:
+        exited, alive = psutil.wait_procs(alive, timeout=max(min(deadline - time.monotonic(), 0.25), 0))
+        # Orphaned zombies are dead, just not reaped yet
+        zombies = [proc for proc in alive if not _is_alive(proc)]
+        gone += exited + zombies
+        alive = [proc for proc in alive if proc not in zombies]
+        if not alive or time.monotonic() >= deadline:
+            return gone, alive
+
+
+def stop_processes(processes, timeout=10, kill_timeout=3, on_kill=None):
+    """Terminate processes, then kill whatever is still alive after timeout
+
+    Returns immediately once every process has exited.
+
+    Args:
+        processes (list): psutil.Process objects
+        timeout (float): Grace period after terminate()
+        kill_timeout (float): Wait after kill()
+        on_kill (callable, optional): Called with the list about to be killed
+
+    Returns:
+        tuple: (gone, alive) - alive is non-empty only if even kill() failed
+    """
+    # A deliberate stop must not look like a crash to a restart policy
+    release_supervision(proc.pid for proc in processes)
+    return _terminate(processes, timeout, kill_timeout, on_kill)
+
+
+def _terminate(processes, timeout, kill_timeout, on_kill=None):
+    """terminate(), wait, kill() - without touching supervision"""
+    for proc in processes:
+        try:
+            proc.terminate()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    gone, alive = wait_for_exit(processes, timeout)
+    if alive:
+        if on_kill:
+            on_kill(alive)
+        for proc in alive:
+            try:
+                proc.kill()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        killed, alive = wait_for_exit(alive, kill_timeout)
+        gone += killed
+    return gone, alive
+
+
+def collect_tree(processes):
+    """Expand processes with all their descendants
+
+    Children are collected before anything is signalled: once a wrapper
+    (conda run, a shell) exits, its children are re-parented and can no
+    longer be found through it.
+
+    Returns:
+        list: Unique psutil.Process objects, descendants included
+    """
+    tree = {}
+    for proc in processes:
+        if proc is None:
+            continue
+        try:
+            members = [proc] + proc.children(recursive=True)
+        except psutil.NoSuchProcess:
+            continue
+        except psutil.AccessDenied:
+            members = [proc]
+        for member in members:
+            tree.setdefault(member.pid, member)
+    return list(tree.values())
+
+
+def stop_process_trees(processes, timeout=10, kill_timeout=3, on_kill=None):
+    """Stop processes together with their descendants under one deadline
+
+    Every process in every tree is signalled at once and all of them are
+    waited on in parallel, so stopping a whole stack takes one timeout
+    window in total rather than one per process.
+
+    Returns:
+        tuple: (gone, alive) lists of psutil.Process
+    """
+    if not PSUTIL_AVAILABLE:
+        return [], list(processes)
+    return stop_processes(collect_tree(processes), timeout=timeout, kill_timeout=kill_timeout, on_kill=on_kill)
+
+
+class SupervisedProcess:
+    """A child process with a restart policy
+
+    A watcher thread blocks in Popen.wait(), so an exit is noticed the
+    instant it happens. Restarts back off exponentially (initial_backoff,
+    doubling up to max_backoff) and the counter resets once the child has
+    stayed up for stable_after seconds.
+    restart_now() replaces a running child on demand (e.g. over its memory
+    ceiling) with the same command.
+    """
+
+    def __init__(self, name, command, restart="on-failure", max_restarts=5, initial_backoff=1.0,
+                 max_backoff=30.0, stable_after=60.0, ready_port=None, ready_timeout=30, on_event=None,
+                 **popen_kwargs):
+        """Initialize supervised process
+
+        Args:
+            name (str): Display name
+            command (list | str): Command passed to subprocess.Popen
+            restart (str): 'no', 'on-failure' (non-zero exit) or 'always'
+            max_restarts (int): Give up after this many consecutive restarts
+            ready_port (int, optional): Port that signals the child is ready
+            ready_timeout (float): Seconds to wait for ready_port
+            on_event (callable, optional): on_event(name, event, detail) for
+                'started', 'exited', 'restarting', 'gave_up'
+            **popen_kwargs: Passed through to subprocess.Popen
+        """
+        if restart not in RESTART_POLICIES:
+            raise ValueError(f"restart must be one of {RESTART_POLICIES}")
+        self.name = name
+        self.command = command
+        self.restart = restart
+        self.max_restarts = max_restarts
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.stable_after = stable_after
+        self.ready_port = ready_port
+        self.ready_timeout = ready_timeout
+        self.on_event = on_event
+        self.popen_kwargs = popen_kwargs
+        self.process = None
+        self.restarts = 0
+        self.spawns = 0
+        self.started_at = None
+        self._stopping = threading.Event()
+        self._restart_requested = threading.Event()
+        self._watcher = None
+
+    @property
+    def pid(self):
+        return self.process.pid if self.process else None
+
+    def _emit(self, event, detail=None):
+        if self.on_event:
+            self.on_event(self.name, event, detail)
+
+    def _spawn(self):
+        self.process = subprocess.Popen(self.command, **self.popen_kwargs)
+        self.started_at = time.monotonic()
+        self.spawns += 1
+        self._emit("started", self.process.pid)
+
+    def start(self):
+        """Start the child and its watcher; wait for ready_port if given
+
+        Returns:
+            bool: True if the child is running (and ready)
+        """
+        self._stopping.clear()
+        self._spawn()
+        with _supervised_lock:
+            _supervised.add(self)
+        self._watcher = threading.Thread(target=self._watch, name=f"supervise-{self.name}", daemon=True)
+        self._watcher.start()
+        if self.ready_port:
+            return wait_for_port(self.ready_port, timeout=self.ready_timeout, process=self.process)
+        return self.process.poll() is None
+
+    def _should_restart(self, returncode):
+        if self.restart == "always":
+            return True
+        return self.restart == "on-failure" and returncode != 0
+
+    def _watch(self):
+        try:
+            self._supervise()
+        finally:
+            with _supervised_lock:
+                _supervised.discard(self)
+
+    def _supervise(self):
+        while True:
+            returncode = self.process.wait()
+            if self._stopping.is_set():
+                return
+            self._emit("exited", returncode)
+            if self._restart_requested.is_set():
+                # restart_now() asked for it: start again at once, outside the backoff count
+                self._restart_requested.clear()
+                try:
+                    self._spawn()
+                except OSError as e:
+                    self._emit("gave_up", str(e))
+                    return
+                continue
+            if time.monotonic() - self.started_at >= self.stable_after:
+                self.restarts = 0
+            if not self._should_restart(returncode):
+                return
+            if self.restarts >= self.max_restarts:
+                self._emit("gave_up", self.restarts)
+                return
+            delay = min(self.initial_backoff * (2 ** self.restarts), self.max_backoff)
+            self.restarts += 1
+            self._emit("restarting", delay)
+            if self._stopping.wait(delay):
+                return
+            try:
+                self._spawn()
+            except OSError as e:
+                self._emit("gave_up", str(e))
+                return
+
+    def restart_now(self, timeout=10, kill_timeout=3):
+        """Stop the child with all its children and start the same command again
+
+        The watcher starts the new child as soon as the old one has exited
+        (same command, same Popen arguments); on_event gets 'started' with
+        the new PID.
+
+        Returns:
+            bool: True if the old process tree exited
+        """
+        if not PSUTIL_AVAILABLE or self._stopping.is_set() or not self.is_running():
+            return False
+        try:
+            tree = collect_tree([psutil.Process(self.process.pid)])
+        except psutil.Error:
+            return False
+        self._restart_requested.set()
+        _, alive = _terminate(tree, timeout, kill_timeout)
+        if alive:
+            self._restart_requested.clear()
+            return False
+        return True
+
+    def detach(self):
+        """Stop supervising without touching the child (no further restarts)"""
+        self._stopping.set()
+
+    def stop(self, timeout=10, kill_timeout=3):
+        """Stop the child without triggering a restart
+
+        Returns:
+            bool: True once the child has exited
+        """
+        self._stopping.set()
+        if self.process is None or self.process.poll() is not None:
+            return True
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            try:
+                self.process.wait(timeout=kill_timeout)
+            except subprocess.TimeoutExpired:
+                return False
+        return True
+
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
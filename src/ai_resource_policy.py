@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+AI Resource Policy
+Priority, CPU affinity and memory ceilings for launched services
+
+Each tracked process is matched to a service policy by keywords in its
+name or command. The policy's priority and CPU affinity are applied when
+the process is tracked and re-applied by the enforcer loop to child
+processes that appear later (conda run -> jupyter, Ollama model runners).
+The loop also compares each service's memory (children included) with
+its soft ceiling and either warns or restarts the service (only services
+supervised in this session can be restarted). The loop reads
+a snapshot of the registry (it never writes it back) and reports to
+cache/logs/services.log instead of the console it shares with the menu.
+
+Priority names map to Windows priority classes or POSIX nice values:
+idle, below_normal, normal, above_normal, high.
+
+Configuration: config/service_policies.json
+
+Version: 3.0.28
+Author: AI Environment Team
+Date: 2026-10-17
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+from ai_process_sampler import get_sampler
+from ai_process_supervisor import find_supervised, get_service_logger
+
+DEFAULT_CHECK_INTERVAL = 5
+
+POSIX_NICE = {"idle": 19, "below_normal": 10, "normal": 0, "above_normal": -5, "high": -10}
+WINDOWS_PRIORITY = {
+    "idle": "IDLE_PRIORITY_CLASS",
+    "below_normal": "BELOW_NORMAL_PRIORITY_CLASS",
+    "normal": "NORMAL_PRIORITY_CLASS",
+    "above_normal": "ABOVE_NORMAL_PRIORITY_CLASS",
+    "high": "HIGH_PRIORITY_CLASS",
+}
+
+
+def get_default_config_path():
+    """Service policy configuration inside the AI_Environment tree"""
+    ai_env_path = Path(os.environ.get('AI_ENV_PATH', Path(__file__).resolve().parent.parent))
+    return ai_env_path / "config" / "service_policies.json"
+
+
+def load_policies(config_path=None):
+    """Load service policies (empty if the file is missing or invalid)"""
+    config = {"check_interval_seconds": DEFAULT_CHECK_INTERVAL, "services": {}}
+    config_path = Path(config_path) if config_path else get_default_config_path()
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config.update(json.load(f))
+    except (OSError, json.JSONDecodeError):
+        pass
+    return config
+
+
+def match_policy(policies, process_info):
+    """Find the policy for a tracked process
+
+    Returns:
+        tuple: (service name, policy dict) or (None, None)
+    """
+    text = f"{process_info.get('name', '')} {process_info.get('command', '')}".lower()
+    for service, policy in policies.get("services", {}).items():
+        if any(keyword.lower() in text for keyword in policy.get("match", [service])):
+            return service, policy
+    return None, None
+
+
+def priority_value(name):
+    """Platform priority value for a priority name, or None if unknown"""
+    if os.name == "nt":
+        return getattr(psutil, WINDOWS_PRIORITY.get(name, ""), None)
+    return POSIX_NICE.get(name)
+
+
+def affinity_for(policy):
+    """CPU list from 'cpu_affinity' or 'reserve_cpus', or None to leave as is"""
+    if policy.get("cpu_affinity"):
+        return list(policy["cpu_affinity"])
+    reserve = policy.get("reserve_cpus") or 0
+    cpu_count = psutil.cpu_count() or 1
+    if reserve and cpu_count > reserve:
+        # Keep the last cores free for the editor, notebook kernels and the menu
+        return list(range(cpu_count - reserve))
+    return None
+
+
+def apply_to_process(proc, policy):
+    """Apply priority and affinity to one process
+
+    Returns:
+        list: Problems encountered (empty if everything was applied)
+    """
+    problems = []
+    priority = priority_value(policy.get("priority"))
+    if priority is not None:
+        try:
+            proc.nice(priority)
+        except psutil.AccessDenied:
+            problems.append(f"priority '{policy['priority']}' needs elevated rights")
+        except psutil.Error as e:
+            problems.append(str(e))
+    cpus = affinity_for(policy)
+    if cpus is not None:
+        try:
+            proc.cpu_affinity(cpus)
+        except AttributeError:
+            pass   # Not supported on this platform (macOS)
+        except (psutil.Error, ValueError) as e:
+            problems.append(f"affinity: {e}")
+    return problems
+
+
+class ResourcePolicyEnforcer:
+    """Applies service policies and watches memory ceilings"""
+
+    def __init__(self, process_manager, policies=None, interval=None):
+        """Initialize policy enforcer
+
+        Args:
+            process_manager (BackgroundProcessManager): Source of tracked processes
+            policies (dict, optional): Settings (default: config/service_policies.json)
+            interval (float, optional): Seconds between checks
+        """
+        self.process_manager = process_manager
+        self.policies = policies or load_policies()
+        self.interval = interval or self.policies.get("check_interval_seconds", DEFAULT_CHECK_INTERVAL)
+        self.enabled = PSUTIL_AVAILABLE and bool(self.policies.get("services"))
+        self._applied = set()          # (pid, create_time) that already have their policy
+        self._over_limit = set()       # process ids currently warned about
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.logger = get_service_logger()
+
+    def apply(self, process_info, warn=None):
+        """Apply the matching policy to a process and its current children
+
+        Args:
+            process_info (dict): Tracked entry ('pid', 'name', 'command')
+            warn (callable, optional): Reports problems (default: the manager's print_warning)
+
+        Returns:
+            str: Service name of the matched policy, or None
+        """
+        warn = warn or self.process_manager.print_warning
+        if not self.enabled:
+            return None
+        service, policy = match_policy(self.policies, process_info)
+        if policy is None:
+            return None
+        try:
+            root = psutil.Process(process_info['pid'])
+            members = [root] + root.children(recursive=True)
+        except (psutil.Error, KeyError):
+            return service
+        for proc in members:
+            try:
+                key = (proc.pid, proc.create_time())
+            except psutil.Error:
+                continue
+            if key in self._applied:
+                continue
+            self._applied.add(key)
+            for problem in apply_to_process(proc, policy):
+                warn(f"{process_info.get('name', service)}: {problem}")
+        return service
+
+    def check(self):
+        """One enforcement pass over all tracked processes
+
+        Returns:
+            list: Events as dicts with process_id, service, action, memory_mb, limit_mb
+        """
+        if not self.enabled:
+            return []
+        # Read-only snapshot: the menu thread owns the manager's dict and the registry writes
+        entries = self.process_manager.registry.entries()
+        samples = get_sampler().sample(entries, prime_interval=0)
+
+        events = []
+        for process_id, info in entries.items():
+            service = self.apply(info, warn=self.logger.warning)
+            policy = self.policies["services"].get(service) if service else None
+            sample = samples.get(process_id)
+            if not policy or not sample or not sample["alive"] or not policy.get("memory_limit_mb"):
+                continue
+            memory_mb = sample["memory_rss_total"] / 1024 / 1024
+            limit_mb = policy["memory_limit_mb"]
+            if memory_mb <= limit_mb:
+                self._over_limit.discard(process_id)
+                continue
+
+            action = policy.get("on_memory_limit", "warn")
+            event = {"process_id": process_id, "service": service, "action": action,
+                     "memory_mb": round(memory_mb), "limit_mb": limit_mb}
+            if action == "restart":
+                self.logger.warning("%s uses %.0f MB (limit %s MB) - restarting", info['name'], memory_mb, limit_mb)
+                event["restarted"] = self.restart(process_id, info)
+                events.append(event)
+            elif process_id not in self._over_limit:
+                # Warn once per crossing, not on every pass
+                self._over_limit.add(process_id)
+                self.logger.warning("%s uses %.0f MB (limit %s MB)", info['name'], memory_mb, limit_mb)
+                events.append(event)
+        return events
+
+    def restart(self, process_id, info):
+        """Restart a service through its supervisor
+
+        Only services supervised in this interpreter are restarted, by their
+        SupervisedProcess (same argv, environment and process id). Anything
+        else is left running with a logged warning; the enforcer never
+        launches processes or writes the registry itself.
+
+        Returns:
+            bool: True if the service was restarted
+        """
+        supervised = find_supervised(info['pid'])
+        if supervised is None:
+            self.logger.warning("%s (%s) is not supervised by this session - not restarted",
+                                info['name'], process_id)
+            return False
+        return supervised.restart_now(timeout=5)
+
+    def start(self):
+        """Run check() periodically in a daemon thread"""
+        if not self.enabled or (self._thread and self._thread.is_alive()):
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name="ResourcePolicy", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                self.logger.warning("Resource policy check failed: %s", e)
+
+
+def main():
+    """Show which policy applies to each tracked process and run one check"""
+    from ai_path_finder import find_ai_environment
+    from ai_process_manager import BackgroundProcessManager
+
+    ai_env_path = find_ai_environment(verbose=False)
+    if not ai_env_path:
+        print("AI_Environment not found on any drive!")
+        return
+    manager = BackgroundProcessManager(ai_env_path)
+    enforcer = ResourcePolicyEnforcer(manager)
+    for info in manager.tracked_processes.values():
+        service, _ = match_policy(enforcer.policies, info)
+        print(f"{info['name']} (PID {info['pid']}): {service or 'no policy'}")
+    for event in enforcer.check():
+        print(event)
+
+
+if __name__ == "__main__":
+    main()
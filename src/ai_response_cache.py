@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+AI Response Cache
+Content-addressed on-disk cache for LLM responses (SQLite)
+
+Version: 3.0.28
+Author: AI Environment Team
+Date: 2026-10-17
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024   # 512 MB of cached responses
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600     # One week
+
+# AI_LLM_CACHE=off (or 0/false/no) disables the cache for the whole process
+CACHE_DISABLED_VALUES = ("0", "off", "false", "no")
+
+logger = logging.getLogger("ai_environment.response_cache")
+
+
+def get_default_cache_path():
+    """Cache database location inside the AI_Environment tree"""
+    ai_env_path = Path(os.environ.get('AI_ENV_PATH', Path(__file__).resolve().parent.parent))
+    return ai_env_path / "cache" / "llm_responses.sqlite"
+
+
+def make_cache_key(model_digest, prompt, options=None, extra=None):
+    """Build the content address for a request
+
+    The model digest (not just its name) is part of the key, so re-pulling or
+    replacing a tag never serves answers produced by the old weights.
+    """
+    material = json.dumps(
+        {"model": model_digest, "prompt": prompt, "options": options or {}, "extra": extra or {}},
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"),
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed LRU + TTL cache for Ollama responses"""
+
+    def __init__(self, db_path=None, max_bytes=DEFAULT_MAX_BYTES, ttl_seconds=DEFAULT_TTL_SECONDS, enabled=None):
+        """Initialize response cache
+
+        Args:
+            db_path (Path, optional): SQLite file (default: <AI_Environment>/cache/llm_responses.sqlite)
+            max_bytes (int): Evict least-recently-used entries above this total size
+            ttl_seconds (float): Entries older than this are treated as misses
+            enabled (bool, optional): Bypass flag; defaults to the AI_LLM_CACHE variable
+        """
+        if enabled is None:
+            enabled = os.environ.get("AI_LLM_CACHE", "on").strip().lower() not in CACHE_DISABLED_VALUES
+        self.enabled = enabled
+        self.db_path = Path(db_path) if db_path else get_default_cache_path()
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        """Open the database lazily so a disabled cache never touches disk"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), timeout=10, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, model TEXT, response TEXT NOT NULL,"
+                " size INTEGER NOT NULL, created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            self._conn.commit()
+        return self._conn
+
+    def _bump(self, conn, name):
+        conn.execute(
+            "INSERT INTO counters(name, value) VALUES(?, 1) ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,),
+        )
+
+    def _failed(self, action, error):
+        """A database error never fails the request: log it and drop the connection"""
+        self.errors += 1
+        logger.warning("Response cache %s failed (%s): %s", action, self.db_path, error)
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None   # Reopened on the next call
+
+    def get(self, key):
+        """Return the cached response dict for key, or None on miss/expiry
+
+        Database errors (locked, disk full, corrupt file) count as a miss.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            try:
+                return self._get(key)
+            except (sqlite3.Error, OSError, ValueError) as e:
+                self._failed("read", e)
+                self.misses += 1
+                return None
+
+    def _get(self, key):
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row and now - row[1] <= self.ttl_seconds:
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._bump(conn, "hits")
+            conn.commit()
+            self.hits += 1
+            return json.loads(row[0])
+        if row:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        self._bump(conn, "misses")
+        conn.commit()
+        self.misses += 1
+        return None
+
+    def put(self, key, model, response):
+        """Store a response dict and evict LRU entries beyond max_bytes
+
+        Database errors are logged and the response is simply not cached.
+        """
+        if not self.enabled:
+            return
+        payload = json.dumps(response, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses(key, model, response, size, created_at, last_access)"
+                    " VALUES(?, ?, ?, ?, ?, ?)",
+                    (key, model, payload, size, now, now),
+                )
+                self._evict(conn)
+                conn.commit()
+            except (sqlite3.Error, OSError) as e:
+                self._failed("write", e)
+
+    def _evict(self, conn):
+        """Drop expired entries, then least-recently-used ones until under max_bytes"""
+        conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC"):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self._bump(conn, "evictions")
+
+    def stats(self):
+        """Return cache statistics (this process and all-time)"""
+        result = {"enabled": self.enabled, "path": str(self.db_path), "hits": self.hits, "misses": self.misses,
+                  "errors": self.errors}
+        if not self.enabled:
+            return result
+        with self._lock:
+            conn = self._connect()
+            entries, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            counters = dict(conn.execute("SELECT name, value FROM counters"))
+        result.update({
+            "entries": entries,
+            "size_bytes": total,
+            "max_bytes": self.max_bytes,
+            "total_hits": counters.get("hits", 0),
+            "total_misses": counters.get("misses", 0),
+            "total_evictions": counters.get("evictions", 0),
+        })
+        return result
+
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Return the process-wide default response cache"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
+
+
+def main():
+    """Show cache statistics, or clear the cache with --clear"""
+    import sys
+
+    cache = get_response_cache()
+    if "--clear" in sys.argv:
+        cache.clear()
+        print(f"Cleared {cache.db_path}")
+    for name, value in cache.stats().items():
+        print(f"{name}: {value}")
+
+
+if __name__ == "__main__":
+    main()
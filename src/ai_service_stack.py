@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+AI Service Stack
+Starts the environment's services concurrently along a dependency graph
+
+Every service runs in its own worker thread. A service waits only for the
+services it requires to become ready (its readiness gate), so independent
+services - Ollama, Jupyter Lab, Streamlit, TensorBoard, MLflow - start at
+the same time and a cold start takes roughly as long as the slowest one.
+Each service records when it started and became ready for the startup
+timeline.
+
+Configuration: config/service_stack.json
+
+Version: 3.0.28
+Author: AI Environment Team
+Date: 2026-10-17
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+try:
+    from colorama import Fore, Style
+except ImportError:
+    class Fore:
+        GREEN = RED = YELLOW = CYAN = BLUE = MAGENTA = ""
+    class Style:
+        RESET_ALL = ""
+
+from ai_process_supervisor import _is_alive, try_connect, wait_for_port
+from ai_timing import get_tracer
+
+DEFAULT_CONFIG = {
+    "services": ["flask", "ollama", "jupyter", "streamlit", "tensorboard", "mlflow"],
+    "ready_timeout_seconds": 60,
+}
+
+DEFAULT_SERVICE = {
+    "requires": [],
+    "ready_port": None,
+    "ready": None,             # Optional callable(timeout) -> bool
+    "timeout": 60,
+    "required": False,         # A failed required service fails the whole stack
+}
+
+TIMELINE_WIDTH = 40
+
+
+def get_default_config_path():
+    """Service stack configuration inside the AI_Environment tree"""
+    ai_env_path = Path(os.environ.get('AI_ENV_PATH', Path(__file__).resolve().parent.parent))
+    return ai_env_path / "config" / "service_stack.json"
+
+
+def load_stack_config(config_path=None):
+    """Load stack settings, falling back to defaults for missing keys"""
+    config = dict(DEFAULT_CONFIG)
+    config_path = Path(config_path) if config_path else get_default_config_path()
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config.update(json.load(f))
+    except (OSError, json.JSONDecodeError):
+        pass
+    return config
+
+
+class ServiceStack:
+    """Launches services in parallel, gating each on its dependencies"""
+
+    def __init__(self, services, max_workers=None):
+        """Initialize service stack
+
+        Args:
+            services (list): Service dicts with 'name' and 'start' (callable returning
+                True/False, or the launched Popen / psutil.Process) plus optional
+                'requires', 'ready_port', 'ready', 'timeout' and 'required'
+            max_workers (int, optional): Worker threads (default: one per service)
+        """
+        self.services = {}
+        for service in services:
+            spec = dict(DEFAULT_SERVICE)
+            spec.update(service)
+            self.services[spec["name"]] = spec
+        self.order = self.topological_order()
+        self.max_workers = max_workers or max(len(self.services), 1)
+        self.results = {
+            name: {"name": name, "status": "pending", "requires": list(spec["requires"]),
+                   "started_at": None, "ready_at": None, "detail": ""}
+            for name, spec in self.services.items()
+        }
+        self._gates = {name: threading.Event() for name in self.services}
+        self._lock = threading.Lock()
+        self._pool = None
+        self._started = None
+        self._started_wall = None
+        self._trace_parent = None
+
+    def topological_order(self):
+        """Return service names with every dependency before its dependents
+
+        Raises:
+            ValueError: On an unknown dependency or a dependency cycle
+        """
+        for name, spec in self.services.items():
+            unknown = [dep for dep in spec["requires"] if dep not in self.services]
+            if unknown:
+                raise ValueError(f"{name} requires unknown service(s): {', '.join(unknown)}")
+
+        remaining = {name: set(spec["requires"]) for name, spec in self.services.items()}
+        order = []
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Dependency cycle between: {', '.join(sorted(remaining))}")
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    def _elapsed(self):
+        return time.monotonic() - self._started
+
+    def _finish(self, name, status, detail=""):
+        with self._lock:
+            self.results[name].update({"status": status, "detail": detail})
+            if status == "ready":
+                self.results[name]["ready_at"] = self._elapsed()
+            started_at = self.results[name]["started_at"]
+        if started_at is not None:
+            get_tracer().record(f"service {name}", self._started_wall + started_at,
+                                (self._elapsed() - started_at) * 1000, parent=self._trace_parent,
+                                status="ok" if status == "ready" else status, detail=detail)
+        self._gates[name].set()
+
+    def _run_service(self, name):
+        spec = self.services[name]
+        try:
+            # Readiness gate: block until every dependency is ready
+            for dep in spec["requires"]:
+                self._gates[dep].wait()
+                if self.results[dep]["status"] != "ready":
+                    self._finish(name, "skipped", f"{dep} is not ready")
+                    return
+
+            with self._lock:
+                self.results[name].update({"status": "starting", "started_at": self._elapsed()})
+
+            if spec["ready_port"] and try_connect(spec["ready_port"]):
+                self._finish(name, "ready", "already running")
+                return
+
+            launched = spec["start"]()
+            if launched is False or launched is None:
+                self._finish(name, "failed", "failed to start")
+                return
+            process = None if launched is True else launched
+
+            if spec["ready_port"] and not wait_for_port(spec["ready_port"], timeout=spec["timeout"], process=process):
+                if process is not None and not _is_alive(process):
+                    self._finish(name, "failed", f"exited before opening port {spec['ready_port']}")
+                else:
+                    self._finish(name, "failed", f"port {spec['ready_port']} not ready after {spec['timeout']}s")
+                return
+            if spec["ready"] and not spec["ready"](spec["timeout"]):
+                self._finish(name, "failed", f"not ready after {spec['timeout']}s")
+                return
+            self._finish(name, "ready")
+        except Exception as e:
+            self._finish(name, "failed", str(e))
+
+    def start(self):
+        """Launch every service in the background (returns immediately)"""
+        self._started = time.monotonic()
+        self._started_wall = time.time()
+        # Service spans are recorded from worker threads under the caller's span
+        self._trace_parent = get_tracer().current_span_id()
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ServiceStack")
+        # Submitted in dependency order, so a worker only ever waits on earlier services
+        for name in self.order:
+            self._pool.submit(self._run_service, name)
+
+    def wait(self, name, timeout=None):
+        """Wait for one service's readiness gate
+
+        Returns:
+            bool: True if the service is ready
+        """
+        self._gates[name].wait(timeout)
+        return self.results[name]["status"] == "ready"
+
+    def join(self):
+        """Wait for every service to finish starting
+
+        Returns:
+            list: Timeline entries (see timeline())
+        """
+        if self._pool:
+            self._pool.shutdown(wait=True)
+        return self.timeline()
+
+    def run(self):
+        """Start all services and wait for them"""
+        self.start()
+        return self.join()
+
+    def ok(self):
+        """True if every required service is ready"""
+        return all(self.results[name]["status"] == "ready"
+                   for name, spec in self.services.items() if spec["required"])
+
+    def timeline(self):
+        """Return per-service results in the order services started"""
+        with self._lock:
+            entries = [dict(result) for result in self.results.values()]
+        return sorted(entries, key=lambda entry: (entry["started_at"] is None, entry["started_at"] or 0))
+
+
+def format_timeline(entries, width=TIMELINE_WIDTH):
+    """Format timeline entries as a text chart, one line per service"""
+    end = max([entry["ready_at"] or entry["started_at"] or 0 for entry in entries] + [0.001])
+    scale = width / end
+    name_width = max(len(entry["name"]) for entry in entries) if entries else 0
+    colors = {"ready": Fore.GREEN, "failed": Fore.RED, "skipped": Fore.YELLOW}
+
+    lines = []
+    for entry in entries:
+        started = entry["started_at"]
+        finished = entry["ready_at"]
+        if started is None:
+            bar = ""
+            timing = "--"
+        else:
+            offset = int(started * scale)
+            length = max(int(((finished or started) - started) * scale), 1)
+            bar = " " * offset + "█" * length
+            timing = f"{started:5.1f}s → {finished:5.1f}s" if finished is not None else f"{started:5.1f}s"
+        status = entry["status"] + (f" ({entry['detail']})" if entry["detail"] else "")
+        color = colors.get(entry["status"], "")
+        lines.append(f"  {entry['name']:<{name_width}} |{bar:<{width}}| {timing:<17} "
+                     f"{color}{status}{Style.RESET_ALL}")
+
+    durations = [entry["ready_at"] - entry["started_at"] for entry in entries
+                 if entry["ready_at"] is not None and entry["started_at"] is not None]
+    lines.append(f"  Total {end:.1f}s (one after another: ~{sum(durations):.1f}s)")
+    return "\n".join(lines)
+
+
+def _tracked_process(process_manager, name):
+    """psutil handle for the most recently tracked process with this name"""
+    if not PSUTIL_AVAILABLE:
+        return True
+    entries = [info for info in process_manager.snapshot().values() if info.get("name") == name]
+    if not entries:
+        return True
+    try:
+        return psutil.Process(max(entries, key=lambda info: info.get("started_at", ""))["pid"])
+    except psutil.Error:
+        return True
+
+
+def build_activation_services(ai_env_path, ollama_path=None, config=None, model=None, model_loader=None):
+    """Service definitions used by Full Activation
+
+    Args:
+        ai_env_path (Path): AI_Environment root
+        ollama_path (Path, optional): ollama.exe location
+        config (dict, optional): Settings (default: config/service_stack.json)
+        model (str, optional): Model to load and keep warm once Ollama is ready
+        model_loader (ModelLoader, optional): Loader used for model
+
+    Returns:
+        list: Service dicts for ServiceStack, filtered by config['services']
+    """
+    from ai_component_setup import ComponentSetup
+    from ai_ollama_manager import OllamaManager
+    from ai_process_manager import BackgroundProcessManager
+
+    ai_env_path = Path(ai_env_path)
+    config = config or load_stack_config()
+    timeout = config.get("ready_timeout_seconds", DEFAULT_CONFIG["ready_timeout_seconds"])
+    component_setup = ComponentSetup(ai_env_path, ollama_path)
+    ollama_manager = OllamaManager(ai_env_path, ollama_path)
+    # Shared by every launch; the manager locks only its tracking dict,
+    # so spawns and readiness waits all run in parallel
+    process_manager = BackgroundProcessManager(ai_env_path)
+
+    def launcher(launch, name):
+        def start():
+            if not launch():
+                return False
+            return _tracked_process(process_manager, name)
+        return start
+
+    services = [
+        {"name": "flask", "start": component_setup.setup_flask, "required": True},
+        # Supervised and tracked as 'ollama_server'; returns once the API answers
+        {"name": "ollama", "start": ollama_manager.start_ollama_server, "required": True},
+        {"name": "jupyter", "start": launcher(process_manager.launch_jupyter, "Jupyter Lab"),
+         "ready_port": 8888, "timeout": timeout},
+        {"name": "streamlit", "start": launcher(process_manager.launch_streamlit_demo, "Streamlit Demo"),
+         "ready_port": 8501, "timeout": timeout},
+        {"name": "tensorboard", "start": launcher(process_manager.launch_tensorboard, "TensorBoard"),
+         "ready_port": 6006, "timeout": timeout},
+        {"name": "mlflow", "start": launcher(process_manager.launch_mlflow_ui, "MLflow UI"),
+         "ready_port": 5000, "timeout": timeout},
+    ]
+    enabled = config.get("services") or DEFAULT_CONFIG["services"]
+    services = [service for service in services if service["name"] in enabled]
+
+    if model and model_loader:
+        def load_model():
+            if not model_loader.load_model(model):
+                return False
+            # Keep the selected and configured hot models resident
+            model_loader.warmup.start([model])
+            return True
+
+        # Loading needs the API; the other services keep starting meanwhile
+        services.append({"name": "model", "start": load_model,
+                         "requires": ["ollama"] if "ollama" in enabled else []})
+    return services
+
+
+def main():
+    """Start the service stack from the command line"""
+    parser = argparse.ArgumentParser(description="Start AI Environment services concurrently")
+    parser.add_argument("services", nargs="*", help="Services to start (default: config/service_stack.json)")
+    parser.add_argument("--ai-env", default=os.environ.get('AI_ENV_PATH', str(Path(__file__).resolve().parent.parent)))
+    args = parser.parse_args()
+
+    config = load_stack_config()
+    if args.services:
+        config["services"] = args.services
+    stack = ServiceStack(build_activation_services(args.ai_env, config=config))
+    timeline = stack.run()
+    print(f"\n{Fore.CYAN}⏱  Startup timeline:{Style.RESET_ALL}")
+    print(format_timeline(timeline))
+    return 0 if stack.ok() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
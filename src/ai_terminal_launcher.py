@@ -15,6 +15,8 @@ import subprocess
 import tempfile
 from pathlib import Path
 
+from ai_toolchain import get_toolchain
+
 try:
     from colorama import Fore, Style, init
     init(autoreset=True)
@@ -32,23 +34,12 @@ class TerminalLauncher:
     def __init__(self, ai_env_path):
         self.ai_env_path = Path(ai_env_path)
 
-        # Find conda installation - check multiple locations
-        conda_locations = [
-            Path("C:/ProgramData/miniconda3"),
-            Path("C:/ProgramData/Miniconda3"),
-            self.ai_env_path / "Miniconda",
-            Path.home() / "miniconda3",
-            Path.home() / "anaconda3",
-        ]
-
-        self.conda_path = None
-        for location in conda_locations:
-            if (location / "Scripts" / "activate.bat").exists():
-                self.conda_path = location
-                break
+        # Find conda installation (portable first, then PATH, user and system installs)
+        self.toolchain = get_toolchain(self.ai_env_path)
+        self.conda_path = self.toolchain.conda_root()
 
         if not self.conda_path:
-            # Fallback to first location (will show error later)
+            # Fallback to portable location (will show error later)
             self.conda_path = self.ai_env_path / "Miniconda"
 
         self.activate_script = self.conda_path / "Scripts" / "activate.bat"
@@ -124,15 +115,9 @@ cmd /k
             if not self.activate_script.exists():
                 print(f"{Fore.RED}[ERROR] Conda activation script not found!")
                 print(f"{Fore.YELLOW}[INFO] Searched locations:")
-                conda_locations = [
-                    Path("C:/ProgramData/miniconda3"),
-                    Path("C:/ProgramData/Miniconda3"),
-                    self.ai_env_path / "Miniconda",
-                    Path.home() / "miniconda3",
-                    Path.home() / "anaconda3",
-                ]
-                for loc in conda_locations:
-                    print(f"{Fore.YELLOW}  - {loc / 'Scripts' / 'activate.bat'}")
+                for source, conda_exe in self.toolchain.candidates("conda"):
+                    if source != "PATH":
+                        print(f"{Fore.YELLOW}  - {conda_exe.parent / 'activate.bat'}")
                 return False
 
             print(f"{Fore.CYAN}🚀 Launching AI2025 Terminal...")
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+AI Timing
+Lightweight spans for startup and Full Activation timing
+
+    with span("detect_miniconda"):
+        ...
+    mark("menu_ready")
+
+Spans nest per thread. Tracing is off unless AI_ENV_TRACE is set: to a
+file path, or to 1 for <AI_Environment>/cache/traces/trace.jsonl. When it
+is off, span() returns a shared no-op object. Every finished span and mark
+is appended to the trace as one JSON line tagged with a run id and PID, so
+several runs can share one file.
+
+Marks also carry the milliseconds since the interpreter process started
+(needs psutil; exact on Windows, within about a second on Linux where the
+process start time is derived from the boot time).
+
+Version: 3.0.28
+Author: AI Environment Team
+Date: 2026-10-17
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+TRACE_ENV = "AI_ENV_TRACE"
+
+
+def get_default_trace_path():
+    """Trace file inside the AI_Environment tree"""
+    ai_env_path = Path(os.environ.get('AI_ENV_PATH', Path(__file__).resolve().parent.parent))
+    return ai_env_path / "cache" / "traces" / "trace.jsonl"
+
+
+def process_uptime_ms():
+    """Milliseconds since this interpreter process was created, or None"""
+    # Imported here: only marks need it, and only while tracing is on
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        return round((time.time() - psutil.Process().create_time()) * 1000, 1)
+    except psutil.Error:
+        return None
+
+
+class Span:
+    """One timed interval; use as a context manager or call end()"""
+
+    def __init__(self, tracer, name, parent_id, attrs):
+        self.tracer = tracer
+        self.name = name
+        self.id = tracer._next_id()
+        self.parent_id = parent_id
+        self.attrs = attrs
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.duration_ms = None
+
+    def set(self, **attrs):
+        """Attach attributes to the span"""
+        self.attrs.update(attrs)
+
+    def end(self, status="ok"):
+        """Finish the span (only the first call counts)
+
+        Returns:
+            float: Duration in milliseconds
+        """
+        if self.duration_ms is None:
+            self.duration_ms = round((time.perf_counter() - self._t0) * 1000, 3)
+            self.tracer._pop(self)
+            self.tracer._write({"type": "span", "name": self.name, "id": self.id, "parent": self.parent_id,
+                                "start": self.started_at, "duration_ms": self.duration_ms,
+                                "status": status, "attrs": self.attrs})
+        return self.duration_ms
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.attrs["error"] = f"{exc_type.__name__}: {exc}"
+        self.end("error" if exc_type is not None else "ok")
+        return False
+
+
+class _NullSpan:
+    """Stand-in used while tracing is off"""
+    id = None
+    duration_ms = None
+
+    def set(self, **attrs):
+        pass
+
+    def end(self, status="ok"):
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Collects spans and marks and appends them to a JSONL trace"""
+
+    def __init__(self, path=None):
+        """Initialize tracer
+
+        Args:
+            path (Path, optional): Trace file; None disables tracing
+        """
+        self.path = Path(path) if path else None
+        self.enabled = self.path is not None
+        self.run_id = os.urandom(4).hex()
+        self.records = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._counter = 0
+
+    def _next_id(self):
+        with self._lock:
+            self._counter += 1
+            return self._counter
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _pop(self, span):
+        stack = self._stack()
+        if span in stack:
+            stack.remove(span)
+
+    def _write(self, record):
+        record = dict(record, run=self.run_id, pid=os.getpid(), thread=threading.current_thread().name)
+        with self._lock:
+            self.records.append(record)
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, default=str) + "\n")
+            except OSError:
+                pass   # Tracing must never break the menu
+
+    def current_span_id(self):
+        """Id of the innermost open span on this thread, or None"""
+        stack = self._stack() if self.enabled else []
+        return stack[-1].id if stack else None
+
+    def span(self, name, parent=None, **attrs):
+        """Start a span (child of the current one unless parent is given)"""
+        if not self.enabled:
+            return NULL_SPAN
+        new_span = Span(self, name, parent if parent is not None else self.current_span_id(), attrs)
+        self._stack().append(new_span)
+        return new_span
+
+    def record(self, name, started_at, duration_ms, parent=None, status="ok", **attrs):
+        """Write a span measured elsewhere (e.g. by a worker thread's own clock)"""
+        if self.enabled:
+            self._write({"type": "span", "name": name, "id": self._next_id(), "parent": parent,
+                         "start": started_at, "duration_ms": round(duration_ms, 3),
+                         "status": status, "attrs": attrs})
+
+    def mark(self, name, **attrs):
+        """Write a point-in-time event with the process uptime"""
+        if self.enabled:
+            self._write({"type": "mark", "name": name, "id": self._next_id(), "parent": self.current_span_id(),
+                         "start": time.time(), "since_process_start_ms": process_uptime_ms(),
+                         "attrs": attrs})
+
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer():
+    """Return the process-wide tracer (configured from AI_ENV_TRACE)"""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            setting = os.environ.get(TRACE_ENV, "").strip()
+            if setting in ("", "0"):
+                _tracer = Tracer()
+            elif setting == "1":
+                _tracer = Tracer(get_default_trace_path())
+            else:
+                _tracer = Tracer(setting)
+        return _tracer
+
+
+def span(name, **attrs):
+    """Start a span on the process-wide tracer"""
+    return get_tracer().span(name, **attrs)
+
+
+def mark(name, **attrs):
+    """Write a mark on the process-wide tracer"""
+    get_tracer().mark(name, **attrs)
+
+
+def traced(name=None):
+    """Decorator wrapping every call of a function in a span"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_tracer().span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def load_trace(path, run=None):
+    """Read a JSONL trace, optionally only one run's records"""
+    records = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if run is None or record.get("run") == run:
+                    records.append(record)
+    except OSError:
+        pass
+    return records
+
+
+def format_trace(records):
+    """Format one run's spans as an indented tree with durations"""
+    children = {}
+    for record in records:
+        children.setdefault(record.get("parent"), []).append(record)
+    lines = []
+
+    def walk(parent, depth):
+        for record in sorted(children.get(parent, []), key=lambda r: r["start"]):
+            if record["type"] == "mark":
+                uptime = record.get("since_process_start_ms")
+                suffix = f"{uptime:.0f} ms since process start" if uptime is not None else "mark"
+                lines.append(f"{'':>10}   {'  ' * depth}* {record['name']} ({suffix})")
+            else:
+                status = "" if record.get("status") == "ok" else f"  [{record.get('status')}]"
+                lines.append(f"{record['duration_ms']:>10.1f} ms {'  ' * depth}{record['name']}{status}")
+            walk(record["id"], depth + 1)
+
+    walk(None, 0)
+    return "\n".join(lines)
+
+
+def main():
+    """Print the spans of the last run in a trace file"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show an AI Environment timing trace")
+    parser.add_argument("trace", nargs="?", default=str(get_default_trace_path()), help="JSONL trace file")
+    args = parser.parse_args()
+
+    records = load_trace(args.trace)
+    if not records:
+        print(f"No trace records in {args.trace}")
+        return 1
+    last_run = records[-1]["run"]
+    print(format_trace([record for record in records if record["run"] == last_run]))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
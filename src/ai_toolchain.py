@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+AI Toolchain Resolver
+One place that finds conda, ollama, python, jupyter, streamlit,
+tensorboard, mlflow and VS Code
+
+Every tool has an ordered list of candidates - the portable copy inside
+AI_Environment first, then the AI2025 environment, PATH (shutil.which,
+in-process instead of a `where` subprocess), the user profile and
+system-wide installs. All tools are resolved in parallel threads. Resolved
+paths are cached with their modification times in
+<AI_Environment>/cache/toolchain.json; a cached path is reused while the
+file still exists with the same mtime (and, for tools found on PATH,
+PATH is unchanged) and is resolved again otherwise.
+Tools that were not found are cached too, with the modification times of
+every directory searched (PATH included); the miss stands until one of
+them changes.
+
+Version: 3.0.28
+Author: AI Environment Team
+Date: 2026-10-17
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+TOOLS = ("conda", "ollama", "python", "jupyter", "streamlit", "tensorboard", "mlflow", "code")
+CONDA_ENV_NAME = "AI2025"
+IS_WINDOWS = os.name == "nt"
+
+
+def get_default_cache_path(ai_env_path):
+    return Path(ai_env_path) / "cache" / "toolchain.json"
+
+
+def _exe(name):
+    return f"{name}.exe" if IS_WINDOWS else name
+
+
+def _scripts_dir(root):
+    """Folder holding conda and console entry points of an installation"""
+    return root / ("Scripts" if IS_WINDOWS else "bin")
+
+
+def _mtime(path):
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def conda_root(conda_exe):
+    """Miniconda root of a conda executable (Scripts\\conda.exe or condabin\\conda.bat)"""
+    return Path(conda_exe).parent.parent if conda_exe else None
+
+
+class ToolchainResolver:
+    """Resolves tool locations in parallel and caches them by mtime"""
+
+    def __init__(self, ai_env_path, cache_path=None, env_name=CONDA_ENV_NAME):
+        """Initialize toolchain resolver
+
+        Args:
+            ai_env_path (Path): AI_Environment root
+            cache_path (Path, optional): Cache file (default: <ai_env>/cache/toolchain.json)
+            env_name (str): Conda environment whose tools are preferred
+        """
+        self.ai_env_path = Path(ai_env_path)
+        self.cache_path = Path(cache_path) if cache_path else get_default_cache_path(self.ai_env_path)
+        self.env_name = env_name
+        self._lock = threading.Lock()
+        self._resolved = None     # name -> {"path", "mtime", "source"}
+
+    # ------------------------------------------------------------------
+    # Candidates
+    # ------------------------------------------------------------------
+
+    def conda_roots(self):
+        """Miniconda roots checked after PATH-independent portable locations"""
+        user_profile = Path(os.environ.get('USERPROFILE', str(Path.home())))
+        return {
+            "portable": [self.ai_env_path / "Miniconda", self.ai_env_path / "AI_Environment" / "Miniconda"],
+            "user": [user_profile / name for name in ("Miniconda3", "miniconda3", "anaconda3")],
+            "system": [Path(f"C:/ProgramData/{name}") for name in ("Miniconda3", "miniconda3")],
+        }
+
+    def candidates(self, name, conda_exe=None):
+        """Ordered (source, path) candidates for a tool; 'PATH' means shutil.which"""
+        if name == "conda":
+            roots = self.conda_roots()
+            return ([("portable", _scripts_dir(root) / _exe("conda")) for root in roots["portable"]]
+                    + [("PATH", "conda")]
+                    + [(source, _scripts_dir(root) / _exe("conda"))
+                       for source in ("user", "system") for root in roots[source]])
+
+        if name == "ollama":
+            user_profile = Path(os.environ.get('USERPROFILE', str(Path.home())))
+            local_appdata = Path(os.environ.get('LOCALAPPDATA', str(Path.home())))
+            return [
+                ("portable", self.ai_env_path / "Ollama" / _exe("ollama")),
+                ("portable", self.ai_env_path / "AI_Environment" / "Ollama" / _exe("ollama")),
+                ("PATH", "ollama"),
+                ("user", user_profile / "Ollama" / _exe("ollama")),
+                ("user", local_appdata / "Programs" / "Ollama" / _exe("ollama")),
+                ("system", Path("C:/Program Files/Ollama/ollama.exe")),
+                ("system", Path("C:/Program Files (x86)/Ollama/ollama.exe")),
+            ]
+
+        if name == "code":
+            local_appdata = Path(os.environ.get('LOCALAPPDATA', str(Path.home())))
+            return [
+                ("portable", self.ai_env_path / "VSCode" / "Code.exe"),
+                ("user", local_appdata / "Programs" / "Microsoft VS Code" / "Code.exe"),
+                ("system", Path("C:/Program Files/Microsoft VS Code/Code.exe")),
+                ("system", Path("C:/Program Files (x86)/Microsoft VS Code/Code.exe")),
+                ("PATH", "code"),
+            ]
+
+        # Python and console tools: the AI2025 environment first, then PATH
+        found = []
+        root = conda_root(conda_exe)
+        if root:
+            env_root = root / "envs" / self.env_name
+            if name == "python":
+                found.append(("env", env_root / _exe("python") if IS_WINDOWS else env_root / "bin" / "python"))
+            else:
+                found.append(("env", _scripts_dir(env_root) / _exe(name)))
+        found.append(("PATH", name))
+        return found
+
+    # ------------------------------------------------------------------
+    # Resolution
+    # ------------------------------------------------------------------
+
+    def _find(self, name, conda_exe=None):
+        for source, candidate in self.candidates(name, conda_exe):
+            if source == "PATH":
+                which = shutil.which(candidate)
+                if not which:
+                    continue
+                path = Path(which)
+                if name == "code" and path.parent.name == "bin" and (path.parent.parent / "Code.exe").exists():
+                    path = path.parent.parent / "Code.exe"    # bin\code.cmd -> Code.exe
+            elif candidate.is_file():
+                path = candidate
+            else:
+                continue
+            entry = {"path": str(path), "mtime": _mtime(path), "source": source}
+            if source == "PATH":
+                # Only valid for the PATH it was found on (e.g. before/after activating AI2025)
+                entry["search_path"] = os.environ.get("PATH", "")
+            return entry
+        return {"path": None, "source": None, "dirs": self._searched_dirs(name, conda_exe)}
+
+    def _searched_dirs(self, name, conda_exe=None):
+        """Directories a lookup looks in, with their mtimes (None if missing)
+
+        Installing a tool into any of them changes that directory's mtime.
+        """
+        dirs = {}
+        for source, candidate in self.candidates(name, conda_exe):
+            folders = os.environ.get("PATH", "").split(os.pathsep) if source == "PATH" else [candidate.parent]
+            for folder in folders:
+                if folder:
+                    dirs[str(folder)] = _mtime(Path(folder))
+        return dirs
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if not isinstance(cached, dict) or cached.get("ai_env_path") != str(self.ai_env_path):
+            return {}
+        tools = {name: entry for name, entry in cached.get("tools", {}).items()
+                 if isinstance(entry, dict) and (entry.get("path") or isinstance(entry.get("dirs"), dict))}
+        conda = tools.get("conda", {}).get("path")
+        valid = {}
+        for name, entry in tools.items():
+            if entry.get("path"):
+                # A found tool: its file is unchanged and no new install outranks it
+                if (_mtime(Path(entry["path"])) == entry.get("mtime")
+                        and (entry.get("source") != "PATH" or entry.get("search_path") == os.environ.get("PATH", ""))
+                        and not self._outranked(name, entry, conda)):
+                    valid[name] = entry
+            elif self._searched_dirs(name, conda) == entry["dirs"]:
+                # A miss: nothing was added to (or created among) the searched directories
+                valid[name] = entry
+        return valid
+
+    def _outranked(self, name, entry, conda_exe):
+        """True if a fixed candidate listed before the cached one now exists"""
+        for source, candidate in self.candidates(name, conda_exe):
+            if source == "PATH":
+                if entry.get("source") == "PATH":
+                    return False
+                continue
+            if str(candidate) == entry["path"]:
+                return False
+            if candidate.is_file():
+                return True
+        return False
+
+    def _save_cache(self, resolved):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.cache_path.with_suffix(".tmp")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"ai_env_path": str(self.ai_env_path), "saved_at": time.time(),
+                           "tools": resolved}, f, indent=2)
+            os.replace(temp_path, self.cache_path)
+        except OSError:
+            pass   # Caching is an optimization only
+
+    def resolve(self, refresh=False):
+        """Resolve every tool (cached entries are reused unless refresh)
+
+        Returns:
+            dict: name -> Path, or None if the tool was not found
+        """
+        with self._lock:
+            if self._resolved is None or refresh:
+                cached = {} if refresh else self._load_cache()
+                missing = [name for name in TOOLS if name not in cached]
+                resolved = dict(cached)
+                if missing:
+                    with ThreadPoolExecutor(max_workers=len(TOOLS), thread_name_prefix="toolchain") as pool:
+                        futures = {}
+                        if "conda" in missing:
+                            futures["conda"] = pool.submit(self._find, "conda")
+
+                        def find_with_conda(name):
+                            # Environment tools need the conda root; wait for it in this worker
+                            conda = futures["conda"].result() if "conda" in futures else cached.get("conda")
+                            return self._find(name, conda.get("path") if conda else None)
+
+                        for name in missing:
+                            if name != "conda":
+                                futures[name] = pool.submit(find_with_conda, name)
+                        for name, future in futures.items():
+                            resolved[name] = future.result()
+                    self._save_cache(resolved)
+                self._resolved = resolved
+            return {name: Path(self._resolved[name]["path"]) if (self._resolved.get(name) or {}).get("path")
+                    else None for name in TOOLS}
+
+    def get(self, name):
+        """Path of one tool, or None"""
+        return self.resolve().get(name)
+
+    def source(self, name):
+        """Where a tool was found: portable, env, PATH, user, system (or None)"""
+        self.resolve()
+        entry = self._resolved.get(name)
+        return entry.get("source") if entry else None
+
+    def conda_root(self):
+        """Miniconda root directory, or None"""
+        return conda_root(self.get("conda"))
+
+    def invalidate(self):
+        """Forget resolved paths (next call re-checks the cache file)"""
+        with self._lock:
+            self._resolved = None
+
+
+_resolvers = {}
+_resolvers_lock = threading.Lock()
+
+
+def get_toolchain(ai_env_path):
+    """Return the shared resolver for an AI_Environment"""
+    key = str(Path(ai_env_path))
+    with _resolvers_lock:
+        if key not in _resolvers:
+            _resolvers[key] = ToolchainResolver(ai_env_path)
+        return _resolvers[key]
+
+
+def main():
+    """Print resolved tool locations"""
+    import argparse
+    from ai_path_finder import find_ai_environment
+
+    parser = argparse.ArgumentParser(description="Show where AI Environment tools are found")
+    parser.add_argument("--rescan", action="store_true", help="Ignore the cached locations")
+    args = parser.parse_args()
+
+    ai_env_path = find_ai_environment()
+    if not ai_env_path:
+        print("AI_Environment not found on any drive!")
+        return 1
+    resolver = ToolchainResolver(ai_env_path)
+    started = time.perf_counter()
+    tools = resolver.resolve(refresh=args.rescan)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    for name, path in tools.items():
+        print(f"{name:<12} {str(path) if path else 'not found':<70} {resolver.source(name) or ''}")
+    print(f"\nResolved in {elapsed_ms:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -485,7 +485,9 @@ else:
 sys.path.insert(0, str(ai_env_path / "src"))
 
 import requests
-import json
+
+# Shared pooled Ollama client (one keep-alive connection pool per process)
+from ai_ollama_client import get_client, query_ollama, stream_ollama, format_stream_stats
 
 def test_ai_environment_integration():
     """Test AI Environment system integration"""
@@ -512,26 +514,6 @@ def test_ai_environment_integration():
     
     print()
 
-def query_ollama(prompt, model="phi:2.7b", host="127.0.0.1", port=11434):
-    """Query Ollama AI with integration to AI Environment system"""
-    url = f"http://{host}:{port}/api/generate"
-    
-    data = {
-        "model": model,
-        "prompt": prompt,
-        "stream": False
-    }
-    
-    try:
-        response = requests.post(url, json=data, timeout=60)
-        response.raise_for_status()
-        
-        result = response.json()
-        return result.get("response", "No response received")
-        
-    except requests.exceptions.RequestException as e:
-        return f"Error: {e}\\nMake sure Ollama server is running (AI Environment Menu → Option 6)"
-
 def test_ollama_connection():
     """Test Ollama connection through AI Environment system"""
     print("🤖 Ollama AI Integration Test")
@@ -539,16 +521,11 @@ def test_ollama_connection():
     
     # Check if Ollama server is accessible
     try:
-        response = requests.get("http://127.0.0.1:11434/api/tags", timeout=5)
-        if response.status_code == 200:
-            models = response.json().get("models", [])
-            print(f"✓ Ollama server is running")
-            print(f"✓ Available models: {len(models)}")
-            for model in models:
-                print(f"  - {model.get('name', 'Unknown')}")
-        else:
-            print("✗ Ollama server not responding correctly")
-            return False
+        models = get_client().tags(timeout=5)
+        print(f"✓ Ollama server is running")
+        print(f"✓ Available models: {len(models)}")
+        for model in models:
+            print(f"  - {model.get('name', 'Unknown')}")
     except requests.exceptions.RequestException:
         print("✗ Ollama server not accessible")
         print("  Start it from AI Environment Menu → Option 6: Setup Ollama Server")
@@ -560,10 +537,15 @@ def test_ollama_connection():
         model_name = models[0].get('name', 'phi:2.7b')
         prompt = "Explain what artificial intelligence is in one sentence."
         print(f"Question: {prompt}")
-        print("Thinking...")
         
-        response = query_ollama(prompt, model=model_name)
-        print(f"AI Response: {response}")
+        # Stream tokens as they arrive (use query_ollama for a single blocking call)
+        stats = {}
+        print("AI Response: ", end="", flush=True)
+        for token in stream_ollama(prompt, model=model_name, stats=stats):
+            print(token, end="", flush=True)
+        print()
+        if stats:
+            print(f"✓ {format_stream_stats(stats)}")
     
     print()
     return True
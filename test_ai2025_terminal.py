@@ -12,6 +12,9 @@ import os
 import subprocess
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+from ai_package_validator import check_packages
+
 class TerminalTester:
     def __init__(self):
         self.tests_passed = 0
@@ -101,15 +104,12 @@ class TerminalTester:
             ('mlflow', 'MLflow'),
         ]
 
-        all_passed = True
-        missing_packages = []
-
-        for package_name, display_name in packages_to_test:
-            try:
-                __import__(package_name)
-            except ImportError:
-                all_passed = False
-                missing_packages.append(display_name)
+        # Located and version-checked without importing (no torch/langchain import cost)
+        display_names = dict(packages_to_test)
+        report = check_packages([(name, name) for name, _ in packages_to_test])
+        missing_packages = [display_names[package["name"]] for package in report["packages"]
+                            if package["status"] != "ok"]
+        all_passed = not missing_packages
 
         self.print_test(
             "Critical AI Packages",
@@ -125,20 +125,20 @@ class TerminalTester:
             ('mlflow', 'MLflow'),
         ]
 
-        for package_name, display_name in test_cases:
-            try:
-                module = __import__(package_name)
-                version = getattr(module, '__version__', 'unknown')
+        # Real imports, run in a bounded pool with a timeout per package
+        report = check_packages([(name, name) for name, _ in test_cases], full_import=True)
+        for (package_name, display_name), package in zip(test_cases, report["packages"]):
+            if package["status"] == "ok":
                 self.print_test(
                     f"Import {display_name}",
                     True,
-                    f"Version: {version}"
+                    f"Version: {package['version'] or 'unknown'} ({package['import_ms']:.0f} ms)"
                 )
-            except ImportError as e:
+            else:
                 self.print_test(
                     f"Import {display_name}",
                     False,
-                    f"Import failed: {e}"
+                    f"Import failed: {package['error'] or 'No module named ' + repr(package_name)}"
                 )
 
     def test_pip_command(self):
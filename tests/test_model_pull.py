@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Model Pull Queue Tests
+Runs PullQueue against a stub /api/pull server (no Ollama needed)
+
+    python -m pytest tests/test_model_pull.py
+    python tests/test_model_pull.py
+
+Version: 3.0.28
+Author: AI Environment Team
+Date: 2026-10-17
+"""
+
+import json
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+from ai_model_pull import PullQueue
+
+MB = 1000 * 1000
+
+# Progress lines per model, as /api/pull streams them
+PULL_STREAMS = {
+    "tiny:1b": [
+        {"status": "pulling manifest"},
+        {"status": "pulling aaa", "digest": "sha256:aaa", "total": 4 * MB, "completed": 0},
+        {"status": "pulling bbb", "digest": "sha256:bbb", "total": 1 * MB, "completed": 0},
+        {"status": "pulling aaa", "digest": "sha256:aaa", "total": 4 * MB, "completed": 2 * MB},
+        {"status": "pulling bbb", "digest": "sha256:bbb", "total": 1 * MB, "completed": 1 * MB},
+        {"status": "pulling aaa", "digest": "sha256:aaa", "total": 4 * MB, "completed": 4 * MB},
+        {"status": "verifying sha256 digest"},
+        {"status": "success"},
+    ],
+    # Interrupted earlier: 3 of 4 MB are already on disk
+    "resumed:1b": [
+        {"status": "pulling manifest"},
+        {"status": "pulling ccc", "digest": "sha256:ccc", "total": 4 * MB, "completed": 3 * MB},
+        {"status": "pulling ccc", "digest": "sha256:ccc", "total": 4 * MB, "completed": 4 * MB},
+        {"status": "success"},
+    ],
+    "broken:1b": [
+        {"status": "pulling manifest"},
+        {"error": "pull model manifest: file does not exist"},
+    ],
+}
+
+
+class StubOllamaHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        model = body.get("model") or body.get("name")
+        StubOllamaHandler.requests_seen.append(model)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        for chunk in PULL_STREAMS.get(model, [{"error": "unknown model"}]):
+            self.wfile.write((json.dumps(chunk) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+class PullQueueTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubOllamaHandler)
+        cls.port = cls.server.server_address[1]
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubOllamaHandler.requests_seen = []
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state_path = Path(self.tmp.name) / "pull_queue.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_queue(self):
+        return PullQueue(port=self.port, concurrency=2, state_path=self.state_path)
+
+    def test_progress_sums_layers(self):
+        queue = self.make_queue()
+        updates = []
+        results = queue.run(["tiny:1b"], on_progress=updates.append)
+
+        self.assertEqual(results, {"tiny:1b": "done"})
+        pulling = [u for u in updates if u["status"] == "pulling" and u["total"]]
+        self.assertEqual([(u["completed"], u["total"]) for u in pulling],
+                         [(0, 4 * MB), (0, 5 * MB), (2 * MB, 5 * MB), (3 * MB, 5 * MB), (5 * MB, 5 * MB),
+                          (5 * MB, 5 * MB), (5 * MB, 5 * MB)])
+        self.assertEqual(updates[-1]["status"], "done")
+        self.assertEqual(queue.state["pulls"]["tiny:1b"]["total"], 5 * MB)
+        self.assertEqual(queue.state["pulls"]["tiny:1b"]["transferred"], 5 * MB)
+
+    def test_error_line_fails_pull(self):
+        queue = self.make_queue()
+        results = queue.run(["broken:1b"])
+
+        self.assertEqual(results, {"broken:1b": "failed"})
+        self.assertIn("file does not exist", queue.state["pulls"]["broken:1b"]["error"])
+        self.assertEqual(queue.failed(), ["broken:1b"])
+
+    def test_interrupted_pull_resumes_from_state(self):
+        self.state_path.write_text(json.dumps({
+            "pulls": {"resumed:1b": {"status": "pulling", "queued_at": 1}},
+            "last_rate_bps": None,
+        }), encoding="utf-8")
+        queue = self.make_queue()
+        self.assertEqual(queue.pending(), ["resumed:1b"])
+
+        self.assertEqual(queue.run(), {"resumed:1b": "done"})
+        self.assertEqual(queue.pending(), [])
+        # Only the 1 MB fetched in this run counts toward the measured rate
+        self.assertEqual(queue.state["pulls"]["resumed:1b"]["transferred"], 1 * MB)
+        self.assertIsNotNone(queue.measured_rate_bps)
+
+    def test_run_pulls_only_requested_models(self):
+        queue = self.make_queue()
+        queue.add("resumed:1b")
+
+        self.assertEqual(queue.run(["tiny:1b"]), {"tiny:1b": "done"})
+        self.assertEqual(StubOllamaHandler.requests_seen, ["tiny:1b"])
+        self.assertEqual(queue.pending(), ["resumed:1b"])
+
+
+if __name__ == "__main__":
+    unittest.main()